@@ -0,0 +1,101 @@
+"""Module for assignments, the portable form of a schedule.
+
+An assignment maps the key of each exam, its title and classroom, to the names of its
+proctors. Unlike Exam and Proctor objects it does not depend on a particular run, so it
+can be saved, loaded and applied to a freshly parsed problem.
+"""
+
+import pickle
+from pathlib import Path
+
+from scheduler.exam_proctor import Exam
+from scheduler.path import PICKLES_DIR
+
+Assignment = dict[tuple[str, str], list[str]]
+
+SCHEDULE_FILE: Path = PICKLES_DIR / "schedule.pickle"
+
+
+def get_assignment(exams: list[Exam]) -> Assignment:
+    """Get the assignment of a scheduled list of exams.
+
+    Args:
+        exams (list[Exam]): The scheduled exams.
+
+    Returns:
+        Assignment: The names of the proctors of each exam, keyed by exam key.
+    """
+    return {exam.key: [proctor.name for proctor in exam.proctors] for exam in exams}
+
+
+def save_assignment(assignment: Assignment, file: Path = SCHEDULE_FILE) -> None:
+    """Save an assignment to a pickle file.
+
+    Args:
+        assignment (Assignment): The assignment to save.
+        file (Path, optional): The path of the pickle file. Defaults to SCHEDULE_FILE.
+    """
+    with open(file, "wb") as pickle_file:
+        pickle.dump(assignment, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_assignment(file: Path = SCHEDULE_FILE) -> Assignment:
+    """Load an assignment from a pickle file.
+
+    Args:
+        file (Path, optional): The path of the pickle file. Defaults to SCHEDULE_FILE.
+
+    Raises:
+        FileNotFoundError: If the pickle file does not exist.
+
+    Returns:
+        Assignment: The loaded assignment.
+    """
+    if not file.exists():
+        raise FileNotFoundError(f"No schedule to load, {file} does not exist.")
+    with open(file, "rb") as pickle_file:
+        assignment: Assignment = pickle.load(pickle_file)
+    return assignment
+
+
+def read_assignment_excel(file: Path) -> Assignment:
+    """Read an assignment from an output Excel file.
+
+    The first sheet should have Exam_Title, Classroom and Proctors columns, the proctor
+    names being separated by commas.
+
+    Args:
+        file (Path): The path of the Excel file.
+
+    Returns:
+        Assignment: The read assignment.
+    """
+    import pandas as pd
+
+    df = pd.read_excel(file, usecols=["Exam_Title", "Classroom", "Proctors"])
+    df["Proctors"] = df["Proctors"].fillna("").astype(str)
+    return {
+        (str(row.Exam_Title).strip(), str(row.Classroom).strip()): [
+            name.strip() for name in row.Proctors.split(",") if name.strip()
+        ]
+        for row in df.itertuples()
+    }
+
+
+def read_assignment(file: Path) -> Assignment:
+    """Read an assignment from a pickle or an Excel file, depending on its suffix.
+
+    Args:
+        file (Path): The path of the file.
+
+    Raises:
+        ValueError: If the file is neither a .pickle nor a .xlsx file.
+
+    Returns:
+        Assignment: The read assignment.
+    """
+    if file.suffix == ".pickle":
+        return load_assignment(file)
+    if file.suffix == ".xlsx":
+        return read_assignment_excel(file)
+    raise ValueError(f"{file.name!r} should be a .pickle or .xlsx file, it is not")
@@ -0,0 +1,165 @@
+"""Module for batch runs of many scenarios, each with its own config file.
+
+A scenario is an exam period, e.g. the finals of a department, described by a config
+file whose input files are in the inputs directory. Scenarios run their whole pipeline,
+parse, prepare and simulate, in a shared pool of worker processes. Each scenario logs
+to its own log file and saves its best schedule, and a summary of the timings and
+fairness of every scenario is written to the outputs directory.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import yaml
+
+from scheduler.assignment import get_assignment, save_assignment
+from scheduler.config import parse_and_validate_configs
+from scheduler.metrics import make_metrics
+from scheduler.path import CONFIG_DIR, OUTPUTS_DIR, PICKLES_DIR
+from scheduler.prep_data import build_planner
+from scheduler.simulator import Simulator
+from scheduler.utils import init_logger
+
+BATCH_SUMMARY_FILE: Path = OUTPUTS_DIR / "batch_summary.csv"
+
+
+def read_scenarios(files: list[Path]) -> list[Path]:
+    """Get the config files of the scenarios, expanding manifests.
+
+    A manifest is a YAML file with a scenarios key listing config files. Relative paths
+    are resolved against the config directory when they do not exist as given.
+
+    Args:
+        files (list[Path]): Config files and manifests.
+
+    Raises:
+        FileNotFoundError: If a file does not exist.
+        ValueError: If two scenarios have the same file name.
+
+    Returns:
+        list[Path]: The config files of the scenarios.
+    """
+    scenarios = []
+    for file in files:
+        file = resolve_config_file(file)
+        with open(file) as yaml_file:
+            content = yaml.safe_load(yaml_file)
+        if isinstance(content, dict) and "scenarios" in content:
+            scenarios += [
+                resolve_config_file(Path(name)) for name in content["scenarios"]
+            ]
+        else:
+            scenarios.append(file)
+    names = [scenario.stem for scenario in scenarios]
+    for name in names:
+        if names.count(name) > 1:
+            raise ValueError(f"Scenario {name!r} is given twice, rename a config file.")
+    return scenarios
+
+
+def resolve_config_file(file: Path) -> Path:
+    """Resolve a config file, trying the config directory for relative paths.
+
+    Args:
+        file (Path): The path of the config file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    Returns:
+        Path: The existing path of the config file.
+    """
+    for candidate in (file, CONFIG_DIR / file):
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Config file {file} does not exist.")
+
+
+def run_scenario(
+    config_file: Path, number_of_simulations: int, seed: int | None
+) -> dict[str, Any]:
+    """Run the whole pipeline of a scenario and save its best schedule.
+
+    Args:
+        config_file (Path): The config file of the scenario.
+        number_of_simulations (int): The number of simulations.
+        seed (int | None): The seed of the random number generator, None for no seed.
+
+    Returns:
+        dict[str, Any]: The timings of each phase, the throughput and the best fairness of the scenario.
+    """
+    start = time.perf_counter()
+    config = parse_and_validate_configs(config_file)
+    init_logger(f"{config_file.stem}.log")
+
+    timings: dict[str, float] = {}
+    planner = build_planner(config, timings=timings)
+    prepared = time.perf_counter()
+
+    simulator = Simulator(
+        planner,
+        number_of_simulations,
+        metrics=make_metrics(config.fairness_metrics),
+        seed=seed,
+    )
+    simulator.simulate()
+    simulated = time.perf_counter()
+
+    best = simulator.order_by_fairness()[0]
+    schedule_file = PICKLES_DIR / f"{config_file.stem}_schedule.pickle"
+    save_assignment(get_assignment(simulator.results[best][1]), schedule_file)
+    fairness = simulator.fairness_results[best]
+    return {
+        "Scenario": config_file.stem,
+        "Exams": len(planner.exams),
+        "Proctors": len(planner.proctors),
+        "Parse_Seconds": timings["parse"],
+        "Prepare_Seconds": timings["prepare"],
+        "Simulate_Seconds": simulated - prepared,
+        "Total_Seconds": time.perf_counter() - start,
+        "Simulations_Per_Second": simulator.completed / max(simulated - prepared, 1e-9),
+        "Feasible": fairness[0] == 0,
+        "Fairness": ", ".join(
+            f"{metric.name}={value:.4g}"
+            for metric, value in zip(simulator.metrics, fairness[1:-1])
+        ),
+        "Schedule_File": schedule_file.name,
+    }
+
+
+def run_batch(
+    config_files: list[Path],
+    number_of_simulations: int,
+    workers: int,
+    seed: int | None = None,
+    summary_file: Path = BATCH_SUMMARY_FILE,
+) -> pd.DataFrame:
+    """Run scenarios concurrently in a shared pool of worker processes.
+
+    Args:
+        config_files (list[Path]): The config files of the scenarios.
+        number_of_simulations (int): The number of simulations of each scenario.
+        workers (int): The number of worker processes.
+        seed (int | None, optional): The seed of every scenario, None for no seed. Defaults to None.
+        summary_file (Path, optional): The path of the summary CSV file. Defaults to BATCH_SUMMARY_FILE.
+
+    Returns:
+        pd.DataFrame: One row per scenario and a last row with the wall-clock time of the batch.
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_scenario, config_file, number_of_simulations, seed)
+            for config_file in config_files
+        ]
+        rows = [future.result() for future in futures]
+    summary = pd.DataFrame(rows)
+    total = pd.DataFrame(
+        [{"Scenario": "batch", "Total_Seconds": time.perf_counter() - start}]
+    )
+    summary = pd.concat([summary, total], ignore_index=True)
+    summary.to_csv(summary_file, index=False)
+    return summary
@@ -0,0 +1,96 @@
+"""Module for the cache of simulation results.
+
+A seeded run is deterministic, so its best schedules only depend on the problem, the
+solver parameters and the seed. They are cached under a key of the three, and a run with
+the same key loads them instead of simulating again.
+"""
+
+import hashlib
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Any
+
+from scheduler.path import PICKLES_DIR
+from scheduler.simulator import Simulator
+
+CACHE_DIR: Path = PICKLES_DIR / "cache"
+
+
+def result_key(simulator: Simulator, parameters: dict[str, Any], seed: int) -> str:
+    """Get the cache key of the results of a seeded run.
+
+    Args:
+        simulator (Simulator): The Simulator of the run, before the simulations.
+        parameters (dict[str, Any]): The parameters of the run, JSON serializable.
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        str: The SHA-256 hex digest of the problem, metrics, seed schedule, parameters and seed.
+    """
+    key = {
+        "problem": simulator.planner.fingerprint(),
+        "metrics": [metric.name for metric in simulator.metrics],
+        "seed_assignment": None
+        if simulator.seed_assignment is None
+        else sorted(
+            [*exam_key, names] for exam_key, names in simulator.seed_assignment.items()
+        ),
+        "parameters": parameters,
+        "seed": seed,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def save_result(key: str, simulator: Simulator, directory: Path = CACHE_DIR) -> None:
+    """Save the best simulations of a run to the cache.
+
+    Args:
+        key (str): The cache key of the run, see result_key.
+        simulator (Simulator): The Simulator after the simulations.
+        directory (Path, optional): The directory of the cache. Defaults to CACHE_DIR.
+    """
+    simulator.keep_best_results()
+    # A loaded run has no planner state to materialize schedules from
+    simulator.results.materialize_all()
+    cached = {
+        "results": simulator.results,
+        "fairness_results": simulator.fairness_results,
+        "pareto_front": simulator.pareto_front,
+        "completed": simulator.completed,
+        "failed": simulator.failed,
+        "pruned": simulator.pruned,
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    temporary_file = directory / f"{key}.tmp"
+    with open(temporary_file, "wb") as file:
+        pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary_file.replace(directory / f"{key}.pickle")
+
+
+def load_result(key: str, simulator: Simulator, directory: Path = CACHE_DIR) -> bool:
+    """Load the best simulations of a run from the cache into a Simulator.
+
+    Args:
+        key (str): The cache key of the run, see result_key.
+        simulator (Simulator): The Simulator of the run, before the simulations.
+        directory (Path, optional): The directory of the cache. Defaults to CACHE_DIR.
+
+    Returns:
+        bool: True if the run was cached, False otherwise.
+    """
+    cache_file = directory / f"{key}.pickle"
+    if not cache_file.exists():
+        return False
+    with open(cache_file, "rb") as file:
+        cached = pickle.load(file)
+    simulator.results = cached["results"]
+    simulator.fairness_results = cached["fairness_results"]
+    simulator.pareto_front = cached["pareto_front"]
+    simulator.completed = cached["completed"]
+    simulator.failed = cached["failed"]
+    simulator.pruned = cached["pruned"]
+    simulator.incumbent = min(simulator.fairness_results.values(), default=None)
+    logging.info(f"Loaded the results of the run from the cache {cache_file}")
+    return True
@@ -1,12 +1,23 @@
 """Command line application module."""
 
+import random
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import typer
 from rich import print as rprint
+from rich.table import Table
 
 from scheduler.config import YAML_CONFIG
-from scheduler.path import LOGS_DIR
+from scheduler.path import LOGS_DIR, PICKLES_DIR
 from scheduler.utils import check_log_file_name, init_logger
 
+if TYPE_CHECKING:
+    from scheduler.planner import Planner
+    from scheduler.profiling import RunProfiler
+    from scheduler.simulator import Simulator
+
 app = typer.Typer()
 
 # Define command line arguments and options
@@ -14,8 +25,246 @@ log_file_name_argument = typer.Argument(
     YAML_CONFIG.log_file_name,
     help="Name of the log file. Default can be changed in config.yaml.",
 )
+log_file_name_option = typer.Option(
+    YAML_CONFIG.log_file_name,
+    help="Name of the log file. Default can be changed in config.yaml.",
+)
 override_option = typer.Option(False, help="Override the log file if it exists.")
 number_of_simulations_argument = typer.Argument(1000, help="Number of simulations.")
+checkpoint_every_option = typer.Option(
+    100, help="Save a checkpoint every this many simulations, 0 disables checkpoints."
+)
+resume_option = typer.Option(False, help="Resume simulations from the last checkpoint.")
+workers_option = typer.Option(
+    1, help="Number of processes scheduling independent components in parallel."
+)
+compiled_workers_option = typer.Option(
+    0,
+    help="Run the simulations on the compiled problem in this many processes sharing its memory, 0 disables.",
+)
+schedule_file_option = typer.Option(
+    "schedule.pickle",
+    help="Name of the schedule file in outputs/pickles, written by main and read by repair.",
+)
+seed_schedule_option = typer.Option(
+    None,
+    help="Previous schedule to warm-start from, an output .xlsx file or a .pickle schedule file.",
+)
+seed_preference_option = typer.Option(
+    0.5, help="Probability of keeping each proctor of the seed schedule when available."
+)
+patience_option = typer.Option(
+    0, help="Stop after this many simulations without improvement, 0 disables."
+)
+pareto_option = typer.Option(
+    False,
+    help="Keep every simulation that may be Pareto optimal, print the Pareto front and save its schedules.",
+)
+chunk_size_option = typer.Option(
+    0,
+    help="Stream the input files in chunks of this many rows, 0 reads them whole.",
+)
+export_option = typer.Option(
+    0,
+    help="Export this many of the fairest schedules to outputs/schedules instead of printing the best one, 0 disables.",
+)
+
+
+def validate_export_formats(formats: list[str]) -> list[str]:
+    """Check the export formats when parsing the options, before any simulation runs.
+
+    Args:
+        formats (list[str]): The export formats.
+
+    Raises:
+        typer.BadParameter: If a format is not an export format, or is parquet without a parquet engine.
+
+    Returns:
+        list[str]: The export formats.
+    """
+    from scheduler.export import EXPORT_FORMATS, parquet_engine_available
+
+    for export_format in formats:
+        if export_format not in EXPORT_FORMATS:
+            raise typer.BadParameter(
+                f"{export_format!r} is not an export format, available formats are {', '.join(EXPORT_FORMATS)}"
+            )
+        if export_format == "parquet" and not parquet_engine_available():
+            raise typer.BadParameter(
+                "parquet needs pyarrow or fastparquet, install the parquet extra, e.g. pdm install -G parquet"
+            )
+    return formats
+
+
+export_format_option = typer.Option(
+    ["xlsx"],
+    help="Format of the exported schedules, xlsx, csv or parquet, repeatable.",
+    callback=validate_export_formats,
+)
+history_option = typer.Option(
+    True,
+    "--history/--no-history",
+    help="Record the run and its best schedules in outputs/history.sqlite3.",
+)
+seed_option = typer.Option(
+    None, help="Seed of the random number generator, making the run reproducible."
+)
+cache_option = typer.Option(
+    True,
+    help="Load the results of a seeded run from the cache if the problem, parameters and seed were run before.",
+)
+variants_argument = typer.Argument(
+    ...,
+    help="Variants of the problem, each a list of deltas as in repair separated by ';'.",
+)
+simulations_option = typer.Option(100, help="Number of simulations of each variant.")
+seed_zero_option = typer.Option(
+    0, help="Seed of the random number generator of every variant."
+)
+config_files_argument = typer.Argument(
+    ...,
+    help="Config files of the scenarios, or manifests listing them under a scenarios key, relative to config/ if not found.",
+)
+batch_workers_option = typer.Option(
+    1, help="Number of processes running scenarios concurrently."
+)
+directory_option = typer.Option(
+    None,
+    help="Shared directory of the distributed run, reachable from every node. Defaults to outputs/distributed.",
+)
+task_size_option = typer.Option(1000, help="Number of simulations of each range.")
+local_workers_option = typer.Option(
+    0, help="Number of worker processes to run on this node, 0 relies on other nodes."
+)
+stale_after_option = typer.Option(
+    600.0,
+    help="Requeue ranges whose worker has not touched them for this many seconds.",
+)
+worker_id_option = typer.Option(
+    None, help="Id of the worker. Defaults to the host name and process id."
+)
+seconds_option = typer.Option(60.0, help="Time budget of the portfolio in seconds.")
+strategy_option = typer.Option(
+    ["uniform", "weighted", "repair", "compiled"],
+    help="Strategy to race, uniform, weighted, repair or compiled, repeatable.",
+)
+ensemble_option = typer.Option(
+    False,
+    help="Record every simulation in memory-mapped files under outputs/ensemble, keeping only the best in memory.",
+)
+top_option = typer.Option(10, help="Number of simulations to show.")
+rank_by_option = typer.Option(
+    None, help="Metric to re-rank by, repeatable. Defaults to the metrics of the run."
+)
+profile_option = typer.Option(
+    False,
+    help="Profile the CPU time and memory of each phase, written to logs/ and summarised at the end.",
+)
+progress_option = typer.Option(
+    True,
+    help="Show the live progress, throughput and best fairness of the simulations.",
+)
+host_option = typer.Option("127.0.0.1", help="Host the service listens on.")
+port_option = typer.Option(8765, help="Port the service listens on.")
+deltas_argument = typer.Argument(
+    ...,
+    help="Changes to the problem, e.g. 'unavailable:<proctor name>|<block>', "
+    "'remove:<exam title>|<classroom>', "
+    "'add:<exam title>|<classroom>|<date>|<time>|<instructor>|<number of proctors>', "
+    "'move:<exam title>|<classroom>|<date>|<time>', "
+    "'proctors:<exam title>|<classroom>|<number of proctors>' or "
+    "'room:<classroom>|<number of proctors>'.",
+)
+
+
+def start_logging(log_file_name: str, override: bool) -> Path:
+    """Check the log file name and initialize the logger.
+
+    Args:
+        log_file_name (str): The name of the log file.
+        override (bool): Whether to override the log file if it exists.
+
+    Returns:
+        Path: The path of the log file.
+    """
+    # Check if log file exists, if so ask to overwrite
+    log_file = LOGS_DIR / log_file_name
+    if not override and log_file.exists():
+        check_log_file_name(log_file_name)
+
+    # Initialize logger
+    init_logger(log_file_name)
+    return log_file
+
+
+def load_planner(
+    chunk_size: int = 0, profiler: "RunProfiler | None" = None
+) -> "Planner":
+    """Parse and prepare the input files and build a Planner.
+
+    Args:
+        chunk_size (int, optional): Stream the input files in chunks of this many rows, 0 reads them whole. Defaults to 0.
+        profiler (RunProfiler | None, optional): Profile the parse and prepare phases. Defaults to None.
+
+    Returns:
+        Planner: The Planner holding the prepared problem.
+    """
+    from scheduler.prep_data import build_planner
+
+    return build_planner(YAML_CONFIG, chunk_size, profiler)
+
+
+def print_pareto_front(simulator: "Simulator") -> None:
+    """Print the Pareto front of the simulations and save the schedule of each member.
+
+    Args:
+        simulator (Simulator): The Simulator after the simulations.
+    """
+    from scheduler.assignment import get_assignment, save_assignment
+
+    table = Table(title="Pareto front")
+    table.add_column("Simulation")
+    for metric in simulator.metrics:
+        table.add_column(metric.name)
+    table.add_column("Schedule file")
+    for sim_number, objectives in simulator.pareto_front.members.items():
+        schedule_file = PICKLES_DIR / f"pareto_{sim_number}.pickle"
+        save_assignment(get_assignment(simulator.results[sim_number][1]), schedule_file)
+        table.add_row(
+            str(sim_number),
+            *[
+                f"{value:.4f}" if isinstance(value, float) else str(value)
+                for value in objectives
+            ],
+            schedule_file.name,
+        )
+    rprint(table)
+
+
+def print_profile(profiler: "RunProfiler") -> None:
+    """Print the time and peak memory of each phase and the hot spots of the run.
+
+    Args:
+        profiler (RunProfiler): The profiler of the run.
+    """
+    table = Table(title="Phases")
+    table.add_column("Phase")
+    table.add_column("Seconds")
+    table.add_column("Peak MiB")
+    for phase, (seconds, peak) in profiler.phases.items():
+        table.add_row(phase, f"{seconds:.3f}", f"{peak / 2**20:.2f}")
+    rprint(table)
+    table = Table(title="Hot spots")
+    table.add_column("Function")
+    table.add_column("Calls")
+    table.add_column("Own seconds")
+    table.add_column("Cumulative seconds")
+    for function, calls, own, cumulative in profiler.hot_spots():
+        table.add_row(function, calls, f"{own:.3f}", f"{cumulative:.3f}")
+    rprint(table)
+    rprint(
+        f"profiles are saved to {profiler.directory.resolve()}/{profiler.name}*.prof"
+    )
 
 
 @app.command()
@@ -23,45 +272,498 @@ def main(
     log_file_name: str = log_file_name_argument,
     override: bool = override_option,
     number_of_simulations: int = number_of_simulations_argument,
+    checkpoint_every: int = checkpoint_every_option,
+    resume: bool = resume_option,
+    workers: int = workers_option,
+    compiled_workers: int = compiled_workers_option,
+    schedule_file: str = schedule_file_option,
+    seed_schedule: Path | None = seed_schedule_option,
+    seed_preference: float = seed_preference_option,
+    patience: int = patience_option,
+    pareto: bool = pareto_option,
+    chunk_size: int = chunk_size_option,
+    export: int = export_option,
+    export_format: list[str] = export_format_option,
+    record_history: bool = history_option,
+    seed: int | None = seed_option,
+    cache: bool = cache_option,
+    progress: bool = progress_option,
+    profile: bool = profile_option,
+    ensemble: bool = ensemble_option,
 ) -> None:
     """CLI for scheduler."""
-    from scheduler.planner import Planner
-    from scheduler.prep_data import Parser, Prepper
+    from scheduler.assignment import get_assignment, read_assignment, save_assignment
+    from scheduler.cache import load_result, result_key, save_result
+    from scheduler.metrics import make_metrics
+    from scheduler.profiling import RunProfiler
     from scheduler.simulator import Simulator
 
-    # Check if log file exists, if so ask to overwrite
-    log_file = LOGS_DIR / log_file_name
-    if not override and log_file.exists():
-        check_log_file_name(log_file_name)
+    log_file = start_logging(log_file_name, override)
+    profiler = RunProfiler(log_file.stem, enabled=profile)
 
-    # Initialize logger
-    init_logger(log_file_name)
+    planner = load_planner(chunk_size, profiler)
+    seed_assignment = None if seed_schedule is None else read_assignment(seed_schedule)
+    run_ensemble = None
+    if ensemble:
+        from scheduler.ensemble import Ensemble
+
+        run_ensemble = (
+            Ensemble(mode="r+", number_of_simulations=number_of_simulations)
+            if resume
+            else Ensemble.create(
+                planner.exams,
+                planner.proctors,
+                YAML_CONFIG.fairness_metrics,
+                number_of_simulations,
+            )
+        )
+    simulator = Simulator(
+        planner,
+        number_of_simulations,
+        checkpoint_interval=checkpoint_every,
+        workers=workers,
+        seed_assignment=seed_assignment,
+        seed_preference=seed_preference,
+        patience=patience,
+        prune=not pareto,
+        metrics=make_metrics(YAML_CONFIG.fairness_metrics),
+        compiled_workers=compiled_workers,
+        ensemble=run_ensemble,
+        # Checkpoints trim the results, never below the schedules to export
+        keep_best=max(export, 10),
+        seed=seed,
+    )
+
+    parameters = {
+        "number_of_simulations": number_of_simulations,
+        "workers": workers,
+        "compiled_workers": compiled_workers,
+        "seed_preference": seed_preference,
+        "patience": patience,
+        "pareto": pareto,
+    }
+    cache_key = None
+    if seed is not None:
+        # A cached run would leave the ensemble empty
+        if cache and not resume and not ensemble:
+            cache_key = result_key(simulator, parameters, seed)
 
-    parser = Parser(YAML_CONFIG)
-    prepper = Prepper(*parser.parse(), YAML_CONFIG)
-    prepper.prepare(auto_add=False)
+    seconds = None
+    interrupted = False
+    if cache_key is not None and load_result(cache_key, simulator):
+        rprint("Results are loaded from the cache.")
+    else:
+        start = time.perf_counter()
+        try:
+            with profiler.phase("simulate"):
+                if progress:
+                    from scheduler.telemetry import ProgressMonitor
 
-    planner = Planner(prepper.exams, prepper.proctors)
-    simulator = Simulator(planner, number_of_simulations)
+                    with ProgressMonitor(simulator):
+                        simulator.simulate(resume=resume)
+                else:
+                    simulator.simulate(resume=resume)
+        except KeyboardInterrupt:
+            if not simulator.results:
+                raise
+            interrupted = True
+            rprint(
+                f"Stopped after {simulator.completed} simulations, keeping the best so far."
+            )
+        seconds = time.perf_counter() - start
 
-    simulator.simulate()
-    simulator.measure_fairness_all()
-    ordered_by_fairness = simulator.order_by_fairness()
+    with profiler.phase("fairness"):
+        simulator.measure_fairness_all()
+        ordered_by_fairness = simulator.order_by_fairness()
 
-    _, _, proctors, blocks = simulator.results[ordered_by_fairness[0]]
-    rprint(blocks)
+    with profiler.phase("output"):
+        # A truncated run is neither cached nor recorded as a run of its parameters
+        if seconds is not None and not interrupted and cache_key is not None:
+            save_result(cache_key, simulator)
+            ordered_by_fairness = simulator.order_by_fairness()
 
-    for proctor in proctors:
-        rprint(proctor)
+        if seconds is not None and not interrupted and record_history:
+            from scheduler.history import RunHistory
 
-    total_duties = {
-        proctor.name: len(proctor.duties) + proctor.total_proctored_before
-        for proctor in proctors
+            run_history = RunHistory()
+            run_history.record_run(
+                simulator,
+                planner.fingerprint(),
+                {
+                    **parameters,
+                    "resume": resume,
+                    "seed_schedule": None
+                    if seed_schedule is None
+                    else str(seed_schedule),
+                    "seed": seed,
+                },
+                seconds,
+            )
+            run_history.close()
+
+        _, exams, proctors, blocks = simulator.results[ordered_by_fairness[0]]
+        if export:
+            from scheduler.export import export_schedules
+
+            files = export_schedules(simulator, export, export_format)
+            rprint(
+                f"{len(files)} schedule files are saved to {files[0].parent.resolve()}"
+            )
+        else:
+            rprint(blocks)
+
+            for proctor in proctors:
+                rprint(proctor)
+
+            total_duties = {
+                proctor.name: len(proctor.duties) + proctor.total_proctored_before
+                for proctor in proctors
+            }
+            sorted_duties = sorted(total_duties.items(), key=lambda item: item[1])
+            for proct, duties in sorted_duties:
+                print(f"{proct}: {duties}")
+
+        # Save the best schedule so it can be repaired later
+        save_assignment(get_assignment(exams), PICKLES_DIR / schedule_file)
+
+        if pareto:
+            print_pareto_front(simulator)
+
+    if profile:
+        print_profile(profiler)
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command()
+def repair(
+    deltas: list[str] = deltas_argument,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+    schedule_file: str = schedule_file_option,
+) -> None:
+    """Repair the saved schedule after late changes, keeping other assignments."""
+    from scheduler.assignment import load_assignment, save_assignment
+    from scheduler.repair import Repairer
+
+    log_file = start_logging(log_file_name, override)
+
+    repairer = Repairer(load_planner(), load_assignment(PICKLES_DIR / schedule_file))
+    for delta in deltas:
+        repairer.apply_delta(delta)
+    exit_code = repairer.repair()
+
+    for change in repairer.changes:
+        print(change)
+    if exit_code != 0:
+        raise typer.Exit(code=exit_code)
+    save_assignment(repairer.get_assignment(), PICKLES_DIR / schedule_file)
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command()
+def history(
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Show the recorded runs of the current inputs and the best schedule ever found."""
+    from scheduler.history import RunHistory
+
+    log_file = start_logging(log_file_name, override)
+
+    inputs_hash = load_planner().fingerprint()
+    run_history = RunHistory()
+    table = Table(title="Runs of the current inputs")
+    table.add_column("Started at")
+    table.add_column("Simulations")
+    table.add_column("Simulations per second")
+    for started_at, simulations, simulations_per_second in run_history.throughput(
+        inputs_hash
+    ):
+        table.add_row(started_at, str(simulations), f"{simulations_per_second:.1f}")
+    rprint(table)
+    best = run_history.best_schedule(inputs_hash, YAML_CONFIG.fairness_metrics)
+    run_history.close()
+    if best is not None:
+        run_id, fairness, _ = best
+        rprint(f"Best schedule was found by run {run_id}, fairness: {fairness}")
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command()
+def serve(
+    host: str = host_option,
+    port: int = port_option,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Serve solve, resolve and score requests over HTTP, keeping the problem loaded."""
+    from scheduler.metrics import make_metrics
+    from scheduler.service import SchedulerServer, SchedulerService
+
+    start_logging(log_file_name, override)
+
+    service = SchedulerService(
+        load_planner(), make_metrics(YAML_CONFIG.fairness_metrics)
+    )
+    server = SchedulerServer(service, host, port)
+    rprint(f"Serving on http://{host}:{server.server_port}, press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@app.command()
+def whatif(
+    variants: list[str] = variants_argument,
+    number_of_simulations: int = simulations_option,
+    workers: int = workers_option,
+    seed: int = seed_zero_option,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Compare the feasibility and best fairness of variants of the problem."""
+    from scheduler.whatif import evaluate_variants
+
+    log_file = start_logging(log_file_name, override)
+
+    named_variants = {
+        f"variant {i}": [delta.strip() for delta in variant.split(";") if delta.strip()]
+        for i, variant in enumerate(variants, start=1)
     }
-    sorted_duties = sorted(total_duties.items(), key=lambda item: item[1])
-    for proct, duties in sorted_duties:
-        print(f"{proct}: {duties}")
+    fairness_by_variant = evaluate_variants(
+        load_planner(),
+        named_variants,
+        number_of_simulations,
+        YAML_CONFIG.fairness_metrics,
+        seed=seed,
+        workers=workers,
+    )
+
+    table = Table(title="What-if variants")
+    table.add_column("Variant")
+    table.add_column("Deltas")
+    table.add_column("Feasible")
+    for name in YAML_CONFIG.fairness_metrics:
+        table.add_column(name)
+    for variant, fairness in fairness_by_variant.items():
+        table.add_row(
+            variant,
+            "; ".join(named_variants.get(variant, [])),
+            "yes" if fairness[0] == 0 else "no",
+            *[
+                f"{value:.4f}" if isinstance(value, float) else str(value)
+                for value in fairness[1:-1]
+            ],
+        )
+    rprint(table)
 
     # Print log file path
     print("")
     rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command()
+def batch(
+    config_files: list[Path] = config_files_argument,
+    number_of_simulations: int = simulations_option,
+    workers: int = batch_workers_option,
+    seed: int | None = seed_option,
+) -> None:
+    """Run the scenarios of many config files concurrently."""
+    from scheduler.batch import BATCH_SUMMARY_FILE, read_scenarios, run_batch
+
+    summary = run_batch(
+        read_scenarios(config_files), number_of_simulations, workers, seed=seed
+    )
+
+    table = Table(title="Batch summary")
+    for column in summary.columns:
+        table.add_column(column.replace("_", " "))
+    cells = summary.astype(object).where(summary.notna(), "")
+    for row in cells.itertuples(index=False):
+        table.add_row(
+            *[
+                f"{value:.2f}" if isinstance(value, float) else str(value)
+                for value in row
+            ]
+        )
+    rprint(table)
+    rprint(f"summary is saved to {BATCH_SUMMARY_FILE.resolve()}")
+
+
+@app.command()
+def distribute(
+    number_of_simulations: int = number_of_simulations_argument,
+    directory: Path | None = directory_option,
+    task_size: int = task_size_option,
+    local_workers: int = local_workers_option,
+    stale_after: float = stale_after_option,
+    seed: int | None = seed_option,
+    schedule_file: str = schedule_file_option,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Publish simulations to a shared directory for workers on any node and merge their results."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from scheduler.assignment import get_assignment, save_assignment
+    from scheduler.distributed import (
+        DISTRIBUTED_DIR,
+        merge,
+        progress,
+        publish,
+        requeue_stale,
+        work,
+    )
+
+    log_file = start_logging(log_file_name, override)
+    directory = DISTRIBUTED_DIR if directory is None else directory
+
+    total = publish(
+        load_planner(),
+        number_of_simulations,
+        YAML_CONFIG.fairness_metrics,
+        random.getrandbits(64) if seed is None else seed,
+        directory,
+        task_size=task_size,
+    )
+    rprint(
+        f"Published {total} ranges to {directory.resolve()}, "
+        f"run 'scheduler work --directory {directory.resolve()}' on other nodes."
+    )
+    if local_workers:
+        with ProcessPoolExecutor(max_workers=local_workers) as executor:
+            for future in [
+                executor.submit(work, directory) for _ in range(local_workers)
+            ]:
+                future.result()
+    while progress(directory)[0] < total:
+        requeue_stale(directory, stale_after)
+        time.sleep(1)
+
+    simulator = merge(directory)
+    best = simulator.order_by_fairness()[0]
+    rprint(
+        f"{simulator.completed} simulations, {simulator.failed} failed, "
+        f"best fairness: {simulator.fairness_results[best][:-1]}"
+    )
+    save_assignment(
+        get_assignment(simulator.results[best][1]), PICKLES_DIR / schedule_file
+    )
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command(name="work")
+def work_command(
+    directory: Path | None = directory_option,
+    worker_id: str | None = worker_id_option,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Run ranges of simulations published by distribute until none is left."""
+    from scheduler.distributed import DISTRIBUTED_DIR, work
+
+    log_file = start_logging(log_file_name, override)
+
+    done = work(DISTRIBUTED_DIR if directory is None else directory, worker_id)
+    rprint(f"Ran {done} ranges of simulations.")
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command()
+def portfolio(
+    seconds: float = seconds_option,
+    strategy: list[str] = strategy_option,
+    seed: int = seed_zero_option,
+    schedule_file: str = schedule_file_option,
+    log_file_name: str = log_file_name_option,
+    override: bool = override_option,
+) -> None:
+    """Race scheduling strategies on separate cores and keep the best schedule within a time budget."""
+    from scheduler.assignment import save_assignment
+    from scheduler.portfolio import run_portfolio
+
+    log_file = start_logging(log_file_name, override)
+
+    results = run_portfolio(
+        load_planner(), YAML_CONFIG.fairness_metrics, seconds, strategy, seed=seed
+    )
+
+    table = Table(title=f"Portfolio of {seconds:g} seconds")
+    table.add_column("Strategy")
+    table.add_column("Attempts")
+    table.add_column("Failed")
+    table.add_column("Pruned")
+    for name in YAML_CONFIG.fairness_metrics:
+        table.add_column(name)
+    for result in results:
+        table.add_row(
+            result.strategy,
+            str(result.attempts),
+            str(result.failed),
+            str(result.pruned),
+            *(
+                []
+                if result.fairness is None
+                else [f"{value:.4g}" for value in result.fairness[1:-1]]
+            ),
+        )
+    rprint(table)
+    best = results[0]
+    if best.assignment is None:
+        rprint("No strategy found a feasible schedule, increase the time budget.")
+        raise typer.Exit(code=1)
+    rprint(f"Best schedule was found by the {best.strategy} strategy.")
+    save_assignment(best.assignment, PICKLES_DIR / schedule_file)
+
+    # Print log file path
+    print("")
+    rprint(f"logs are saved to {log_file.resolve()}")
+
+
+@app.command(name="ensemble")
+def ensemble_command(
+    top: int = top_option,
+    rank_by: list[str] | None = rank_by_option,
+) -> None:
+    """Re-rank the simulations recorded by main --ensemble and count the blocks of each proctor."""
+    from scheduler.ensemble import ENSEMBLE_DIR, Ensemble
+
+    run_ensemble = Ensemble()
+    by = rank_by or run_ensemble.metrics
+    table = Table(title=f"Best of {len(run_ensemble.recorded())} simulations")
+    table.add_column("Simulation")
+    table.add_column("Failed")
+    for name in by:
+        table.add_column(name)
+    for sim_number in run_ensemble.order(by)[:top]:
+        fairness = run_ensemble.fairness[sim_number]
+        table.add_row(
+            str(sim_number),
+            str(int(fairness[0])),
+            *[f"{fairness[run_ensemble.metrics.index(name) + 1]:.4g}" for name in by],
+        )
+    rprint(table)
+    frequency_file = ENSEMBLE_DIR / "block_frequency.csv"
+    run_ensemble.block_frequency().to_csv(frequency_file)
+    rprint(
+        f"share of simulations with a duty in each block is saved to {frequency_file.resolve()}"
+    )
@@ -0,0 +1,418 @@
+"""Module for the compiled problem, NumPy arrays shared by worker processes.
+
+The exams, proctors and constraints of a Planner are compiled once into flat arrays:
+eligibility masks, demand vectors, duty limits and the conflicts of the time rules. A
+NumPy kernel runs the scheduling algorithm of Planner.schedule on these arrays. With
+more than one worker the arrays are placed in shared memory, which the workers attach
+to without copying, and each worker writes its schedules into a shared preallocated
+assignment array. A task is then only a range of simulation numbers and a seed.
+
+Each simulation draws from its own counter-based random number generator, keyed by the
+seed of the run and the simulation number, so the schedules do not depend on the number
+of workers.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from scheduler.exam_proctor import Exam
+from scheduler.planner import FAILED, SUCCEEDED, Planner, simulation_generator
+
+# Array name to shared memory name, shape and dtype, see SharedArrays.handle
+SharedHandle = dict[str, tuple[str, tuple[int, ...], str]]
+
+# Number of simulations of each task sent to a worker process
+TASK_SIZE = 64
+
+# Problem and results held by each worker process, see run_compiled
+_worker_arrays: "SharedArrays | None" = None
+
+
+class CompiledProblem:
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Initialize the CompiledProblem class from its arrays.
+
+        Exams are in the order they are scheduled, block by block, and proctors in the order
+        of the planner. The arrays are:
+
+        - eligible: (exams, proctors) bool, the proctor may proctor the exam, see Planner.is_eligible.
+        - preferred: (exams, proctors) bool, eligible and the block is not in their not preferred blocks.
+        - block_starts: (blocks + 1,) int, the exams of block b are block_starts[b]:block_starts[b + 1].
+        - needed: (exams,) int, the number of proctors needed by each exam.
+        - duty_limit: (proctors,) int, a proctor with more duties is no longer available.
+        - min_limit: (proctors,) int, a proctor with fewer duties has not reached the minimum.
+        - conflict_kind: (proctors,) int, 1 if the proctor has at most one duty per day, 0 otherwise.
+        - conflicts: (2, blocks, blocks) bool, the blocks a duty in a block rules out, by conflict kind.
+
+        Args:
+            arrays (dict[str, np.ndarray]): The arrays of the problem, keyed by name.
+        """
+        self.arrays = arrays
+        self.eligible = arrays["eligible"]
+        self.preferred = arrays["preferred"]
+        self.block_starts = arrays["block_starts"]
+        self.needed = arrays["needed"]
+        self.duty_limit = arrays["duty_limit"]
+        self.min_limit = arrays["min_limit"]
+        self.conflict_kind = arrays["conflict_kind"]
+        self.conflicts = arrays["conflicts"]
+
+    @property
+    def max_needed(self) -> int:
+        """
+        Get the width of an assignment, the largest number of proctors needed by an exam.
+
+        Returns:
+            int: The largest number of proctors needed by an exam, at least 1.
+        """
+        return max(int(self.needed.max(initial=0)), 1)
+
+    @staticmethod
+    def exam_order(planner: Planner) -> list[Exam]:
+        """
+        Get the exams of a planner in the order of the compiled problem.
+
+        Args:
+            planner (Planner): A Planner whose blocks are set.
+
+        Returns:
+            list[Exam]: The exams, block by block in the order they are scheduled.
+        """
+        return [
+            exam
+            for block in planner.ordered_blocks_keys()
+            for exam in planner.blocks[block]
+        ]
+
+    @staticmethod
+    def replay(planner: Planner, exams: list[Exam], assignment: np.ndarray) -> None:
+        """
+        Replay a schedule of the compiled problem on the exams and proctors of a planner.
+
+        Args:
+            planner (Planner): The Planner the problem was compiled from.
+            exams (list[Exam]): The exams of the planner, see exam_order.
+            assignment (np.ndarray): The (exams, max_needed) proctor indices of each exam, -1 where unassigned.
+        """
+        planner.reset_all()
+        for exam, proctor_indices in zip(exams, assignment):
+            for index in proctor_indices[proctor_indices >= 0]:
+                planner.assign(planner.proctors[index], exam)
+
+    @classmethod
+    def compile(cls, planner: Planner) -> "CompiledProblem":
+        """
+        Compile the problem of a planner into arrays.
+
+        Args:
+            planner (Planner): A Planner whose duty limits and blocks are set.
+
+        Returns:
+            CompiledProblem: The compiled problem.
+        """
+        blocks = planner.ordered_blocks_keys()
+        exams = cls.exam_order(planner)
+        proctors = planner.proctors
+        eligible = np.array(
+            [
+                [planner.is_eligible(exam, proctor) for proctor in proctors]
+                for exam in exams
+            ],
+            dtype=bool,
+        ).reshape(len(exams), len(proctors))
+        preferred = eligible & np.array(
+            [
+                [exam.block not in proctor.not_preferred for proctor in proctors]
+                for exam in exams
+            ],
+            dtype=bool,
+        ).reshape(len(exams), len(proctors))
+        block_starts = np.cumsum(
+            [0] + [len(planner.blocks[block]) for block in blocks], dtype=np.int64
+        )
+        total_proctored_before = np.array(
+            [proctor.total_proctored_before for proctor in proctors], dtype=np.int64
+        )
+        conflicts = np.zeros((2, len(blocks), len(blocks)), dtype=bool)
+        if planner.timetable is None:
+            # Without time rules a duty only rules out its own block
+            conflicts[:] = np.eye(len(blocks), dtype=bool)
+            conflict_kind = np.zeros(len(proctors), dtype=np.int64)
+        else:
+            positions = [planner.timetable.index[block] for block in blocks]
+            for kind, same_day in enumerate((False, True)):
+                timetable_conflicts = planner.timetable.conflicts(
+                    same_day, planner.min_gap_minutes
+                )
+                for i, position in enumerate(positions):
+                    conflicting = set(timetable_conflicts[position])
+                    conflicts[kind, i] = [p in conflicting for p in positions]
+            conflict_kind = np.array(
+                [
+                    proctor.proctor_class in planner.one_duty_per_day_classes
+                    for proctor in proctors
+                ],
+                dtype=np.int64,
+            )
+        return cls(
+            {
+                "eligible": eligible,
+                "preferred": preferred,
+                "block_starts": block_starts,
+                "needed": np.array(
+                    [exam.number_of_proctors_needed for exam in exams], dtype=np.int64
+                ),
+                "duty_limit": planner.max_duties
+                + planner.max_total_proctored_before
+                - total_proctored_before,
+                "min_limit": planner.min_duties
+                + planner.max_total_proctored_before
+                - total_proctored_before,
+                "conflict_kind": conflict_kind,
+                "conflicts": conflicts,
+            }
+        )
+
+    def schedule(self, rng: np.random.Generator, assignment: np.ndarray) -> int:
+        """
+        Schedule the exams once, as Planner.schedule does without preferred proctors or pruning.
+
+        Args:
+            rng (np.random.Generator): The random number generator of the simulation.
+            assignment (np.ndarray): The (exams, max_needed) array filled in place with the proctor indices of each exam, -1 where unassigned.
+
+        Returns:
+            int: SUCCEEDED, or FAILED if there are not enough proctors.
+        """
+        assignment.fill(-1)
+        number_of_proctors = len(self.duty_limit)
+        duties = np.zeros(number_of_proctors, dtype=np.int64)
+        occupancy = np.zeros((number_of_proctors, len(self.block_starts) - 1), np.int64)
+        for block in range(len(self.block_starts) - 1):
+            start, stop = self.block_starts[block], self.block_starts[block + 1]
+            free = (duties <= self.duty_limit) & (occupancy[:, block] == 0)
+            available_for_block = (self.eligible[start:stop] & free).any(axis=0)
+            if available_for_block.sum() < self.needed[start:stop].sum():
+                return FAILED
+            for exam in range(start, stop):
+                needed = self.needed[exam]
+                free = (duties <= self.duty_limit) & (occupancy[:, block] == 0)
+                available = self.preferred[exam] & free
+                if available.sum() < needed:
+                    available = self.eligible[exam] & free
+                if available.sum() < needed:
+                    return FAILED
+                candidates = np.flatnonzero(available)
+                min_not_reached = candidates[
+                    duties[candidates] < self.min_limit[candidates]
+                ]
+                select_from = (
+                    min_not_reached if len(min_not_reached) >= needed else candidates
+                )
+                chosen = rng.choice(select_from, size=needed, replace=False)
+                assignment[exam, :needed] = chosen
+                duties[chosen] += 1
+                occupancy[chosen] += self.conflicts[self.conflict_kind[chosen], block]
+        return SUCCEEDED
+
+    def run(
+        self,
+        first: int,
+        last: int,
+        seed: int,
+        exit_codes: np.ndarray,
+        assignments: np.ndarray,
+    ) -> None:
+        """
+        Run the simulations from first to last, writing their results in place.
+
+        Args:
+            first (int): The number of the first simulation, counted from 1.
+            last (int): The number of the last simulation.
+            seed (int): The seed of the run.
+            exit_codes (np.ndarray): The exit codes, row i - first for simulation i.
+            assignments (np.ndarray): The (simulations, exams, max_needed) assignments, row i - first for simulation i.
+        """
+        for sim_number in range(first, last + 1):
+            exit_codes[sim_number - first] = self.schedule(
+                simulation_generator(seed, sim_number),
+                assignments[sim_number - first],
+            )
+
+
+class SharedArrays:
+    def __init__(self, memories: dict[str, SharedMemory], handle: SharedHandle) -> None:
+        """
+        Initialize the SharedArrays class, NumPy views of shared memory blocks.
+
+        Use create or attach rather than this constructor.
+
+        Args:
+            memories (dict[str, SharedMemory]): The shared memory block of each array.
+            handle (SharedHandle): The shared memory name, shape and dtype of each array.
+        """
+        self.memories = memories
+        self.handle = handle
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=memories[name].buf)
+            for name, (_, shape, dtype) in handle.items()
+        }
+
+    @classmethod
+    def create(cls, arrays: dict[str, np.ndarray]) -> "SharedArrays":
+        """
+        Copy arrays into new shared memory blocks.
+
+        Args:
+            arrays (dict[str, np.ndarray]): The arrays, keyed by name.
+
+        Returns:
+            SharedArrays: The shared arrays, to be unlinked by the creator.
+        """
+        memories = {
+            name: SharedMemory(create=True, size=max(array.nbytes, 1))
+            for name, array in arrays.items()
+        }
+        shared = cls(
+            memories,
+            {
+                name: (memories[name].name, array.shape, array.dtype.str)
+                for name, array in arrays.items()
+            },
+        )
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedHandle) -> "SharedArrays":
+        """
+        Attach to the shared memory blocks of another process, without copying.
+
+        Args:
+            handle (SharedHandle): The handle of the shared arrays of the other process.
+
+        Returns:
+            SharedArrays: The shared arrays.
+        """
+        return cls(
+            {
+                name: SharedMemory(name=memory)
+                for name, (memory, _, _) in handle.items()
+            },
+            handle,
+        )
+
+    def close(self) -> None:
+        """
+        Close the shared memory blocks in this process, dropping the views first.
+        """
+        self.arrays = {}
+        for memory in self.memories.values():
+            memory.close()
+
+    def unlink(self) -> None:
+        """
+        Close and free the shared memory blocks, once every process is done with them.
+        """
+        self.close()
+        for memory in self.memories.values():
+            memory.unlink()
+
+
+def _init_compiled_worker(handle: SharedHandle) -> None:
+    """
+    Attach a worker process to the compiled problem and the results in shared memory.
+
+    Args:
+        handle (SharedHandle): The handle of the shared arrays.
+    """
+    global _worker_arrays
+    _worker_arrays = SharedArrays.attach(handle)
+
+
+def _run_in_worker(first: int, last: int, seed: int) -> None:
+    """
+    Run a range of simulations in a worker process, see CompiledProblem.run.
+    """
+    assert _worker_arrays is not None
+    arrays = _worker_arrays.arrays
+    CompiledProblem(arrays).run(
+        first,
+        last,
+        seed,
+        arrays["exit_codes"][first - 1 : last],
+        arrays["assignments"][first - 1 : last],
+    )
+
+
+def run_compiled(
+    problem: CompiledProblem,
+    number_of_simulations: int,
+    seed: int,
+    workers: int = 1,
+    on_task: Callable[[np.ndarray], None] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Run simulations of a compiled problem in ranges of TASK_SIZE, in shared memory with more than one worker.
+
+    Args:
+        problem (CompiledProblem): The compiled problem.
+        number_of_simulations (int): The number of simulations.
+        seed (int): The seed of the run.
+        workers (int, optional): The number of worker processes. Defaults to 1.
+        on_task (Callable[[np.ndarray], None] | None, optional): Called with the exit codes of each range once it has finished, e.g. to show progress. Defaults to None.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (simulations,) exit codes and (simulations, exams, max_needed) assignments, row i - 1 for simulation i.
+    """
+    exit_codes = np.zeros(number_of_simulations, dtype=np.int8)
+    assignments = np.full(
+        (number_of_simulations, len(problem.needed), problem.max_needed),
+        -1,
+        dtype=np.int32,
+    )
+    ranges = [
+        (first, min(first + TASK_SIZE - 1, number_of_simulations))
+        for first in range(1, number_of_simulations + 1, TASK_SIZE)
+    ]
+    if workers <= 1:
+        for first, last in ranges:
+            problem.run(
+                first,
+                last,
+                seed,
+                exit_codes[first - 1 : last],
+                assignments[first - 1 : last],
+            )
+            if on_task is not None:
+                on_task(exit_codes[first - 1 : last])
+        return exit_codes, assignments
+    shared = SharedArrays.create(
+        {**problem.arrays, "exit_codes": exit_codes, "assignments": assignments}
+    )
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_compiled_worker,
+            initargs=(shared.handle,),
+        ) as executor:
+            futures = {
+                executor.submit(_run_in_worker, first, last, seed): (first, last)
+                for first, last in ranges
+            }
+            for future in as_completed(futures):
+                future.result()
+                if on_task is not None:
+                    first, last = futures[future]
+                    on_task(shared.arrays["exit_codes"][first - 1 : last])
+        return (
+            shared.arrays["exit_codes"].copy(),
+            shared.arrays["assignments"].copy(),
+        )
+    finally:
+        shared.unlink()
@@ -1,13 +1,18 @@
 """This module parses and validates the config files in config directory."""
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TypedDict
 
 import yaml
 from pydantic import BaseModel, root_validator, validator
 
+from scheduler.metric_names import DEFAULT_METRICS, METRIC_NAMES
 from scheduler.path import CONFIG_DIR
 
+# Suffixes of the supported input file formats
+INPUT_FILE_SUFFIXES = (".xlsx", ".csv", ".parquet", ".json")
+
 
 class YAMLConfig(BaseModel):
     """Class that defines the structure and validation rules for the config.yaml file.
@@ -20,6 +25,9 @@ class YAMLConfig(BaseModel):
     exams_file: str
     proctors_file: str
     exams_file_for_proctor_numbers: str
+    fairness_metrics: list[str] = DEFAULT_METRICS
+    one_duty_per_day_classes: list[int] = []
+    min_gap_minutes: int = 0
 
     # Define a validator to ensure the log_file_name is valid
     @validator("log_file_name")
@@ -56,15 +64,83 @@ class YAMLConfig(BaseModel):
 
         Raises:
             ValueError: If the file starts with /.
-            ValueError: If the file is not a .xlsx file.
+            ValueError: If the file is not a .xlsx, .csv, .parquet or .json file.
 
         Returns:
             str: The validated exams_file, proctors_file or exams_file_for_proctor_numbers.
         """
         if v.startswith("/"):
             raise ValueError(f"{v!r} should not start with /, {v!r} starts with /")
-        if not v.endswith(".xlsx"):
-            raise ValueError(f"{v!r} should be a .xlsx file, {v!r} is not")
+        if not v.endswith(INPUT_FILE_SUFFIXES):
+            raise ValueError(
+                f"{v!r} should be a .xlsx, .csv, .parquet or .json file, {v!r} is not"
+            )
+        return v
+
+    # Define a validator to ensure the fairness_metrics are valid
+    @validator("fairness_metrics")
+    def fairness_metrics_must_be_valid(cls, v: list[str]) -> list[str]:
+        """Validator to ensure the fairness_metrics are valid.
+
+        Args:
+            v (list[str]): The fairness_metrics value.
+
+        Raises:
+            ValueError: If fairness_metrics is empty.
+            ValueError: If a fairness metric is not available.
+            ValueError: If a fairness metric is repeated.
+
+        Returns:
+            list[str]: The validated fairness_metrics.
+        """
+        if not v:
+            raise ValueError("fairness_metrics should not be empty")
+        for metric in v:
+            if metric not in METRIC_NAMES:
+                raise ValueError(
+                    f"{metric!r} is not a fairness metric, available metrics are {', '.join(METRIC_NAMES)}"
+                )
+        if len(set(v)) != len(v):
+            raise ValueError(f"fairness_metrics should not repeat a metric, {v!r} does")
+        return v
+
+    # Define a validator to ensure the one_duty_per_day_classes are valid
+    @validator("one_duty_per_day_classes")
+    def proctor_classes_must_be_valid(cls, v: list[int]) -> list[int]:
+        """Validator to ensure the one_duty_per_day_classes are valid.
+
+        Args:
+            v (list[int]): The one_duty_per_day_classes value.
+
+        Raises:
+            ValueError: If a proctor class is not 1, 2 or 3.
+
+        Returns:
+            list[int]: The validated one_duty_per_day_classes.
+        """
+        for proctor_class in v:
+            if proctor_class not in (1, 2, 3):
+                raise ValueError(
+                    f"proctor classes should be 1, 2 or 3, {proctor_class!r} is not"
+                )
+        return v
+
+    # Define a validator to ensure the min_gap_minutes is valid
+    @validator("min_gap_minutes")
+    def min_gap_minutes_must_be_valid(cls, v: int) -> int:
+        """Validator to ensure the min_gap_minutes is valid.
+
+        Args:
+            v (int): The min_gap_minutes value.
+
+        Raises:
+            ValueError: If min_gap_minutes is negative.
+
+        Returns:
+            int: The validated min_gap_minutes.
+        """
+        if v < 0:
+            raise ValueError(f"min_gap_minutes should not be negative, {v!r} is")
         return v
 
     # Define a validator to ensure the exams_file and proctors_file are different
@@ -93,16 +169,24 @@ class YAMLConfigDict(TypedDict):
     exams_file: str
     proctors_file: str
     exams_file_for_proctor_numbers: str
+    fairness_metrics: list[str]
+    one_duty_per_day_classes: list[int]
+    min_gap_minutes: int
+
 
+def parse_and_validate_configs(
+    config_file: Path = CONFIG_DIR / "config.yaml",
+) -> YAMLConfig:
+    """Parse and validate the contents of a config file.
 
-def parse_and_validate_configs() -> YAMLConfig:
-    """Parse and validate the contents of the config.yaml file.
+    Args:
+        config_file (Path, optional): The path of the config file. Defaults to config/config.yaml.
 
     Returns:
         YAMLConfig: The validated YAMLConfig object.
     """
 
-    with open(CONFIG_DIR / "config.yaml") as yaml_file:
+    with open(config_file) as yaml_file:
         # Load the contents of the yaml file into a dictionary
         yaml_config: YAMLConfigDict = yaml.safe_load(yaml_file)
 
@@ -0,0 +1,464 @@
+"""Module for distributed simulations, coordinated through a shared directory.
+
+The coordinator publishes the prepared problem and ranges of simulation numbers to a
+directory every node can reach, e.g. a network drive. Independent worker processes on
+any node claim a range by renaming its task file, which succeeds for only one of them,
+run its simulations on the compiled problem and report the fairness and schedule of
+their best simulations only. The coordinator merges the reports into a Simulator.
+
+Each simulation is seeded by the seed of the run and its number, see the compiled
+module, so the merged results do not depend on which worker ran which range.
+
+The problem is published as JSON and NumPy arrays, never pickles, so nodes do not run
+code from the shared directory. A worker touches its claimed task while the range runs,
+so only ranges of lost workers go stale.
+
+Layout of the directory:
+
+- problem.json: the exams, proctors and time rules of the prepared problem and the run parameters.
+- problem.npz: the arrays of the compiled problem.
+- tasks/<first>-<last>.task: the ranges not claimed yet.
+- claimed/<first>-<last>.task: the ranges claimed by a worker, containing its id.
+- results/<first>-<last>.json: the reports of the finished ranges.
+"""
+
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from scheduler.compiled import CompiledProblem
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.metrics import make_metrics
+from scheduler.path import OUTPUTS_DIR
+from scheduler.planner import FAILED, Planner
+from scheduler.simulator import Simulator
+
+DISTRIBUTED_DIR: Path = OUTPUTS_DIR / "distributed"
+PROBLEM_FILE = "problem.json"
+ARRAYS_FILE = "problem.npz"
+
+# Seconds between two touches of a claimed task by its worker, well below the timeout of requeue_stale
+HEARTBEAT_SECONDS = 60.0
+
+
+def range_name(first: int, last: int) -> str:
+    """Get the name of the files of a range, sorting in the order of the simulations.
+
+    Args:
+        first (int): The number of the first simulation of the range.
+        last (int): The number of the last simulation of the range.
+
+    Returns:
+        str: The zero padded first and last simulation numbers.
+    """
+    return f"{first:010d}-{last:010d}"
+
+
+def write_atomically(file: Path, content: bytes) -> None:
+    """Write a file through a temporary file, so readers never see it half written.
+
+    Args:
+        file (Path): The path of the file.
+        content (bytes): The content of the file.
+    """
+    temporary_file = file.with_name(f".{file.name}.{os.getpid()}.tmp")
+    temporary_file.write_bytes(content)
+    temporary_file.replace(file)
+
+
+def problem_to_json(planner: Planner) -> dict[str, Any]:
+    """Describe the problem of a planner with JSON types, in the order of the planner.
+
+    Args:
+        planner (Planner): The Planner holding the prepared problem.
+
+    Returns:
+        dict[str, Any]: The exams, proctors and time rules of the problem.
+    """
+    return {
+        "exams": [
+            [
+                exam.title,
+                exam.date,
+                exam.time,
+                exam.classroom,
+                exam.instructor,
+                int(exam.number_of_proctors_needed),
+                [proctor.name for proctor in exam.requires_specific_proctor],
+            ]
+            for exam in planner.exams
+        ],
+        "proctors": [
+            [
+                proctor.name,
+                proctor.email,
+                int(proctor.total_proctored_before),
+                int(proctor.proctor_class),
+                proctor.unavailable,
+                proctor.not_preferred,
+            ]
+            for proctor in planner.proctors
+        ],
+        "one_duty_per_day_classes": sorted(planner.one_duty_per_day_classes),
+        "min_gap_minutes": planner.min_gap_minutes,
+    }
+
+
+def planner_from_json(problem: dict[str, Any]) -> Planner:
+    """Build the planner of a problem described by problem_to_json.
+
+    Args:
+        problem (dict[str, Any]): The exams, proctors and time rules of the problem.
+
+    Returns:
+        Planner: The Planner, with its duty limits and blocks set.
+    """
+    proctors = []
+    for (
+        name,
+        email,
+        total_proctored_before,
+        proctor_class,
+        unavailable,
+        not_preferred,
+    ) in problem["proctors"]:
+        proctor = Proctor(name, email, total_proctored_before, proctor_class)
+        proctor.unavailable = list(unavailable)
+        proctor.not_preferred = list(not_preferred)
+        proctors.append(proctor)
+    proctors_by_name = {proctor.name: proctor for proctor in proctors}
+    exams = []
+    for title, date, time_, classroom, instructor, needed, specific in problem["exams"]:
+        exam = Exam(title, date, time_, classroom, instructor)
+        exam.number_of_proctors_needed = needed
+        exam.requires_specific_proctor = [proctors_by_name[name] for name in specific]
+        exams.append(exam)
+    planner = Planner(exams, proctors)
+    planner.set_time_rules(
+        problem["one_duty_per_day_classes"], problem["min_gap_minutes"]
+    )
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    return planner
+
+
+def publish(
+    planner: Planner,
+    number_of_simulations: int,
+    metric_names: list[str],
+    seed: int,
+    directory: Path = DISTRIBUTED_DIR,
+    task_size: int = 1000,
+    keep_best: int = 10,
+) -> int:
+    """Publish the problem and the ranges of simulations, replacing a previous run.
+
+    Args:
+        planner (Planner): The Planner holding the prepared problem.
+        number_of_simulations (int): The number of simulations.
+        metric_names (list[str]): The names of the fairness metrics, in ranking order.
+        seed (int): The seed of the run.
+        directory (Path, optional): The shared directory. Defaults to DISTRIBUTED_DIR.
+        task_size (int, optional): The number of simulations of each range. Defaults to 1000.
+        keep_best (int, optional): The number of best simulations each range reports. Defaults to 10.
+
+    Returns:
+        int: The number of ranges.
+    """
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    directory.mkdir(parents=True, exist_ok=True)
+    for subdirectory in ("tasks", "claimed", "results"):
+        shutil.rmtree(directory / subdirectory, ignore_errors=True)
+        (directory / subdirectory).mkdir()
+    arrays = io.BytesIO()
+    np.savez(arrays, **CompiledProblem.compile(planner).arrays)
+    write_atomically(directory / ARRAYS_FILE, arrays.getvalue())
+    problem = {
+        "problem": problem_to_json(planner),
+        "number_of_simulations": number_of_simulations,
+        "metrics": metric_names,
+        "seed": seed,
+        "keep_best": keep_best,
+    }
+    # The arrays are written first, so a published problem is always complete
+    write_atomically(directory / PROBLEM_FILE, json.dumps(problem).encode())
+    # The problem is published before the tasks, so a claimed task can always be run
+    ranges = [
+        (first, min(first + task_size - 1, number_of_simulations))
+        for first in range(1, number_of_simulations + 1, task_size)
+    ]
+    for first, last in ranges:
+        (directory / "tasks" / f"{range_name(first, last)}.task").touch()
+    logging.info(f"Published {len(ranges)} ranges of simulations to {directory}")
+    return len(ranges)
+
+
+def load_problem(directory: Path = DISTRIBUTED_DIR) -> dict[str, Any]:
+    """Load the published problem.
+
+    Args:
+        directory (Path, optional): The shared directory. Defaults to DISTRIBUTED_DIR.
+
+    Raises:
+        FileNotFoundError: If no problem is published in the directory.
+
+    Returns:
+        dict[str, Any]: The planner, compiled problem and parameters of the run.
+    """
+    problem_file = directory / PROBLEM_FILE
+    if not problem_file.exists():
+        raise FileNotFoundError(f"No problem is published in {directory}.")
+    problem = json.loads(problem_file.read_text())
+    problem["planner"] = planner_from_json(problem.pop("problem"))
+    with np.load(directory / ARRAYS_FILE, allow_pickle=False) as arrays:
+        problem["compiled"] = CompiledProblem(
+            {name: arrays[name] for name in arrays.files}
+        )
+    return problem
+
+
+def claim_task(directory: Path, worker_id: str) -> tuple[int, int] | None:
+    """Claim the first range of simulations no other worker has claimed.
+
+    Args:
+        directory (Path): The shared directory.
+        worker_id (str): The id of the worker, written to the claimed task.
+
+    Returns:
+        tuple[int, int] | None: The first and last simulation numbers of the range, None if no range is left.
+    """
+    for task in sorted((directory / "tasks").glob("*.task")):
+        claimed = directory / "claimed" / task.name
+        try:
+            # A rename keeps the time the task was published, touch it first so a
+            # concurrent requeue_stale does not take the fresh claim for a stale one
+            os.utime(task)
+            task.rename(claimed)
+            os.utime(claimed)
+            if (directory / "results" / f"{task.stem}.json").exists():
+                # Requeued as stale but reported by its first worker after all
+                claimed.unlink(missing_ok=True)
+                continue
+            claimed.write_text(worker_id)
+        except FileNotFoundError:
+            # Another worker claimed it first, or it was requeued meanwhile
+            continue
+        first, last = task.stem.split("-")
+        return int(first), int(last)
+    return None
+
+
+@contextmanager
+def heartbeat(
+    claimed: Path, interval: float = HEARTBEAT_SECONDS
+) -> Generator[None, None, None]:
+    """Touch a claimed task periodically while its range runs, so it is not requeued as stale.
+
+    Args:
+        claimed (Path): The claimed task file.
+        interval (float, optional): The number of seconds between two touches. Defaults to HEARTBEAT_SECONDS.
+
+    Yields:
+        None: Control to the run of the range.
+    """
+    stopped = threading.Event()
+
+    def touch() -> None:
+        while not stopped.wait(interval):
+            try:
+                os.utime(claimed)
+            except FileNotFoundError:
+                # Requeued anyway, the report still counts
+                return
+
+    thread = threading.Thread(target=touch, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_task(problem: dict[str, Any], first: int, last: int) -> dict[str, Any]:
+    """Run a range of simulations and report its best ones.
+
+    Args:
+        problem (dict[str, Any]): The published problem, see load_problem.
+        first (int): The number of the first simulation of the range.
+        last (int): The number of the last simulation of the range.
+
+    Returns:
+        dict[str, Any]: The range, its number of completed and failed simulations, and the exit code and proctor indices of its best simulations.
+    """
+    planner: Planner = problem["planner"]
+    compiled: CompiledProblem = problem["compiled"]
+    exit_codes = np.zeros(last - first + 1, dtype=np.int8)
+    assignments = np.full(
+        (last - first + 1, len(compiled.needed), compiled.max_needed),
+        -1,
+        dtype=np.int32,
+    )
+    compiled.run(first, last, problem["seed"], exit_codes, assignments)
+    simulator = Simulator(
+        planner, 0, prune=False, metrics=make_metrics(problem["metrics"])
+    )
+    exams = CompiledProblem.exam_order(planner)
+    for sim_number, (exit_code, assignment) in enumerate(
+        zip(exit_codes, assignments), start=first
+    ):
+        simulator.store_compiled_result(sim_number, int(exit_code), exams, assignment)
+    return {
+        "first": first,
+        "last": last,
+        "completed": last - first + 1,
+        "failed": int(np.count_nonzero(exit_codes == FAILED)),
+        "schedules": [
+            {
+                "simulation": sim_number,
+                "exit_code": int(exit_codes[sim_number - first]),
+                "assignment": assignments[sim_number - first].tolist(),
+            }
+            for sim_number in simulator.order_by_fairness()[: problem["keep_best"]]
+        ],
+    }
+
+
+def report_task(directory: Path, report: dict[str, Any]) -> None:
+    """Report a finished range and release its claim.
+
+    Args:
+        directory (Path): The shared directory.
+        report (dict[str, Any]): The report of the range, see run_task.
+    """
+    name = range_name(report["first"], report["last"])
+    write_atomically(
+        directory / "results" / f"{name}.json", json.dumps(report).encode()
+    )
+    (directory / "claimed" / f"{name}.task").unlink(missing_ok=True)
+
+
+def work(
+    directory: Path = DISTRIBUTED_DIR,
+    worker_id: str | None = None,
+    max_tasks: int = 0,
+) -> int:
+    """Claim, run and report ranges of simulations until none is left.
+
+    Args:
+        directory (Path, optional): The shared directory. Defaults to DISTRIBUTED_DIR.
+        worker_id (str | None, optional): The id of the worker. Defaults to the host name and process id.
+        max_tasks (int, optional): Stop after this many ranges, 0 for no limit. Defaults to 0.
+
+    Returns:
+        int: The number of ranges run by the worker.
+    """
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    problem = load_problem(directory)
+    done = 0
+    while not max_tasks or done < max_tasks:
+        claimed = claim_task(directory, worker_id)
+        if claimed is None:
+            break
+        with heartbeat(directory / "claimed" / f"{range_name(*claimed)}.task"):
+            report = run_task(problem, *claimed)
+        report_task(directory, report)
+        done += 1
+    logging.info(f"Worker {worker_id} ran {done} ranges of simulations")
+    return done
+
+
+def requeue_stale(directory: Path, timeout: float) -> int:
+    """Requeue the ranges whose worker stopped touching them, e.g. of a lost node.
+
+    Args:
+        directory (Path): The shared directory.
+        timeout (float): The number of seconds without a touch after which a claim is stale, well above HEARTBEAT_SECONDS.
+
+    Returns:
+        int: The number of requeued ranges.
+    """
+    requeued = 0
+    now = time.time()
+    for claimed in (directory / "claimed").glob("*.task"):
+        try:
+            if now - claimed.stat().st_mtime > timeout:
+                claimed.rename(directory / "tasks" / claimed.name)
+                requeued += 1
+        except FileNotFoundError:
+            # Reported in the meantime
+            continue
+    if requeued:
+        logging.warning(f"Requeued {requeued} stale ranges of simulations")
+    return requeued
+
+
+def progress(directory: Path = DISTRIBUTED_DIR) -> tuple[int, int]:
+    """Get the number of reported ranges and the total number of ranges.
+
+    Args:
+        directory (Path, optional): The shared directory. Defaults to DISTRIBUTED_DIR.
+
+    Returns:
+        tuple[int, int]: The number of reported ranges and of all ranges.
+    """
+    reported = {file.stem for file in (directory / "results").glob("*.json")}
+    pending = {
+        file.stem
+        for subdirectory in ("tasks", "claimed")
+        for file in (directory / subdirectory).glob("*.task")
+    }
+    return len(reported), len(reported | pending)
+
+
+def merge(directory: Path = DISTRIBUTED_DIR) -> Simulator:
+    """Merge the reports of all ranges into a Simulator.
+
+    Args:
+        directory (Path, optional): The shared directory. Defaults to DISTRIBUTED_DIR.
+
+    Raises:
+        ValueError: If a range is not reported yet.
+
+    Returns:
+        Simulator: A Simulator holding the best simulations of the run.
+    """
+    reported, total = progress(directory)
+    if reported < total:
+        raise ValueError(f"Only {reported} of {total} ranges are reported yet.")
+    problem = load_problem(directory)
+    planner: Planner = problem["planner"]
+    simulator = Simulator(
+        planner,
+        problem["number_of_simulations"],
+        keep_best=problem["keep_best"],
+        prune=False,
+        metrics=make_metrics(problem["metrics"]),
+    )
+    exams = CompiledProblem.exam_order(planner)
+    for result_file in sorted((directory / "results").glob("*.json")):
+        report = json.loads(result_file.read_text())
+        simulator.completed += report["completed"]
+        simulator.failed += report["failed"]
+        for schedule in report["schedules"]:
+            simulator.store_compiled_result(
+                schedule["simulation"],
+                schedule["exit_code"],
+                exams,
+                np.array(schedule["assignment"]),
+            )
+    simulator.keep_best_results()
+    return simulator
@@ -0,0 +1,234 @@
+"""Module for the ensemble of all simulations, stored in memory-mapped NumPy files.
+
+Every stored simulation writes its assignment vector, the index of the proctors of each
+exam, and its fairness into preallocated .npy files under outputs/ensemble, row i for
+simulation i. The files are memory-mapped, so millions of simulations can be stored and
+queried or re-ranked without loading them into memory. Rows of pruned simulations keep
+NaN fairness and are skipped by the queries.
+
+Layout of the directory:
+
+- meta.json: the exams, proctors and metrics the columns refer to.
+- assignments.npy: (simulations + 1, exams, max_needed) int32 proctor indices, -1 where unassigned.
+- fairness.npy: (simulations + 1, metrics + 1) float64 failure and metric values.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scheduler.assignment import Assignment
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.metrics import Fairness
+from scheduler.path import OUTPUTS_DIR
+
+ENSEMBLE_DIR: Path = OUTPUTS_DIR / "ensemble"
+
+# Number of simulations read at once by the queries
+CHUNK_SIZE = 65_536
+
+
+class Ensemble:
+    def __init__(
+        self,
+        directory: Path = ENSEMBLE_DIR,
+        mode: str = "r",
+        number_of_simulations: int | None = None,
+    ) -> None:
+        """
+        Initialize the Ensemble class, opening the files of an existing ensemble.
+
+        Args:
+            directory (Path, optional): The directory of the ensemble. Defaults to ENSEMBLE_DIR.
+            mode (str, optional): The mode of the memory maps, "r" to query or "r+" to record. Defaults to "r".
+            number_of_simulations (int | None, optional): The number of simulations the ensemble should be sized for, e.g. of a resumed run. Defaults to None, any size.
+
+        Raises:
+            FileNotFoundError: If there is no ensemble in the directory.
+            ValueError: If the ensemble is sized for another number of simulations.
+        """
+        if not (directory / "meta.json").exists():
+            raise FileNotFoundError(f"No ensemble is stored in {directory}.")
+        self.directory = directory
+        meta = json.loads((directory / "meta.json").read_text())
+        self.exams: list[tuple[str, str, str]] = [tuple(exam) for exam in meta["exams"]]
+        self.proctors: list[str] = meta["proctors"]
+        self.metrics: list[str] = meta["metrics"]
+        self.assignments = np.load(directory / "assignments.npy", mmap_mode=mode)
+        self.fairness = np.load(directory / "fairness.npy", mmap_mode=mode)
+        if (
+            number_of_simulations is not None
+            and number_of_simulations != self.number_of_simulations
+        ):
+            raise ValueError(
+                f"The ensemble in {directory} holds {self.number_of_simulations} simulations, not {number_of_simulations}, resume with the same number of simulations."
+            )
+        self.exam_index = {exam[:2]: i for i, exam in enumerate(self.exams)}
+        self.proctor_index = {name: i for i, name in enumerate(self.proctors)}
+
+    @classmethod
+    def create(
+        cls,
+        exams: list[Exam],
+        proctors: list[Proctor],
+        metric_names: list[str],
+        number_of_simulations: int,
+        directory: Path = ENSEMBLE_DIR,
+    ) -> "Ensemble":
+        """
+        Preallocate the files of an ensemble, replacing a previous one.
+
+        Args:
+            exams (list[Exam]): The exams of the problem.
+            proctors (list[Proctor]): The proctors of the problem.
+            metric_names (list[str]): The names of the fairness metrics, in ranking order.
+            number_of_simulations (int): The number of simulations, simulation 0 is stored too.
+            directory (Path, optional): The directory of the ensemble. Defaults to ENSEMBLE_DIR.
+
+        Returns:
+            Ensemble: The ensemble, open for recording.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        max_needed = max([exam.number_of_proctors_needed for exam in exams] + [1])
+        assignments = np.lib.format.open_memmap(
+            directory / "assignments.npy",
+            mode="w+",
+            dtype=np.int32,
+            shape=(number_of_simulations + 1, len(exams), max_needed),
+        )
+        assignments[:] = -1
+        fairness = np.lib.format.open_memmap(
+            directory / "fairness.npy",
+            mode="w+",
+            dtype=np.float64,
+            shape=(number_of_simulations + 1, len(metric_names) + 1),
+        )
+        fairness[:] = np.nan
+        del assignments, fairness
+        meta = {
+            "exams": [[exam.title, exam.classroom, exam.block] for exam in exams],
+            "proctors": [proctor.name for proctor in proctors],
+            "metrics": metric_names,
+        }
+        (directory / "meta.json").write_text(json.dumps(meta, indent=2))
+        return cls(directory, mode="r+")
+
+    @property
+    def number_of_simulations(self) -> int:
+        """
+        Get the number of simulations the ensemble is sized for, simulation 0 aside.
+
+        Returns:
+            int: The number of simulations.
+        """
+        return len(self.assignments) - 1
+
+    def record(self, sim_number: int, exams: list[Exam]) -> None:
+        """
+        Record the assignment vector of a simulation.
+
+        Args:
+            sim_number (int): The simulation number.
+            exams (list[Exam]): The scheduled exams of the simulation.
+        """
+        row = self.assignments[sim_number]
+        row[:] = -1
+        for exam in exams:
+            proctor_indices = [
+                self.proctor_index[proctor.name] for proctor in exam.proctors
+            ]
+            row[self.exam_index[exam.key], : len(proctor_indices)] = proctor_indices
+
+    def record_fairness(self, sim_number: int, fairness: Fairness) -> None:
+        """
+        Record the fairness of a simulation, which marks it as recorded.
+
+        Args:
+            sim_number (int): The simulation number.
+            fairness (Fairness): The fairness of the simulation.
+        """
+        self.fairness[sim_number] = fairness[:-1]
+
+    def flush(self) -> None:
+        """
+        Write the recorded simulations to disk.
+        """
+        self.assignments.flush()
+        self.fairness.flush()
+
+    def recorded(self) -> np.ndarray:
+        """
+        Get the numbers of the recorded simulations.
+
+        Returns:
+            np.ndarray: The simulation numbers, in increasing order.
+        """
+        return np.flatnonzero(~np.isnan(self.fairness[:, 0]))
+
+    def order(self, by: list[str] | None = None) -> np.ndarray:
+        """
+        Order the recorded simulations by failure, then by metrics, like Simulator.order_by_fairness.
+
+        Args:
+            by (list[str] | None, optional): The names of the metrics to rank by, in order. Defaults to the metrics of the run.
+
+        Raises:
+            ValueError: If a metric was not measured by the run.
+
+        Returns:
+            np.ndarray: The simulation numbers, the fairest first.
+        """
+        by = self.metrics if by is None else by
+        for name in by:
+            if name not in self.metrics:
+                raise ValueError(
+                    f"Metric {name!r} is not one of {', '.join(self.metrics)}."
+                )
+        sim_numbers = self.recorded()
+        columns = [0] + [self.metrics.index(name) + 1 for name in by]
+        fairness = np.asarray(self.fairness[sim_numbers][:, columns])
+        # np.lexsort sorts by the last key first, the simulation number breaks ties
+        return sim_numbers[np.lexsort([sim_numbers, *fairness.T[::-1]])]
+
+    def assignment(self, sim_number: int) -> Assignment:
+        """
+        Get the assignment of a recorded simulation.
+
+        Args:
+            sim_number (int): The simulation number.
+
+        Returns:
+            Assignment: The names of the proctors of each exam, keyed by exam key.
+        """
+        return {
+            (title, classroom): [
+                self.proctors[index] for index in proctor_indices if index >= 0
+            ]
+            for (title, classroom, _), proctor_indices in zip(
+                self.exams, self.assignments[sim_number].tolist()
+            )
+        }
+
+    def block_frequency(self) -> pd.DataFrame:
+        """
+        Count how often each proctor gets each block over the recorded simulations, in chunks.
+
+        Returns:
+            pd.DataFrame: The share of recorded simulations in which each proctor, a row, has a duty in each block, a column.
+        """
+        blocks = list(dict.fromkeys(block for _, _, block in self.exams))
+        exam_blocks = np.array([blocks.index(block) for _, _, block in self.exams])
+        counts = np.zeros((len(self.proctors), len(blocks)), dtype=np.int64)
+        sim_numbers = self.recorded()
+        for start in range(0, len(sim_numbers), CHUNK_SIZE):
+            chunk = np.asarray(
+                self.assignments[sim_numbers[start : start + CHUNK_SIZE]]
+            )
+            exam_block = np.broadcast_to(exam_blocks[None, :, None], chunk.shape)
+            assigned = chunk >= 0
+            np.add.at(counts, (chunk[assigned], exam_block[assigned]), 1)
+        return pd.DataFrame(
+            counts / max(len(sim_numbers), 1), index=self.proctors, columns=blocks
+        )
@@ -78,6 +78,15 @@ class Exam:
             and not self.is_first_year_masters_exam
         )
 
+    @property
+    def key(self) -> tuple[str, str]:
+        """Get the key identifying the exam, independent of when it takes place.
+
+        Returns:
+            tuple[str, str]: The title and the classroom of the exam.
+        """
+        return self.title, self.classroom
+
     @property
     def block(self) -> str:
         """Get the block of the exam.
@@ -0,0 +1,210 @@
+"""Module for exporting the best schedules to Excel, CSV and Parquet files.
+
+Each schedule is exported as an exams table, the proctors of each exam, and a rosters
+table, the duties of each proctor. The exams table comes first in Excel files, so an
+exported schedule can be read back with read_assignment, e.g. to warm-start a run. A
+summary table holds the fairness of the exported schedules.
+"""
+
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import openpyxl
+import pandas as pd
+
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.path import SCHEDULES_DIR
+
+if TYPE_CHECKING:
+    from scheduler.simulator import Simulator
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet")
+
+# Engines pandas writes parquet files with, installed with the parquet extra
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+
+def parquet_engine_available() -> bool:
+    """Check if an engine to write parquet files is installed.
+
+    Returns:
+        bool: True if pyarrow or fastparquet can be imported, False otherwise.
+    """
+    return any(find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+
+def exams_frame(exams: list[Exam]) -> pd.DataFrame:
+    """Get the table of the exams of a schedule and their proctors.
+
+    Args:
+        exams (list[Exam]): The scheduled exams.
+
+    Returns:
+        pd.DataFrame: One row per exam, the proctor names being separated by commas.
+    """
+    return pd.DataFrame(
+        {
+            "Exam_Title": [exam.title for exam in exams],
+            "Classroom": [exam.classroom for exam in exams],
+            "Exam_Block": [exam.block for exam in exams],
+            "Instructors": [exam.instructor for exam in exams],
+            "Number_of_Proctors_Needed": [
+                exam.number_of_proctors_needed for exam in exams
+            ],
+            "Proctors": [
+                ", ".join(proctor.name for proctor in exam.proctors) for exam in exams
+            ],
+        }
+    )
+
+
+def rosters_frame(proctors: list[Proctor]) -> pd.DataFrame:
+    """Get the table of the duties of each proctor of a schedule.
+
+    Args:
+        proctors (list[Proctor]): The scheduled proctors.
+
+    Returns:
+        pd.DataFrame: One row per duty, sorted by proctor class, name and block, proctors without duties having a row with empty duty columns.
+    """
+    rosters = pd.DataFrame(
+        {
+            "Name": [proctor.name for proctor in proctors],
+            "Email": [proctor.email for proctor in proctors],
+            "Proctor_Class": [proctor.proctor_class for proctor in proctors],
+            "Total_Duties": [
+                len(proctor.duties) + proctor.total_proctored_before
+                for proctor in proctors
+            ],
+            "Duty": [proctor.duties for proctor in proctors],
+        }
+    ).explode("Duty", ignore_index=True)
+    duties = rosters.pop("Duty")
+    has_duty = duties.notna()
+    for column, attribute in [
+        ("Exam_Block", "block"),
+        ("Exam_Title", "title"),
+        ("Classroom", "classroom"),
+    ]:
+        rosters[column] = None
+        rosters.loc[has_duty, column] = [
+            getattr(exam, attribute) for exam in duties[has_duty]
+        ]
+    return rosters.sort_values(
+        ["Proctor_Class", "Name", "Exam_Block"], ignore_index=True
+    )
+
+
+def fairness_frame(simulator: "Simulator", sim_numbers: list[int]) -> pd.DataFrame:
+    """Get the table of the fairness of the given simulations.
+
+    Args:
+        simulator (Simulator): The Simulator after the simulations.
+        sim_numbers (list[int]): The simulation numbers, in rank order.
+
+    Returns:
+        pd.DataFrame: One row per simulation, with its rank, failure and fairness metrics.
+    """
+    fairness = pd.DataFrame(
+        [simulator.fairness_results[sim_number] for sim_number in sim_numbers],
+        columns=[
+            "Failed",
+            *[metric.name for metric in simulator.metrics],
+            "Simulation",
+        ],
+    )
+    fairness["Failed"] = fairness["Failed"].astype(bool)
+    fairness.insert(0, "Simulation", fairness.pop("Simulation"))
+    fairness.insert(0, "Rank", range(1, len(fairness) + 1))
+    return fairness
+
+
+def write_excel(file: Path, tables: dict[str, pd.DataFrame]) -> None:
+    """Write tables to the sheets of an Excel file, with constant memory.
+
+    Args:
+        file (Path): The path of the Excel file.
+        tables (dict[str, pd.DataFrame]): The tables, keyed by sheet name.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, table in tables.items():
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(list(table.columns))
+        for row in (
+            table.astype(object).where(table.notna(), None).itertuples(index=False)
+        ):
+            sheet.append(row)
+    workbook.save(file)
+
+
+def write_tables(
+    stem: Path, tables: dict[str, pd.DataFrame], formats: list[str]
+) -> list[Path]:
+    """Write tables in each of the given formats.
+
+    Excel files hold every table in a sheet, CSV and Parquet files hold one table each.
+
+    Args:
+        stem (Path): The path of the files without suffix.
+        tables (dict[str, pd.DataFrame]): The tables, keyed by sheet name.
+        formats (list[str]): The formats, among EXPORT_FORMATS.
+
+    Returns:
+        list[Path]: The paths of the written files.
+    """
+    files = []
+    for export_format in formats:
+        if export_format == "xlsx":
+            file = stem.with_suffix(".xlsx")
+            write_excel(file, tables)
+            files.append(file)
+            continue
+        for sheet_name, table in tables.items():
+            file = stem.with_name(f"{stem.name}_{sheet_name.lower()}.{export_format}")
+            if export_format == "csv":
+                table.to_csv(file, index=False)
+            else:
+                table.to_parquet(file, index=False)
+            files.append(file)
+    return files
+
+
+def export_schedules(
+    simulator: "Simulator",
+    number_of_schedules: int,
+    formats: list[str],
+    directory: Path = SCHEDULES_DIR,
+) -> list[Path]:
+    """Export the fairest schedules of a Simulator and their fairness summary.
+
+    Writes schedule_<rank> files with Exams and Rosters tables and summary files with a
+    Fairness table. Parquet files need the parquet extra, see parquet_engine_available.
+
+    Args:
+        simulator (Simulator): The Simulator after the simulations.
+        number_of_schedules (int): The number of schedules to export, the fairest first.
+        formats (list[str]): The formats, among EXPORT_FORMATS.
+        directory (Path, optional): The directory of the files. Defaults to SCHEDULES_DIR.
+
+    Raises:
+        ValueError: If a format is not in EXPORT_FORMATS.
+
+    Returns:
+        list[Path]: The paths of the written files.
+    """
+    for export_format in formats:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"{export_format!r} is not an export format, available formats are {', '.join(EXPORT_FORMATS)}"
+            )
+    simulator.measure_fairness_all()
+    ranking = simulator.order_by_fairness()[:number_of_schedules]
+    files = []
+    for rank, sim_number in enumerate(ranking, start=1):
+        _, exams, proctors, _ = simulator.results[sim_number]
+        tables = {"Exams": exams_frame(exams), "Rosters": rosters_frame(proctors)}
+        files += write_tables(directory / f"schedule_{rank}", tables, formats)
+    summary = {"Fairness": fairness_frame(simulator, ranking)}
+    files += write_tables(directory / "summary", summary, formats)
+    return files
@@ -0,0 +1,202 @@
+"""Module for the history of runs, kept in a SQLite database.
+
+Each run records the fingerprint of its problem, its parameters, timings, failure
+statistics and its best schedules, so the best schedule ever found for a problem can be
+reused and the throughput of runs can be tracked over time.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from scheduler.assignment import Assignment, get_assignment
+from scheduler.path import OUTPUTS_DIR
+
+if TYPE_CHECKING:
+    from scheduler.simulator import Simulator
+
+HISTORY_FILE: Path = OUTPUTS_DIR / "history.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    simulations INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    pruned INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    simulations_per_second REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedules (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    rank INTEGER NOT NULL,
+    simulation INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    objective REAL NOT NULL,
+    fairness TEXT NOT NULL,
+    assignment TEXT NOT NULL,
+    PRIMARY KEY (run_id, rank)
+);
+CREATE INDEX IF NOT EXISTS runs_by_inputs ON runs (inputs_hash, metrics);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (started_at);
+CREATE INDEX IF NOT EXISTS schedules_by_fairness ON schedules (run_id, failed, objective);
+"""
+
+
+class RunHistory:
+    def __init__(self, file: Path = HISTORY_FILE) -> None:
+        """
+        Initialize the RunHistory class, creating the database if it does not exist.
+
+        Args:
+            file (Path, optional): The path of the SQLite database. Defaults to HISTORY_FILE.
+        """
+        self.file = file
+        self.connection = sqlite3.connect(file)
+        self.connection.executescript(SCHEMA)
+
+    def record_run(
+        self,
+        simulator: "Simulator",
+        inputs_hash: str,
+        parameters: dict[str, Any],
+        seconds: float,
+        keep_best: int = 10,
+    ) -> int:
+        """
+        Record a run and its best schedules.
+
+        Args:
+            simulator (Simulator): The Simulator after the simulations.
+            inputs_hash (str): The fingerprint of the problem, see Planner.fingerprint.
+            parameters (dict[str, Any]): The parameters of the run, JSON serializable.
+            seconds (float): The duration of the simulations in seconds.
+            keep_best (int, optional): The number of best schedules to record. Defaults to 10.
+
+        Raises:
+            RuntimeError: If the database did not return the id of the recorded run.
+
+        Returns:
+            int: The id of the run.
+        """
+        simulator.measure_fairness_all()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, inputs_hash, metrics, parameters, "
+                "simulations, failed, pruned, seconds, simulations_per_second) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    inputs_hash,
+                    ",".join(metric.name for metric in simulator.metrics),
+                    json.dumps(parameters, sort_keys=True),
+                    simulator.completed,
+                    simulator.failed,
+                    simulator.pruned,
+                    seconds,
+                    # The seconds only cover the simulations since a resume
+                    (simulator.completed - simulator.resumed) / seconds
+                    if seconds > 0
+                    else 0.0,
+                ),
+            )
+            run_id = cursor.lastrowid
+            if run_id is None:
+                raise RuntimeError(
+                    f"No id was returned for the run recorded in {self.file}."
+                )
+            self.connection.executemany(
+                "INSERT INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        rank,
+                        sim_number,
+                        int(simulator.fairness_results[sim_number][0]),
+                        float(simulator.fairness_results[sim_number][1]),
+                        json.dumps(
+                            [
+                                float(value)
+                                for value in simulator.fairness_results[sim_number][:-1]
+                            ]
+                        ),
+                        json.dumps(
+                            [
+                                [*key, names]
+                                for key, names in get_assignment(
+                                    simulator.results[sim_number][1]
+                                ).items()
+                            ]
+                        ),
+                    )
+                    for rank, sim_number in enumerate(
+                        simulator.order_by_fairness()[:keep_best], start=1
+                    )
+                ],
+            )
+        return run_id
+
+    def best_schedule(
+        self, inputs_hash: str, metrics: list[str]
+    ) -> tuple[int, tuple[float, ...], Assignment] | None:
+        """
+        Get the best schedule ever found for a problem, ranked by the given metrics.
+
+        Args:
+            inputs_hash (str): The fingerprint of the problem, see Planner.fingerprint.
+            metrics (list[str]): The names of the fairness metrics, in ranking order.
+
+        Returns:
+            tuple[int, tuple[float, ...], Assignment] | None: The id of the run that found it, its failure and metric values, and its assignment, None if the problem has no recorded run.
+        """
+        # The index narrows the candidates to the ties on failure and first metric
+        rows = self.connection.execute(
+            "WITH candidates AS ("
+            "SELECT schedules.* FROM schedules JOIN runs ON runs.id = schedules.run_id "
+            "WHERE runs.inputs_hash = ? AND runs.metrics = ?) "
+            "SELECT run_id, fairness, assignment FROM candidates "
+            "WHERE (failed, objective) = "
+            "(SELECT failed, objective FROM candidates ORDER BY failed, objective LIMIT 1)",
+            (inputs_hash, ",".join(metrics)),
+        ).fetchall()
+        if not rows:
+            return None
+        run_id, fairness, assignment = min(rows, key=lambda row: json.loads(row[1]))
+        return (
+            run_id,
+            tuple(json.loads(fairness)),
+            {
+                (title, classroom): names
+                for title, classroom, names in json.loads(assignment)
+            },
+        )
+
+    def throughput(
+        self, inputs_hash: str | None = None
+    ) -> list[tuple[str, int, float]]:
+        """
+        Get the throughput of the recorded runs over time.
+
+        Args:
+            inputs_hash (str | None, optional): Only consider runs of this problem. Defaults to None.
+
+        Returns:
+            list[tuple[str, int, float]]: The start time, number of simulations and simulations per second of each run, oldest first.
+        """
+        query = "SELECT started_at, simulations, simulations_per_second FROM runs"
+        if inputs_hash is None:
+            return self.connection.execute(f"{query} ORDER BY started_at").fetchall()
+        return self.connection.execute(
+            f"{query} WHERE inputs_hash = ? ORDER BY started_at", (inputs_hash,)
+        ).fetchall()
+
+    def close(self) -> None:
+        """
+        Close the connection to the database.
+        """
+        self.connection.close()
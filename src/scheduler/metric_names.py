@@ -0,0 +1,17 @@
+"""Module for the names of the fairness metrics.
+
+The names are kept apart from the metrics, which need NumPy, so that the config and the
+CLI load without it. Each name is made into a metric by scheduler.metrics.METRICS.
+"""
+
+# Names of the available metrics, used in the fairness_metrics field of config.yaml
+METRIC_NAMES = (
+    "spread",
+    "first_year_std",
+    "std",
+    "not_preferred",
+    "consecutive_days",
+    *(f"class_{proctor_class}_spread" for proctor_class in (1, 2, 3)),
+    *(f"class_{proctor_class}_std" for proctor_class in (2, 3)),
+)
+DEFAULT_METRICS = ["spread", "first_year_std", "std", "not_preferred"]
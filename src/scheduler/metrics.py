@@ -0,0 +1,234 @@
+"""Module for the fairness metrics used to rank schedules.
+
+Every metric is minimized. Metrics are evaluated in batch only, over the number of duties
+of each proctor in each block of many schedules at once, never per assignment. The order
+of the metrics in the config defines the ranking: schedules are ordered by failure first,
+then by each metric in turn.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import date
+
+import numpy as np
+
+from scheduler.exam_proctor import Exam, Proctor
+
+# Failure, the value of each metric and the simulation number as tie breaker
+Fairness = tuple[int | float, ...]
+
+
+def block_order(exams: list[Exam]) -> list[str]:
+    """Get the blocks of the exams in the order of the duty counts of a FairnessBatch.
+
+    Args:
+        exams (list[Exam]): The exams of the problem.
+
+    Returns:
+        list[str]: The blocks, in chronological order.
+    """
+    return sorted({exam.block for exam in exams})
+
+
+class FairnessBatch:
+    def __init__(
+        self,
+        duty_counts: np.ndarray,
+        total_proctored_before: np.ndarray,
+        proctor_classes: np.ndarray,
+    ) -> None:
+        """
+        Initialize the FairnessBatch class.
+
+        Args:
+            duty_counts (np.ndarray): The number of duties of each proctor in each block, of shape (schedules, proctors, blocks), blocks in the order of block_order.
+            total_proctored_before (np.ndarray): The duties of each proctor before the exams, of shape (proctors,).
+            proctor_classes (np.ndarray): The class of each proctor, of shape (proctors,).
+        """
+        self.duty_counts = duty_counts
+        self.total_duties = total_proctored_before + duty_counts.sum(axis=2)
+        self.proctor_classes = proctor_classes
+
+
+class FairnessMetric(ABC):
+    """Base class for fairness metrics.
+
+    Subclasses implement evaluate, make_metrics setting name to the name in the config.
+    """
+
+    name: str = ""
+
+    def prepare(self, exams: list[Exam], proctors: list[Proctor]) -> None:
+        """
+        Precompute anything the metric needs about the problem, once per run.
+
+        Metrics that only need the total duties keep this default, which does nothing.
+
+        Args:
+            exams (list[Exam]): The exams of the problem.
+            proctors (list[Proctor]): The proctors of the problem, in the order of the planner.
+        """
+        return None
+
+    @abstractmethod
+    def evaluate(self, batch: FairnessBatch) -> np.ndarray:
+        """
+        Evaluate the metric for a batch of schedules.
+
+        Args:
+            batch (FairnessBatch): The batch of schedules.
+
+        Returns:
+            np.ndarray: The value of the metric for each schedule, of shape (schedules,).
+        """
+
+
+class Spread(FairnessMetric):
+    name = "spread"
+
+    def __init__(self, proctor_class: int | None = None) -> None:
+        """
+        Initialize the Spread class, the difference of the maximum and minimum total duties.
+
+        Args:
+            proctor_class (int | None, optional): Only consider proctors of this class. Defaults to None.
+        """
+        self.proctor_class = proctor_class
+
+    def evaluate(self, batch: FairnessBatch) -> np.ndarray:
+        total_duties = select_class(batch, self.proctor_class)
+        if total_duties.shape[1] == 0:
+            return np.zeros(len(total_duties), dtype=int)
+        return total_duties.max(axis=1) - total_duties.min(axis=1)
+
+
+class StandardDeviation(FairnessMetric):
+    name = "std"
+
+    def __init__(self, proctor_class: int | None = None) -> None:
+        """
+        Initialize the StandardDeviation class, the standard deviation of total duties.
+
+        Args:
+            proctor_class (int | None, optional): Only consider proctors of this class. Defaults to None.
+        """
+        self.proctor_class = proctor_class
+
+    def evaluate(self, batch: FairnessBatch) -> np.ndarray:
+        total_duties = select_class(batch, self.proctor_class)
+        if total_duties.shape[1] == 0:
+            return np.zeros(len(total_duties))
+        return total_duties.std(axis=1)
+
+
+class NotPreferredViolations(FairnessMetric):
+    name = "not_preferred"
+
+    def __init__(self) -> None:
+        """
+        Initialize the NotPreferredViolations class, the number of proctors with a not preferred duty.
+        """
+        self.not_preferred = np.zeros((0, 0), dtype=bool)
+
+    def prepare(self, exams: list[Exam], proctors: list[Proctor]) -> None:
+        blocks = block_order(exams)
+        self.not_preferred = np.array(
+            [
+                [block in proctor.not_preferred for block in blocks]
+                for proctor in proctors
+            ],
+            dtype=bool,
+        ).reshape(len(proctors), len(blocks))
+
+    def evaluate(self, batch: FairnessBatch) -> np.ndarray:
+        violated = (batch.duty_counts > 0) & self.not_preferred
+        return violated.any(axis=2).sum(axis=1)
+
+
+class ConsecutiveDayDuties(FairnessMetric):
+    name = "consecutive_days"
+
+    def __init__(self) -> None:
+        """
+        Initialize the ConsecutiveDayDuties class, the number of duties on the day after another duty.
+        """
+        self.block_days = np.zeros((0, 1), dtype=int)
+
+    def prepare(self, exams: list[Exam], proctors: list[Proctor]) -> None:
+        block_dates = {exam.block: exam.date for exam in exams}
+        days = {
+            block: date.fromisoformat(block_dates[block][:10]).toordinal()
+            for block in block_order(exams)
+        }
+        first_day = min(days.values(), default=0)
+        number_of_days = max(days.values(), default=0) - first_day + 1
+        # One-hot day of each block
+        self.block_days = np.zeros((len(days), number_of_days), dtype=int)
+        for index, day in enumerate(days.values()):
+            self.block_days[index, day - first_day] = 1
+
+    def evaluate(self, batch: FairnessBatch) -> np.ndarray:
+        days = (batch.duty_counts @ self.block_days) > 0
+        return (days[:, :, 1:] & days[:, :, :-1]).sum(axis=(1, 2))
+
+
+def select_class(batch: FairnessBatch, proctor_class: int | None) -> np.ndarray:
+    """Select the total duties of the proctors of a class.
+
+    Args:
+        batch (FairnessBatch): The batch of schedules.
+        proctor_class (int | None): The proctor class, None for all proctors.
+
+    Returns:
+        np.ndarray: The total duties of the proctors of the class, of shape (schedules, proctors of the class).
+    """
+    if proctor_class is None:
+        return batch.total_duties
+    return batch.total_duties[:, batch.proctor_classes == proctor_class]
+
+
+# The metric of each name of METRIC_NAMES
+METRICS: dict[str, Callable[[], FairnessMetric]] = {
+    "spread": Spread,
+    "first_year_std": lambda: StandardDeviation(proctor_class=1),
+    "std": StandardDeviation,
+    "not_preferred": NotPreferredViolations,
+    "consecutive_days": ConsecutiveDayDuties,
+    **{
+        f"class_{proctor_class}_spread": lambda proctor_class=proctor_class: Spread(
+            proctor_class
+        )
+        for proctor_class in (1, 2, 3)
+    },
+    **{
+        f"class_{proctor_class}_std": lambda proctor_class=proctor_class: StandardDeviation(
+            proctor_class
+        )
+        for proctor_class in (2, 3)
+    },
+}
+
+
+def make_metrics(names: list[str]) -> list[FairnessMetric]:
+    """Make the fairness metrics with the given names.
+
+    Args:
+        names (list[str]): The names of the metrics, in ranking order.
+
+    Raises:
+        ValueError: If a name is not an available metric.
+
+    Returns:
+        list[FairnessMetric]: The fairness metrics.
+    """
+    for name in names:
+        if name not in METRICS:
+            raise ValueError(
+                f"{name!r} is not a fairness metric, available metrics are {', '.join(METRICS)}"
+            )
+    metrics = []
+    for name in names:
+        metric = METRICS[name]()
+        metric.name = name
+        metrics.append(metric)
+    return metrics
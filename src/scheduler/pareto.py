@@ -0,0 +1,91 @@
+"""Module for the Pareto front of schedules over the fairness objectives."""
+
+from bisect import bisect_left
+
+
+def dominates(first: tuple[float, ...], second: tuple[float, ...]) -> bool:
+    """Check if the first objectives dominate the second, all objectives being minimized.
+
+    Args:
+        first (tuple[float, ...]): The first objectives.
+        second (tuple[float, ...]): The second objectives.
+
+    Returns:
+        bool: True if first is no worse in every objective and better in at least one.
+    """
+    return all(a <= b for a, b in zip(first, second)) and first != second
+
+
+class ParetoFront:
+    def __init__(self) -> None:
+        """
+        Initialize the ParetoFront class.
+
+        The front holds the objectives and simulation numbers of the non-dominated schedules
+        in a list sorted by objectives, so a schedule is inserted in place with bisect.
+        Schedules with the same objectives as a member are not added.
+        """
+        self.front: list[tuple[tuple[float, ...], int]] = []
+        self.sim_numbers: set[int] = set()
+
+    @property
+    def members(self) -> dict[int, tuple[float, ...]]:
+        """
+        Get the members of the front.
+
+        Returns:
+            dict[int, tuple[float, ...]]: The objectives of each member, sorted by objectives.
+        """
+        return {sim_number: objectives for objectives, sim_number in self.front}
+
+    def insert(self, sim_number: int, objectives: tuple[float, ...]) -> bool:
+        """
+        Insert a schedule into the front if no member dominates or equals it, removing the members it dominates.
+
+        Args:
+            sim_number (int): The simulation number of the schedule.
+            objectives (tuple[float, ...]): The objectives of the schedule, all minimized.
+
+        Returns:
+            bool: True if the schedule joined the front, False otherwise.
+        """
+        objectives = tuple(objectives)
+        position = bisect_left(self.front, (objectives,))
+        if position < len(self.front) and self.front[position][0] == objectives:
+            return False
+        # Only members sorted before the schedule can dominate it
+        for member_objectives, _ in self.front[:position]:
+            if dominates(member_objectives, objectives):
+                return False
+        # and only members sorted after it can be dominated by it
+        dominated = [
+            index
+            for index in range(position, len(self.front))
+            if dominates(objectives, self.front[index][0])
+        ]
+        for index in reversed(dominated):
+            self.sim_numbers.discard(self.front.pop(index)[1])
+        self.front.insert(position, (objectives, sim_number))
+        self.sim_numbers.add(sim_number)
+        return True
+
+    def __contains__(self, sim_number: int) -> bool:
+        """
+        Check if a simulation is a member of the front.
+
+        Args:
+            sim_number (int): The simulation number.
+
+        Returns:
+            bool: True if the simulation is a member of the front, False otherwise.
+        """
+        return sim_number in self.sim_numbers
+
+    def __len__(self) -> int:
+        """
+        Get the number of members of the front.
+
+        Returns:
+            int: The number of members of the front.
+        """
+        return len(self.front)
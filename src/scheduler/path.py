@@ -8,3 +8,5 @@ CONFIG_DIR: Path = ROOT_DIR / "config"
 LOGS_DIR: Path = ROOT_DIR / "logs"
 OUTPUTS_DIR: Path = ROOT_DIR / "outputs"
 INPUTS_DIR: Path = ROOT_DIR / "inputs"
+PICKLES_DIR: Path = OUTPUTS_DIR / "pickles"
+SCHEDULES_DIR: Path = OUTPUTS_DIR / "schedules"
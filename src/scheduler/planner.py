@@ -1,8 +1,100 @@
+import hashlib
+import json
 import logging
 import random
+from concurrent.futures import Executor, ProcessPoolExecutor
 from functools import cached_property
 
+import numpy as np
+
+from scheduler.assignment import Assignment
 from scheduler.exam_proctor import Exam, Proctor
+from scheduler.metrics import Fairness
+from scheduler.timetable import Timetable
+
+# Exit codes of the schedule method
+SUCCEEDED, FAILED, PRUNED = 0, 1, 2
+
+# Components of the problem held by each worker process, see Planner.component_executor
+_worker_components: list["Planner"] = []
+
+# Seeds are keys of the counter-based generator, which takes two 64-bit words
+SEED_MASK = 2**64 - 1
+
+
+def simulation_generator(seed: int, sim_number: int) -> np.random.Generator:
+    """
+    Get the random number generator of a simulation, a counter-based Philox stream.
+
+    The stream is keyed by the seed of the run and the simulation number, so any
+    simulation can be run again from its number alone, in any order or process.
+
+    Args:
+        seed (int): The seed of the run.
+        sim_number (int): The simulation number.
+
+    Returns:
+        np.random.Generator: The random number generator of the simulation.
+    """
+    return np.random.Generator(
+        np.random.Philox(key=[seed & SEED_MASK, sim_number & SEED_MASK])
+    )
+
+
+def simulation_rng(seed: int, sim_number: int) -> random.Random:
+    """
+    Get the random module generator of a simulation, seeded by its Philox stream.
+
+    Args:
+        seed (int): The seed of the run.
+        sim_number (int): The simulation number.
+
+    Returns:
+        random.Random: The random number generator of the simulation.
+    """
+    return random.Random(
+        int(simulation_generator(seed, sim_number).bit_generator.random_raw())
+    )
+
+
+def _init_component_worker(components: list["Planner"]) -> None:
+    """
+    Store the components of the problem in a worker process.
+
+    Args:
+        components (list[Planner]): The components of the problem.
+    """
+    global _worker_components
+    _worker_components = components
+
+
+def _schedule_component(
+    index: int,
+    try_number: int,
+    seed: int,
+    incumbent: Fairness | None,
+) -> tuple[int, list[list[int]]]:
+    """
+    Schedule a component of the problem in a worker process.
+
+    Args:
+        index (int): The index of the component.
+        try_number (int): The number of the scheduling attempt.
+        seed (int): The seed of the random number generator.
+        incumbent (Fairness | None): The fairness of the best schedule so far.
+
+    Returns:
+        tuple[int, list[list[int]]]: The exit code and, for each exam of the component, the indices of its proctors.
+    """
+    component = _worker_components[index]
+    exit_code = component.schedule(
+        try_number, incumbent=incumbent, rng=random.Random(seed)
+    )
+    proctor_indices = {proctor: i for i, proctor in enumerate(component.proctors)}
+    return exit_code, [
+        [proctor_indices[proctor] for proctor in exam.proctors]
+        for exam in component.exams
+    ]
 
 
 class Planner:
@@ -19,6 +111,16 @@ class Planner:
         self.min_duties: int = 0
         self.max_duties: int = 0
         self.blocks: dict[str, list[Exam]] = {}
+        self.components: list[Planner] = []
+        self.preferred: Assignment = {}
+        self.preference: float = 0.0
+        self.weighted: bool = False
+        self.rng = random.Random()
+        self.one_duty_per_day_classes: set[int] = set()
+        self.min_gap_minutes: int = 0
+        self.timetable: Timetable | None = None
+        self.proctor_conflicts: dict[Proctor, list[list[int]]] = {}
+        self.occupancy: dict[Proctor, list[int]] = {}
 
     @cached_property
     def max_total_proctored_before(self) -> int:
@@ -30,11 +132,119 @@ class Planner:
         """
         return max([proctor.total_proctored_before for proctor in self.proctors])
 
+    def fingerprint(self) -> str:
+        """
+        Get a fingerprint of the problem, its exams, proctors, constraints and time rules.
+
+        The fingerprint does not depend on the order of the exams and proctors.
+
+        Returns:
+            str: The SHA-256 hex digest of the problem.
+        """
+        problem = {
+            "exams": sorted(
+                [
+                    exam.title,
+                    exam.classroom,
+                    exam.block,
+                    exam.instructor,
+                    int(exam.number_of_proctors_needed),
+                    sorted(proctor.name for proctor in exam.requires_specific_proctor),
+                ]
+                for exam in self.exams
+            ),
+            "proctors": sorted(
+                [
+                    proctor.name,
+                    proctor.email,
+                    int(proctor.total_proctored_before),
+                    int(proctor.proctor_class),
+                    sorted(proctor.unavailable),
+                    sorted(proctor.not_preferred),
+                ]
+                for proctor in self.proctors
+            ),
+            "one_duty_per_day_classes": sorted(self.one_duty_per_day_classes),
+            "min_gap_minutes": self.min_gap_minutes,
+        }
+        return hashlib.sha256(json.dumps(problem).encode()).hexdigest()
+
     def reset_all(self) -> None:
         for exam in self.exams:
             exam.reset()
         for proctor in self.proctors:
             proctor.reset()
+        if self.timetable is not None:
+            for proctor in self.proctors:
+                self.occupancy[proctor] = [0] * len(self.timetable.blocks)
+
+    def set_time_rules(
+        self, one_duty_per_day_classes: list[int], min_gap_minutes: int
+    ) -> None:
+        """
+        Set the rules on the times of the duties of a proctor, applied from the next set_blocks.
+
+        Args:
+            one_duty_per_day_classes (list[int]): The proctor classes with at most one duty per day.
+            min_gap_minutes (int): The minimum number of minutes between two duties of a proctor.
+        """
+        self.one_duty_per_day_classes = set(one_duty_per_day_classes)
+        self.min_gap_minutes = min_gap_minutes
+
+    def set_timetable(self) -> None:
+        """
+        Parse the blocks into the integer time model and set the conflicting blocks of each proctor.
+
+        Without time rules there is no timetable, and duties in the same block are ruled out by
+        the constraints of get_available_proctors alone.
+        """
+        if not self.one_duty_per_day_classes and not self.min_gap_minutes:
+            self.timetable = None
+            return
+        self.timetable = Timetable(list(self.blocks))
+        gap_conflicts = self.timetable.conflicts(False, self.min_gap_minutes)
+        day_conflicts = self.timetable.conflicts(True, self.min_gap_minutes)
+        self.proctor_conflicts = {
+            proctor: day_conflicts
+            if proctor.proctor_class in self.one_duty_per_day_classes
+            else gap_conflicts
+            for proctor in self.proctors
+        }
+        self.occupancy = {
+            proctor: [0] * len(self.timetable.blocks) for proctor in self.proctors
+        }
+
+    def is_free(self, proctor: Proctor, exam: Exam) -> bool:
+        """
+        Check if the duties of a proctor leave them free for an exam, in O(1) with time rules.
+
+        Args:
+            proctor (Proctor): A Proctor object.
+            exam (Exam): An Exam object.
+
+        Returns:
+            bool: True if the proctor is free for the exam, False otherwise.
+        """
+        if self.timetable is None:
+            return all(duty.block != exam.block for duty in proctor.duties)
+        return self.occupancy[proctor][self.timetable.index[exam.block]] == 0
+
+    def assign(self, proctor: Proctor, exam: Exam) -> None:
+        """
+        Assign a proctor to an exam, updating the occupancy of the proctor if there are time rules.
+
+        Args:
+            proctor (Proctor): A Proctor object.
+            exam (Exam): An Exam object.
+        """
+        proctor.duties.append(exam)
+        exam.proctors.append(proctor)
+        if self.timetable is not None:
+            occupancy = self.occupancy[proctor]
+            for block_index in self.proctor_conflicts[proctor][
+                self.timetable.index[exam.block]
+            ]:
+                occupancy[block_index] += 1
 
     def set_min_max_duties(self) -> None:
         """
@@ -64,10 +274,155 @@ class Planner:
             reverse=True,
         )
 
+        self.blocks = {}
         for exam in self.exams:
             if exam.block not in self.blocks:
                 self.blocks[exam.block] = []
             self.blocks[exam.block].append(exam)
+        self.set_timetable()
+
+    def set_preferred(self, assignment: Assignment, preference: float) -> None:
+        """
+        Bias the scheduling towards a previous assignment.
+
+        Args:
+            assignment (Assignment): The previous assignment.
+            preference (float): The probability of keeping each previous proctor when they are available.
+        """
+        self.preferred = assignment
+        self.preference = preference
+
+    def select_proctors(self, exam: Exam, select_from: list[Proctor]) -> list[Proctor]:
+        """
+        Randomly select the proctors of an exam, keeping preferred proctors with probability preference.
+
+        Args:
+            exam (Exam): An Exam object.
+            select_from (list[Proctor]): The proctors to select from.
+
+        Returns:
+            list[Proctor]: The selected proctors.
+        """
+        k = exam.number_of_proctors_needed
+        if not self.preferred:
+            return self.sample_proctors(select_from, k)
+        preferred_names = self.preferred.get(exam.key, [])
+        kept = [
+            proctor
+            for proctor in select_from
+            if proctor.name in preferred_names and self.rng.random() < self.preference
+        ][:k]
+        rest = [proctor for proctor in select_from if proctor not in kept]
+        return kept + self.sample_proctors(rest, k - len(kept))
+
+    def sample_proctors(self, proctors: list[Proctor], k: int) -> list[Proctor]:
+        """
+        Randomly sample proctors, uniformly or, if weighted, favouring proctors with fewer total duties.
+
+        A weighted sample draws a proctor with weight 1 / (total duties + 1), without
+        replacement, by keeping the k largest keys u ** (total duties + 1) of uniform u.
+
+        Args:
+            proctors (list[Proctor]): The proctors to sample from.
+            k (int): The number of proctors to sample.
+
+        Returns:
+            list[Proctor]: The sampled proctors.
+        """
+        if not self.weighted:
+            return self.rng.sample(proctors, k=k)
+        keys = [
+            self.rng.random()
+            ** (proctor.total_proctored_before + len(proctor.duties) + 1)
+            for proctor in proctors
+        ]
+        order = sorted(range(len(proctors)), key=keys.__getitem__, reverse=True)
+        return [proctors[i] for i in order[:k]]
+
+    @staticmethod
+    def is_eligible(exam: Exam, proctor: Proctor) -> bool:
+        """
+        Check if a proctor can ever proctor an exam, ignoring duties and weak constraints.
+
+        Args:
+            exam (Exam): An Exam object.
+            proctor (Proctor): A Proctor object.
+
+        Returns:
+            bool: True if the proctor is eligible for the exam, False otherwise.
+        """
+        if exam.block in proctor.unavailable:
+            return False
+        if len(exam.requires_specific_proctor) > 0:
+            return proctor in exam.requires_specific_proctor
+        if exam.requires_phd_proctor:
+            return proctor.proctor_class == 3
+        return True
+
+    def set_components(self) -> None:
+        """
+        Split the problem into the connected components of the block-proctor eligibility graph.
+
+        Blocks only interact through the proctors eligible for them, so each component is
+        scheduled independently by its own Planner, sharing the duty limits of this one.
+        Proctors eligible for no exam belong to no component.
+        """
+        parent: dict[str | int, str | int] = {}
+
+        def find(node: str | int) -> str | int:
+            while parent.setdefault(node, node) != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for exam in self.exams:
+            find(exam.block)
+            for i, proctor in enumerate(self.proctors):
+                if self.is_eligible(exam, proctor):
+                    parent[find(i)] = find(exam.block)
+
+        component_exams: dict[str | int, list[Exam]] = {}
+        for exam in self.exams:
+            component_exams.setdefault(find(exam.block), []).append(exam)
+        component_proctors: dict[str | int, list[Proctor]] = {
+            root: [] for root in component_exams
+        }
+        for i, proctor in enumerate(self.proctors):
+            if i in parent:
+                component_proctors[find(i)].append(proctor)
+
+        self.components = []
+        for root, exams in component_exams.items():
+            component = Planner(exams, component_proctors[root])
+            component.min_duties = self.min_duties
+            component.max_duties = self.max_duties
+            # Duty limits are relative to all proctors, not only those of the component
+            component.__dict__[
+                "max_total_proctored_before"
+            ] = self.max_total_proctored_before
+            component.set_preferred(self.preferred, self.preference)
+            component.set_time_rules(
+                list(self.one_duty_per_day_classes), self.min_gap_minutes
+            )
+            component.set_blocks()
+            self.components.append(component)
+        logging.info(f"Number of independent components: {len(self.components)}")
+
+    def component_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """
+        Create a process pool whose workers hold the components of the problem.
+
+        Args:
+            max_workers (int): The maximum number of worker processes.
+
+        Returns:
+            ProcessPoolExecutor: The process pool to pass to the schedule method.
+        """
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_component_worker,
+            initargs=(self.components,),
+        )
 
     def ordered_blocks_keys(self, most_needed_to_least: bool = True) -> list[str]:
         """
@@ -110,6 +465,9 @@ class Planner:
             list[Proctor]: A list of available Proctor objects.
         """
         available_proctors = []
+        block_index = (
+            None if self.timetable is None else self.timetable.index[exam.block]
+        )
         for proctor in self.proctors:
             if (
                 len(proctor.duties)
@@ -118,16 +476,15 @@ class Planner:
                 - proctor.total_proctored_before
             ):
                 continue
+            # skip exams conflicting with duties by the time rules, e.g. on the same day
+            if block_index is not None and self.occupancy[proctor][block_index] > 0:
+                continue
             constraints = (
                 (proctor.unavailable + proctor.not_preferred).copy()
                 if all_constraints
                 else proctor.unavailable.copy()
             )
             constraints.extend([duty.block for duty in proctor.duties])
-            # skip same day exams
-            # if proctor.proctor_class == 1:
-            #     if exam.date in [constraint[:10] for constraint in constraints]:
-            #         continue
             if exam.block not in constraints:
                 if len(exam.requires_specific_proctor) > 0:
                     if proctor in exam.requires_specific_proctor:
@@ -143,15 +500,85 @@ class Planner:
                     available_proctors.append(proctor)
         return available_proctors
 
-    def schedule(self, try_number: int = 1) -> int:
+    def spread_lower_bound(self, remaining_blocks: int, max_min_total: int) -> int:
+        """
+        Get a lower bound on the spread of total duties of any completion of the current schedule.
+
+        Duties are never removed, so the current maximum total stays a lower bound on the final
+        maximum. A proctor gets at most one duty per block and the minimum can not exceed the
+        mean, so the final minimum is at most the smaller of the current minimum plus the number
+        of remaining blocks and max_min_total.
+
+        Args:
+            remaining_blocks (int): The number of blocks left to schedule.
+            max_min_total (int): The floor of the mean of the final total duties.
+
+        Returns:
+            int: The lower bound on the difference of the maximum and minimum total duties.
+        """
+        total_duties = [
+            proctor.total_proctored_before + len(proctor.duties)
+            for proctor in self.proctors
+        ]
+        return max(total_duties) - min(
+            min(total_duties) + remaining_blocks, max_min_total
+        )
+
+    def schedule(
+        self,
+        try_number: int = 1,
+        executor: Executor | None = None,
+        incumbent: Fairness | None = None,
+        rng: random.Random | None = None,
+    ) -> int:
         """
         Schedule exams based on proctor availability.
 
+        If the problem has been split into more than one component, each component is
+        scheduled independently, in the worker processes of the executor if one is given.
+        Each component draws from its own generator, seeded by the generator of the
+        problem, so both ways give the same schedule.
+
+        If the fairness of the best schedule so far is given and it succeeded, the attempt is
+        aborted as soon as its spread of total duties can no longer beat the incumbent's, so
+        spread must be the first fairness metric. Ties on spread are never pruned since they
+        are broken by the next metrics.
+
         Args:
             try_number (int, optional): The number of the scheduling attempt. Defaults to 0.
+            executor (Executor | None, optional): A process pool created by component_executor. Defaults to None.
+            incumbent (Fairness | None, optional): The fairness of the best schedule so far. Defaults to None.
+            rng (random.Random | None, optional): The random number generator of the attempt, see simulation_rng. Defaults to the generator of the planner.
+
+        Returns:
+            int: SUCCEEDED, FAILED if there are not enough proctors, PRUNED if aborted by the incumbent.
         """
+        if rng is not None:
+            self.rng = rng
         self.reset_all()
-        for block in self.ordered_blocks_keys():
+        if len(self.components) > 1:
+            seeds = [self.rng.getrandbits(64) for _ in self.components]
+            if executor is not None:
+                return self.schedule_in_parallel(try_number, executor, seeds, incumbent)
+            # Failed components are scheduled too, as in parallel, so the schedule is the same
+            exit_code = SUCCEEDED
+            for component, seed in zip(self.components, seeds):
+                component_exit_code = component.schedule(
+                    try_number, incumbent=incumbent, rng=random.Random(seed)
+                )
+                if component_exit_code == PRUNED:
+                    return PRUNED
+                exit_code = max(exit_code, component_exit_code)
+            return exit_code
+        max_spread = None
+        if incumbent is not None and incumbent[0] == 0:
+            max_spread = incumbent[1]
+            max_min_total = (
+                sum(proctor.total_proctored_before for proctor in self.proctors)
+                + sum(exam.number_of_proctors_needed for exam in self.exams)
+            ) // len(self.proctors)
+        ordered_blocks_keys = self.ordered_blocks_keys()
+        for block_index, block in enumerate(ordered_blocks_keys):
             available_proctors_for_block = set()
             total_proctors_needed_for_block = 0
             for exam in self.blocks[block]:
@@ -159,10 +586,11 @@ class Planner:
                     available_proctors_for_block.add(proct)
                 total_proctors_needed_for_block += exam.number_of_proctors_needed
             if len(available_proctors_for_block) < total_proctors_needed_for_block:
-                logging.error(
+                # Failed tries are expected in the hot loop, so they are logged at debug, sampled
+                logging.debug(
                     f"Try {try_number} failed! Not enough proctors for block {block}.\nAvailable proctors: {', '.join([proct.name for proct in available_proctors_for_block])}\nTotal number of Proctors needed: {total_proctors_needed_for_block}"
                 )
-                return 1
+                return FAILED
             for exam in self.blocks[block]:
                 available_proctors = self.get_available_proctors(
                     exam, all_constraints=True
@@ -180,19 +608,62 @@ class Planner:
                     - proctor.total_proctored_before
                 ]
                 if len(available_proctors) < exam.number_of_proctors_needed:
-                    logging.error(
+                    logging.debug(
                         f"Try {try_number} failed! Not enough proctors for {exam.title} in block {exam.block} and classroom {exam.classroom}"
                     )
-                    return 1
+                    return FAILED
                 if len(min_not_reached) >= exam.number_of_proctors_needed:
                     # If there are enough proctors that have not reached the minimum number of duties, first fill with them
                     select_from = min_not_reached
                 else:
                     select_from = available_proctors
-                for proctor in random.sample(
-                    select_from, k=exam.number_of_proctors_needed
-                ):
-                    proctor.duties.append(exam)
-                    exam.proctors.append(proctor)
+                for proctor in self.select_proctors(exam, select_from):
+                    self.assign(proctor, exam)
+            if (
+                max_spread is not None
+                and self.spread_lower_bound(
+                    len(ordered_blocks_keys) - block_index - 1, max_min_total
+                )
+                > max_spread
+            ):
+                return PRUNED
         # logging.info(f"Try {try_number} succeeded!")
-        return 0
+        return SUCCEEDED
+
+    def schedule_in_parallel(
+        self,
+        try_number: int,
+        executor: Executor,
+        seeds: list[int],
+        incumbent: Fairness | None = None,
+    ) -> int:
+        """
+        Schedule the components of the problem in the worker processes of an executor.
+
+        Args:
+            try_number (int): The number of the scheduling attempt.
+            executor (Executor): A process pool created by component_executor.
+            seeds (list[int]): The seed of the random number generator of each component.
+            incumbent (Fairness | None, optional): The fairness of the best schedule so far. Defaults to None.
+
+        Returns:
+            int: The exit code, SUCCEEDED if all components succeeded.
+        """
+        futures = [
+            executor.submit(
+                _schedule_component,
+                index,
+                try_number,
+                seed,
+                incumbent,
+            )
+            for index, seed in enumerate(seeds)
+        ]
+        exit_code = SUCCEEDED
+        for component, future in zip(self.components, futures):
+            component_exit_code, assignments = future.result()
+            exit_code = max(exit_code, component_exit_code)
+            for exam, proctor_indices in zip(component.exams, assignments):
+                for index in proctor_indices:
+                    component.assign(component.proctors[index], exam)
+        return exit_code
@@ -0,0 +1,258 @@
+"""Module for the portfolio solver, racing scheduling strategies within a time budget.
+
+Each strategy runs in its own process until the time budget expires, and the best
+schedule of all strategies wins. The strategies are:
+
+- uniform: Planner.schedule, drawing proctors uniformly at random.
+- weighted: Planner.schedule, drawing proctors with fewer total duties more often.
+- repair: Planner.schedule biased towards the best schedule of the strategy so far,
+  a local search around it.
+- compiled: the NumPy kernel of the compiled module.
+
+The fairness of the best schedule of all strategies is shared through shared memory,
+and the strategies scheduling with the planner abort attempts that can not beat it.
+"""
+
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import Array
+from multiprocessing.sharedctypes import SynchronizedArray
+from typing import Any
+
+import numpy as np
+
+from scheduler.assignment import Assignment, get_assignment
+from scheduler.compiled import CompiledProblem
+from scheduler.metrics import Fairness, make_metrics
+from scheduler.planner import (
+    PRUNED,
+    Planner,
+    simulation_generator,
+    simulation_rng,
+)
+from scheduler.simulator import Simulator
+
+STRATEGIES = ("uniform", "weighted", "repair", "compiled")
+
+# Probability of keeping each proctor of the best schedule in the repair strategy
+REPAIR_PREFERENCE = 0.8
+
+# Fairness of the best schedule of all strategies, shared by each worker process
+_worker_incumbent: Any = None
+
+
+class StrategyResult:
+    def __init__(
+        self,
+        strategy: str,
+        attempts: int,
+        failed: int,
+        pruned: int,
+        fairness: Fairness | None,
+        assignment: Assignment | None,
+    ) -> None:
+        """
+        Initialize the StrategyResult class, the outcome of a strategy of the portfolio.
+
+        Args:
+            strategy (str): The name of the strategy.
+            attempts (int): The number of scheduling attempts.
+            failed (int): The number of attempts without enough proctors.
+            pruned (int): The number of attempts aborted by the shared incumbent.
+            fairness (Fairness | None): The fairness of the best feasible schedule of the strategy, None if it found none.
+            assignment (Assignment | None): The best feasible schedule of the strategy, None if it found none.
+        """
+        self.strategy = strategy
+        self.attempts = attempts
+        self.failed = failed
+        self.pruned = pruned
+        self.fairness = fairness
+        self.assignment = assignment
+
+
+def _init_portfolio_worker(incumbent: SynchronizedArray) -> None:
+    """
+    Store the shared incumbent in a worker process.
+
+    Args:
+        incumbent (SynchronizedArray): The fairness of the best schedule of all strategies, inf while there is none.
+    """
+    global _worker_incumbent
+    _worker_incumbent = incumbent
+
+
+def read_incumbent(incumbent: SynchronizedArray) -> Fairness | None:
+    """
+    Read the shared incumbent.
+
+    Args:
+        incumbent (SynchronizedArray): The shared fairness of the best schedule.
+
+    Returns:
+        Fairness | None: The fairness of the best schedule of all strategies, None if there is none.
+    """
+    with incumbent.get_lock():
+        values = tuple(incumbent)
+    return None if np.isinf(values[0]) else values
+
+
+def offer_incumbent(incumbent: SynchronizedArray, fairness: Fairness) -> None:
+    """
+    Replace the shared incumbent if a fairness is better, ignoring the simulation number.
+
+    Args:
+        incumbent (SynchronizedArray): The shared fairness of the best schedule.
+        fairness (Fairness): The fairness of a schedule.
+    """
+    with incumbent.get_lock():
+        if tuple(fairness[:-1]) < tuple(incumbent[:-1]):
+            incumbent[:] = [float(value) for value in fairness]
+
+
+def run_strategy(
+    planner: Planner,
+    strategy: str,
+    metric_names: list[str],
+    seconds: float,
+    seed: int,
+    incumbent: SynchronizedArray | None = None,
+) -> StrategyResult:
+    """
+    Run a strategy on a planner until the time budget expires.
+
+    Args:
+        planner (Planner): The Planner holding the prepared problem, scheduled in place.
+        strategy (str): The name of the strategy, one of STRATEGIES.
+        metric_names (list[str]): The names of the fairness metrics, in ranking order.
+        seconds (float): The time budget in seconds.
+        seed (int): The seed of the random number generator.
+        incumbent (SynchronizedArray | None, optional): The shared fairness of the best schedule, None to race alone. Defaults to None.
+
+    Raises:
+        ValueError: If the strategy is not one of STRATEGIES.
+
+    Returns:
+        StrategyResult: The outcome of the strategy.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Strategy {strategy!r} is not one of {', '.join(STRATEGIES)}."
+        )
+    deadline = time.perf_counter() + seconds
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    planner.weighted = strategy == "weighted"
+    simulator = Simulator(planner, 0, metrics=make_metrics(metric_names))
+    if strategy == "compiled":
+        compiled = CompiledProblem.compile(planner)
+        exams = CompiledProblem.exam_order(planner)
+        assignment = np.empty((len(exams), compiled.max_needed), dtype=np.int32)
+    best: Fairness | None = None
+    best_assignment: Assignment | None = None
+    attempts = failed = pruned = 0
+    while time.perf_counter() < deadline:
+        attempts += 1
+        shared = None if incumbent is None else read_incumbent(incumbent)
+        if strategy == "compiled":
+            exit_code = compiled.schedule(
+                simulation_generator(seed, attempts), assignment
+            )
+            CompiledProblem.replay(planner, exams, assignment)
+        else:
+            if strategy == "repair" and best_assignment is not None:
+                planner.set_preferred(best_assignment, REPAIR_PREFERENCE)
+            exit_code = planner.schedule(
+                attempts,
+                incumbent=shared if simulator.prune else None,
+                rng=simulation_rng(seed, attempts),
+            )
+        if exit_code == PRUNED:
+            pruned += 1
+            continue
+        fairness = simulator.measure_fairness_of(
+            [attempts], [exit_code], [planner.proctors]
+        )[0]
+        if fairness[0] != 0:
+            # A failed attempt leaves exams without proctors, it is never kept
+            failed += 1
+            continue
+        if best is None or fairness < best:
+            best = fairness
+            best_assignment = get_assignment(planner.exams)
+            if incumbent is not None:
+                offer_incumbent(incumbent, fairness)
+    return StrategyResult(strategy, attempts, failed, pruned, best, best_assignment)
+
+
+def _run_strategy_in_worker(
+    planner: Planner,
+    strategy: str,
+    metric_names: list[str],
+    seconds: float,
+    seed: int,
+) -> StrategyResult:
+    """
+    Run a strategy in a worker process, sharing its incumbent, see run_strategy.
+    """
+    return run_strategy(
+        planner, strategy, metric_names, seconds, seed, _worker_incumbent
+    )
+
+
+def run_portfolio(
+    planner: Planner,
+    metric_names: list[str],
+    seconds: float,
+    strategies: list[str] | None = None,
+    seed: int = 0,
+) -> list[StrategyResult]:
+    """
+    Race strategies in parallel processes and rank their best schedules.
+
+    Args:
+        planner (Planner): The Planner holding the prepared problem, left unchanged.
+        metric_names (list[str]): The names of the fairness metrics, in ranking order.
+        seconds (float): The time budget in seconds.
+        strategies (list[str] | None, optional): The names of the strategies. Defaults to STRATEGIES.
+        seed (int, optional): The seed of the first strategy, the next ones use the following seeds. Defaults to 0.
+
+    Raises:
+        ValueError: If there is no strategy or a strategy is not one of STRATEGIES.
+
+    Returns:
+        list[StrategyResult]: The outcome of each strategy, the one with the best schedule first.
+    """
+    strategies = list(STRATEGIES) if strategies is None else strategies
+    if not strategies:
+        raise ValueError(
+            f"The portfolio needs at least one strategy, among {', '.join(STRATEGIES)}."
+        )
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Strategy {strategy!r} is not one of {', '.join(STRATEGIES)}."
+            )
+    # Failure, metric values and simulation number, inf while there is no schedule
+    incumbent = Array("d", [np.inf] * (len(metric_names) + 2))
+    with ProcessPoolExecutor(
+        max_workers=len(strategies),
+        initializer=_init_portfolio_worker,
+        initargs=(incumbent,),
+    ) as executor:
+        futures: list[Future[StrategyResult]] = [
+            executor.submit(
+                _run_strategy_in_worker,
+                planner,
+                strategy,
+                metric_names,
+                seconds,
+                seed + index,
+            )
+            for index, strategy in enumerate(strategies)
+        ]
+        results = [future.result() for future in futures]
+    # Strategies without a schedule come last, ties go to the earlier strategy
+    return sorted(
+        results,
+        key=lambda result: (result.fairness is None, (result.fairness or ())[:-1]),
+    )
@@ -1,60 +1,161 @@
 import logging
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
 
+import openpyxl
 import pandas as pd
 
 from scheduler.config import YAMLConfig
 from scheduler.exam_proctor import Exam, Proctor
 from scheduler.path import INPUTS_DIR
+from scheduler.planner import Planner
+from scheduler.profiling import RunProfiler
+
+
+def read_excel_chunks(file: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read the first sheet of an Excel file in chunks of rows, without loading the whole workbook.
+
+    Args:
+        file (Path): The path of the Excel file.
+        chunk_size (int): The maximum number of rows of each chunk.
+
+    Yields:
+        Iterator[pd.DataFrame]: The chunks, with the columns of the header row.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        chunk = []
+        for row in rows:
+            # Read-only worksheets may report empty rows that pandas would drop
+            if all(value is None for value in row):
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+# Readers of the supported input file formats, keyed by file suffix
+TABLE_READERS: dict[str, Callable[[Path], pd.DataFrame]] = {
+    ".xlsx": pd.read_excel,
+    ".csv": pd.read_csv,
+    ".parquet": pd.read_parquet,
+    ".json": pd.read_json,
+}
+
+
+def read_table(file: Path) -> pd.DataFrame:
+    """Read an input file, dispatching on its format.
+
+    Parquet files need pyarrow or fastparquet to be installed.
+
+    Args:
+        file (Path): The path of the .xlsx, .csv, .parquet or .json file.
+
+    Raises:
+        ValueError: If the file format is not supported.
+
+    Returns:
+        pd.DataFrame: The table in the file.
+    """
+    if file.suffix not in TABLE_READERS:
+        raise ValueError(
+            f"{file.name!r} should be a {', '.join(TABLE_READERS)} file, it is not"
+        )
+    return TABLE_READERS[file.suffix](file)
+
+
+def read_table_chunks(file: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read an input file in chunks of rows, dispatching on its format.
+
+    Excel and CSV files are streamed, Parquet and JSON files are read whole and sliced.
+
+    Args:
+        file (Path): The path of the .xlsx, .csv, .parquet or .json file.
+        chunk_size (int): The maximum number of rows of each chunk.
+
+    Yields:
+        Iterator[pd.DataFrame]: The chunks, with the columns of the file.
+    """
+    if file.suffix == ".xlsx":
+        yield from read_excel_chunks(file, chunk_size)
+    elif file.suffix == ".csv":
+        with pd.read_csv(file, chunksize=chunk_size) as reader:
+            yield from reader
+    else:
+        table = read_table(file)
+        for start in range(0, len(table), chunk_size):
+            yield table.iloc[start : start + chunk_size].copy()
 
 
 class Parser:
-    def __init__(self, config: YAMLConfig) -> None:
+    def __init__(self, config: YAMLConfig, chunk_size: int = 0) -> None:
         """
         Initialize the Parser class.
 
         Args:
             config (YAMLConfig): The YAML configuration object.
+            chunk_size (int, optional): Stream the input files in chunks of this many rows, 0 reads them whole. Defaults to 0.
         """
         self.config = config
+        self.chunk_size = chunk_size
         self.exams_df: None | pd.DataFrame = None
         self.proctors_df: None | pd.DataFrame = None
+        # Forward fill values and last exam title carried over from the previous chunk
+        self.fill_values: None | pd.Series = None
+        self.last_exam = ""
+        self.exams: list[Exam] = []
 
     def read_excels(self) -> None:
         """
-        Read the input Excel files and store the dataframes.
+        Read the input files, Excel, CSV, Parquet or JSON, and store the dataframes.
         """
-        self.exams_df = pd.read_excel(INPUTS_DIR / self.config.exams_file)
-        self.proctors_df = pd.read_excel(INPUTS_DIR / self.config.proctors_file)
-        logging.info("Successfully read input Excel files.")
+        self.exams_df = read_table(INPUTS_DIR / self.config.exams_file)
+        self.proctors_df = read_table(INPUTS_DIR / self.config.proctors_file)
+        logging.info("Successfully read input files.")
 
     def clean_exams_df(self) -> None:
         """
         Clean the exams dataframe.
         """
-        if self.exams_df is None or self.proctors_df is None:
-            raise ValueError("Dataframes are not initialized.")
+        if self.exams_df is None:
+            raise ValueError("Exams dataframe is not initialized.")
 
         # Replace blank spaces in column names with underscores
         self.exams_df.columns = self.exams_df.columns.str.replace(" ", "_")
 
+        # Convert Exam_Date column to string, before filling so that filled dates of a
+        # chunk and of the previous chunk are formatted the same way
+        exam_dates = self.exams_df["Exam_Date"]
+        self.exams_df["Exam_Date"] = exam_dates.astype(str).where(exam_dates.notna())
+
         # Get columns to be filled, which are the first 5 columns
         df_fill_nan_columns = self.exams_df.columns[:5]
 
-        # Fill missing values using forward fill method
+        # Fill missing values using forward fill method, continuing from the previous chunk
         for col in df_fill_nan_columns:
-            self.exams_df[col] = self.exams_df[col].fillna(method="ffill")
+            self.exams_df[col] = self.exams_df[col].ffill()
+            if self.fill_values is not None:
+                self.exams_df[col] = self.exams_df[col].fillna(self.fill_values[col])
+        self.fill_values = self.exams_df[df_fill_nan_columns].iloc[-1]
 
         self.exams_df.loc[self.exams_df["Classrooms"].isna()]
 
-        # Convert Exam_Date column to string
-        self.exams_df["Exam_Date"] = self.exams_df["Exam_Date"].astype(str)
-
     def clean_proctors_df(self) -> None:
         """
         Clean the proctors dataframe.
         """
-        if self.exams_df is None or self.proctors_df is None:
-            raise ValueError("Dataframes are not initialized.")
+        if self.proctors_df is None:
+            raise ValueError("Proctors dataframe is not initialized.")
 
         # Replace blank spaces in column names with underscores
         self.proctors_df.columns = self.proctors_df.columns.str.replace(" ", "_")
@@ -77,8 +178,8 @@ class Parser:
         if self.exams_df is None:
             raise ValueError("Exams dataframe is not initialized.")
 
-        exams = []
-        last_exam = ""
+        exams: list[Exam] = []
+        last_exam = self.last_exam
 
         for row in self.exams_df.itertuples():
             try:
@@ -100,7 +201,7 @@ class Parser:
                     # Find all exams with the same title, date, and time
                     find_all_exams = [
                         exam
-                        for exam in exams
+                        for exam in self.exams + exams
                         if exam.title == row.Exam_Title
                         and exam.date == row.Exam_Date
                         and exam.time == row.Reserved_Slots
@@ -111,6 +212,7 @@ class Parser:
                 else:
                     raise e
 
+        self.last_exam = last_exam
         return exams
 
     def parse_proctors(self) -> list[Proctor]:
@@ -144,6 +246,8 @@ class Parser:
         Returns:
             tuple[list[Exam], list[Proctor]]: A tuple of Exam and Proctor objects.
         """
+        if self.chunk_size:
+            return self.parse_chunks()
         self.read_excels()
         self.clean_exams_df()
         self.clean_proctors_df()
@@ -151,10 +255,39 @@ class Parser:
         proctors = self.parse_proctors()
         return exams, proctors
 
+    def parse_chunks(self) -> tuple[list[Exam], list[Proctor]]:
+        """
+        Parse data chunk by chunk, streaming the input files, and return a tuple of Exam and Proctor objects.
+
+        Only one chunk of each Excel or CSV file is held in memory at a time.
+
+        Returns:
+            tuple[list[Exam], list[Proctor]]: A tuple of Exam and Proctor objects.
+        """
+        self.exams = []
+        for self.exams_df in read_table_chunks(
+            INPUTS_DIR / self.config.exams_file, self.chunk_size
+        ):
+            self.clean_exams_df()
+            self.exams.extend(self.parse_exams())
+        proctors = []
+        for self.proctors_df in read_table_chunks(
+            INPUTS_DIR / self.config.proctors_file, self.chunk_size
+        ):
+            self.clean_proctors_df()
+            proctors.extend(self.parse_proctors())
+        self.exams_df = self.proctors_df = None
+        logging.info("Successfully streamed input files.")
+        return self.exams, proctors
+
 
 class Prepper:
     def __init__(
-        self, exams: list[Exam], proctors: list[Proctor], config: YAMLConfig
+        self,
+        exams: list[Exam],
+        proctors: list[Proctor],
+        config: YAMLConfig,
+        chunk_size: int = 0,
     ) -> None:
         """
         Initialize the Prepper class.
@@ -162,10 +295,27 @@ class Prepper:
         Args:
             exams (list[Exam]): A list of Exam objects.
             proctors (list[Proctor]): A list of Proctor objects.
+            config (YAMLConfig): The validated config.
+            chunk_size (int, optional): Stream the input files in chunks of this many rows, 0 reads them whole. Defaults to 0.
         """
         self.exams = exams
         self.proctors = proctors
         self.config = config
+        self.chunk_size = chunk_size
+
+    def read_input(self, file_name: str) -> Iterator[pd.DataFrame]:
+        """
+        Read an input file, in chunks of rows if streaming.
+
+        Args:
+            file_name (str): The name of the file in the inputs directory.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the file, or the whole file at once.
+        """
+        if self.chunk_size:
+            return read_table_chunks(INPUTS_DIR / file_name, self.chunk_size)
+        return iter([read_table(INPUTS_DIR / file_name)])
 
     def auto_add_constraints(self) -> None:
         """
@@ -198,31 +348,37 @@ class Prepper:
 
     def manually_add_constraints(self) -> None:
         """
-        Manually add constraints to proctors using input Excel file.
+        Manually add constraints to proctors using input file.
         """
-        df = pd.read_excel(INPUTS_DIR / self.config.proctors_file)
         all_blocks = sorted(list({exam.block for exam in self.exams}))
 
-        for block in all_blocks:
-            for row in df[["Name", block]].itertuples():
-                for proct in self.proctors:
-                    if proct.name == row.Name:
-                        proctor = proct
-                        break
-                else:
-                    raise ValueError(
-                        f"Proctor {row.Name} not found, check proctors file for a typo."
-                    )
-                if row[2] == 1:
-                    proctor.unavailable.append(block)
-                elif row[2] == 2:
-                    proctor.not_preferred.append(block)
+        for df in self.read_input(self.config.proctors_file):
+            for block in all_blocks:
+                for row in df[["Name", block]].itertuples():
+                    for proct in self.proctors:
+                        if proct.name == row.Name:
+                            proctor = proct
+                            break
+                    else:
+                        raise ValueError(
+                            f"Proctor {row.Name} not found, check proctors file for a typo."
+                        )
+                    if row[2] == 1:
+                        proctor.unavailable.append(block)
+                    elif row[2] == 2:
+                        proctor.not_preferred.append(block)
 
-    def manually_add_proctor_numbers(self) -> None:
+    def manually_add_proctor_numbers(self, df: pd.DataFrame | None = None) -> None:
         """
-        Manually add proctor numbers to exams using input Excel file.
+        Manually add proctor numbers to exams using input file.
+
+        Args:
+            df (pd.DataFrame | None, optional): Rows of the input file, None to read the whole file. Defaults to None.
         """
-        df = pd.read_excel(INPUTS_DIR / self.config.exams_file_for_proctor_numbers)
+        if df is None:
+            for chunk in self.read_input(self.config.exams_file_for_proctor_numbers):
+                self.manually_add_proctor_numbers(chunk)
+            return
         for row in df.itertuples():
             for exa in self.exams:
                 if exa.title == row.Exam_Title and exa.classroom == row.Classroom:
@@ -234,20 +390,25 @@ class Prepper:
                 )
             exam.number_of_proctors_needed = row.Number_of_Proctors_Needed
 
-    def manually_add_specific_proctors(self) -> None:
+    def manually_add_specific_proctors(self, df: pd.DataFrame | None = None) -> None:
         """
-        Manually add specific proctors to exams using input Excel file.
+        Manually add specific proctors to exams using input file.
+
+        Args:
+            df (pd.DataFrame | None, optional): Rows of the input file, None to read the whole file. Defaults to None.
 
         Returns:
             None
         """
-        df = pd.read_excel(INPUTS_DIR / self.config.exams_file_for_proctor_numbers)
-        df["Requires_Specific_Proctor"] = df["Requires_Specific_Proctor"].astype(str)
+        if df is None:
+            for chunk in self.read_input(self.config.exams_file_for_proctor_numbers):
+                self.manually_add_specific_proctors(chunk)
+            return
         for row in df.itertuples():
-            if row.Requires_Specific_Proctor != "nan":
-                row_proctors = row.Requires_Specific_Proctor.split(", ")
-            else:
+            # Checked before any str conversion, which keeps missing values missing since pandas 3
+            if pd.isna(row.Requires_Specific_Proctor):
                 continue
+            row_proctors = str(row.Requires_Specific_Proctor).split(", ")
             for exa in self.exams:
                 if exa.title == row.Exam_Title and exa.classroom == row.Classroom:
                     exam = exa
@@ -293,8 +454,10 @@ class Prepper:
             self.auto_add_proctor_numbers()
         else:
             self.manually_add_constraints()
-            self.manually_add_proctor_numbers()
-            self.manually_add_specific_proctors()
+            # Both use the same file, so it is read once, chunk by chunk
+            for df in self.read_input(self.config.exams_file_for_proctor_numbers):
+                self.manually_add_proctor_numbers(df)
+                self.manually_add_specific_proctors(df)
 
     def produce_output_excels(self) -> None:
         """
@@ -354,3 +517,37 @@ class Prepper:
         # Write dataframes to excel
         df_exams.to_excel(INPUTS_DIR / "Exams.xlsx", index=False)
         df_proctors.to_excel(INPUTS_DIR / "Proctors.xlsx", index=False)
+
+
+def build_planner(
+    config: YAMLConfig,
+    chunk_size: int = 0,
+    profiler: RunProfiler | None = None,
+    timings: dict[str, float] | None = None,
+) -> Planner:
+    """Parse and prepare the input files of a config and build a Planner.
+
+    Args:
+        config (YAMLConfig): The config naming the input files and the time rules.
+        chunk_size (int, optional): Stream the input files in chunks of this many rows, 0 reads them whole. Defaults to 0.
+        profiler (RunProfiler | None, optional): Profile the parse and prepare phases. Defaults to None.
+        timings (dict[str, float] | None, optional): Receives the seconds of the parse and prepare phases. Defaults to None.
+
+    Returns:
+        Planner: The Planner holding the prepared problem.
+    """
+    if profiler is None:
+        profiler = RunProfiler(enabled=False)
+    start = time.perf_counter()
+    with profiler.phase("parse"):
+        exams, proctors = Parser(config, chunk_size).parse()
+    parsed = time.perf_counter()
+    with profiler.phase("prepare"):
+        prepper = Prepper(exams, proctors, config, chunk_size)
+        prepper.prepare(auto_add=False)
+    planner = Planner(prepper.exams, prepper.proctors)
+    planner.set_time_rules(config.one_duty_per_day_classes, config.min_gap_minutes)
+    if timings is not None:
+        timings["parse"] = parsed - start
+        timings["prepare"] = time.perf_counter() - parsed
+    return planner
@@ -0,0 +1,123 @@
+"""Module for profiling the phases of a run.
+
+Each phase is profiled with cProfile and tracemalloc. The CPU profile of a phase is
+written to logs/<name>_<phase>.prof, readable by pstats, snakeviz or gprof2dot, and the
+largest allocations at the end of the phase to logs/<name>_<phase>_memory.txt. The
+profiles of all phases are also combined in logs/<name>.prof. Only the main process is
+profiled, not worker processes.
+"""
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from scheduler.path import LOGS_DIR
+
+# Number of allocation sites written for each phase
+TOP_ALLOCATIONS = 25
+
+
+class RunProfiler:
+    def __init__(
+        self, name: str = "profile", directory: Path = LOGS_DIR, enabled: bool = True
+    ) -> None:
+        """
+        Initialize the RunProfiler class.
+
+        Args:
+            name (str, optional): The prefix of the profile files. Defaults to "profile".
+            directory (Path, optional): The directory of the profile files. Defaults to LOGS_DIR.
+            enabled (bool, optional): Whether to profile, phases are no-ops otherwise. Defaults to True.
+        """
+        self.name = name
+        self.directory = directory
+        self.enabled = enabled
+        self.phases: dict[str, tuple[float, int]] = {}
+        self.profiles: list[Path] = []
+
+    @contextmanager
+    def phase(self, phase: str) -> Generator[None, None, None]:
+        """
+        Profile the CPU time and memory of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+
+        Yields:
+            None: Control to the phase.
+        """
+        if not self.enabled:
+            yield
+            return
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            self.phases[phase] = (seconds, peak)
+            profile_file = self.directory / f"{self.name}_{phase}.prof"
+            profile.dump_stats(profile_file)
+            self.profiles.append(profile_file)
+            self.write_memory(phase, snapshot, peak)
+
+    def write_memory(
+        self, phase: str, snapshot: tracemalloc.Snapshot, peak: int
+    ) -> None:
+        """
+        Write the peak memory and largest allocation sites of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+            snapshot (tracemalloc.Snapshot): The memory snapshot at the end of the phase.
+            peak (int): The peak traced memory of the phase in bytes.
+        """
+        lines = [f"Peak traced memory of {phase}: {peak / 2**20:.2f} MiB", ""]
+        lines += [
+            str(statistic)
+            for statistic in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        ]
+        (self.directory / f"{self.name}_{phase}_memory.txt").write_text(
+            "\n".join(lines) + "\n"
+        )
+
+    def hot_spots(self, top: int = 10) -> list[tuple[str, str, float, float]]:
+        """
+        Combine the profiles of all phases and get the functions with the most own time.
+
+        The combined profile is written to logs/<name>.prof.
+
+        Args:
+            top (int, optional): The number of functions. Defaults to 10.
+
+        Returns:
+            list[tuple[str, str, float, float]]: The location, number of calls, own time and cumulative time of each function.
+        """
+        if not self.profiles:
+            return []
+        stats = pstats.Stats(*map(str, self.profiles))
+        stats.dump_stats(self.directory / f"{self.name}.prof")
+        rows = [
+            (
+                f"{Path(profile.file_name).name}:{profile.line_number}({function})",
+                profile.ncalls,
+                profile.tottime,
+                profile.cumtime,
+            )
+            for function, profile in stats.get_stats_profile().func_profiles.items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
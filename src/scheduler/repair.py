@@ -0,0 +1,207 @@
+"""Module for repairing a published schedule after a late change.
+
+A change is given as a delta string, one of:
+
+- ``unavailable:<proctor name>|<block>``: the proctor can no longer proctor in the block.
+- ``remove:<exam title>|<classroom>``: the exam is cancelled.
+- ``add:<exam title>|<classroom>|<date>|<time>|<instructor>|<number of proctors>``: a new exam.
+- ``move:<exam title>|<classroom>|<date>|<time>``: the exam takes place at another time.
+- ``proctors:<exam title>|<classroom>|<number of proctors>``: the exam needs another number of proctors.
+- ``room:<classroom>|<number of proctors>``: every exam in the classroom needs another number of proctors.
+"""
+
+import logging
+
+from scheduler.assignment import Assignment, get_assignment
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.planner import Planner
+
+
+class Repairer:
+    def __init__(self, planner: Planner, assignment: Assignment) -> None:
+        """
+        Initialize the Repairer class.
+
+        Args:
+            planner (Planner): A Planner holding the prepared problem.
+            assignment (Assignment): The previously published assignment.
+        """
+        self.planner = planner
+        self.assignment = assignment
+        self.proctors_by_name = {proctor.name: proctor for proctor in planner.proctors}
+        self.affected: list[Exam] = []
+        self.changes: list[str] = []
+
+    def find_exam(self, title: str, classroom: str) -> Exam:
+        """
+        Find an exam by title and classroom.
+
+        Args:
+            title (str): The title of the exam.
+            classroom (str): The classroom of the exam.
+
+        Raises:
+            ValueError: If the exam is not found.
+
+        Returns:
+            Exam: The exam.
+        """
+        for exam in self.planner.exams:
+            if exam.key == (title.strip(), classroom.strip()):
+                return exam
+        raise ValueError(f"Exam {title} in {classroom} not found, check for a typo.")
+
+    def find_proctor(self, name: str) -> Proctor:
+        """
+        Find a proctor by name.
+
+        Args:
+            name (str): The name of the proctor.
+
+        Raises:
+            ValueError: If the proctor is not found.
+
+        Returns:
+            Proctor: The proctor.
+        """
+        if name.strip() not in self.proctors_by_name:
+            raise ValueError(f"Proctor {name} not found, check for a typo.")
+        return self.proctors_by_name[name.strip()]
+
+    def apply_delta(self, delta: str) -> None:
+        """
+        Apply a change to the problem, see the module docstring for the delta format.
+
+        Args:
+            delta (str): The change to apply.
+
+        Raises:
+            ValueError: If the delta is not valid.
+        """
+        kind, _, arguments = delta.partition(":")
+        fields = arguments.split("|")
+        match kind, len(fields):
+            case "unavailable", 2:
+                self.find_proctor(fields[0]).unavailable.append(fields[1].strip())
+            case "remove", 2:
+                self.planner.exams.remove(self.find_exam(*fields))
+            case "add", 6:
+                exam = Exam(fields[0], fields[2], fields[3], fields[1], fields[4])
+                exam.number_of_proctors_needed = int(fields[5])
+                self.planner.exams.append(exam)
+                self.affected.append(exam)
+            case "move", 4:
+                exam = self.find_exam(fields[0], fields[1])
+                exam.date = fields[2].strip()
+                exam.time = fields[3].strip()
+                self.affected.append(exam)
+            case "proctors", 3:
+                self.find_exam(fields[0], fields[1]).number_of_proctors_needed = int(
+                    fields[2]
+                )
+            case "room", 2:
+                exams = [
+                    exam
+                    for exam in self.planner.exams
+                    if exam.classroom == fields[0].strip()
+                ]
+                if not exams:
+                    raise ValueError(f"No exam in {fields[0]} found, check for a typo.")
+                for exam in exams:
+                    exam.number_of_proctors_needed = int(fields[1])
+            case _:
+                raise ValueError(f"Delta {delta!r} is not valid.")
+        logging.info(f"Applied delta {delta!r}")
+
+    def keep_valid_proctors(self, exam: Exam) -> None:
+        """
+        Reassign the previous proctors of an exam that still satisfy the hard constraints.
+
+        Args:
+            exam (Exam): The exam to reassign.
+        """
+        for name in self.assignment.get(exam.key, []):
+            proctor = self.proctors_by_name.get(name)
+            if (
+                proctor is None
+                or len(exam.proctors) == exam.number_of_proctors_needed
+                or not self.planner.is_eligible(exam, proctor)
+                or not self.planner.is_free(proctor, exam)
+            ):
+                self.changes.append(
+                    f"Removed {name} from {exam.title} in {exam.classroom}"
+                )
+                continue
+            self.planner.assign(proctor, exam)
+
+    def fill(self, exam: Exam) -> bool:
+        """
+        Assign the missing proctors of an exam, preferring proctors with the fewest total duties.
+
+        Args:
+            exam (Exam): The exam to fill.
+
+        Returns:
+            bool: True if the exam could be filled, False otherwise.
+        """
+        missing = exam.number_of_proctors_needed - len(exam.proctors)
+        available_proctors = self.planner.get_available_proctors(
+            exam, all_constraints=True
+        )
+        if len(available_proctors) < missing:
+            available_proctors = self.planner.get_available_proctors(
+                exam, all_constraints=False
+            )
+        if len(available_proctors) < missing:
+            logging.error(
+                f"Repair failed! Not enough proctors for {exam.title} in block {exam.block} and classroom {exam.classroom}"
+            )
+            return False
+        available_proctors.sort(
+            key=lambda proctor: (
+                proctor.total_proctored_before + len(proctor.duties),
+                proctor.name,
+            )
+        )
+        for proctor in available_proctors[:missing]:
+            self.planner.assign(proctor, exam)
+            self.changes.append(
+                f"Assigned {proctor.name} to {exam.title} in {exam.classroom}"
+            )
+        return True
+
+    def repair(self) -> int:
+        """
+        Re-solve the exams affected by the applied deltas, keeping all other assignments.
+
+        Previous proctors are kept wherever they are still valid, unchanged exams taking
+        priority over added and moved ones. The remaining seats are then filled greedily.
+
+        Returns:
+            int: The exit code, 0 if every exam has enough proctors.
+        """
+        self.planner.set_min_max_duties()
+        self.planner.set_blocks()
+        self.planner.reset_all()
+
+        unchanged = [exam for exam in self.planner.exams if exam not in self.affected]
+        for exam in unchanged + self.affected:
+            self.keep_valid_proctors(exam)
+
+        exit_code = 0
+        for block in self.planner.ordered_blocks_keys():
+            for exam in self.planner.blocks[block]:
+                if len(exam.proctors) < exam.number_of_proctors_needed:
+                    if not self.fill(exam):
+                        exit_code = 1
+        logging.info(f"Repair made {len(self.changes)} changes")
+        return exit_code
+
+    def get_assignment(self) -> Assignment:
+        """
+        Get the repaired assignment.
+
+        Returns:
+            Assignment: The repaired assignment.
+        """
+        return get_assignment(self.planner.exams)
@@ -0,0 +1,310 @@
+"""Module for the scheduler service, a local HTTP server that keeps the problem warm.
+
+The input files are parsed and prepared once when the service starts. Requests are JSON
+objects posted to one of the endpoints below, and responses are JSON objects.
+
+- POST /solve: {"number_of_simulations": int, "seed": int | null}, run the simulations
+  and return the best schedule, which becomes the current schedule.
+- POST /resolve: {"deltas": [str], "schedule": schedule | null}, apply deltas as in the
+  repair command to the given or current schedule and return the repaired schedule.
+- POST /score: {"schedule": schedule}, return the fairness of a schedule and the
+  assignments that break the hard constraints.
+- GET /health: return the size of the problem.
+
+A schedule is a list of {"title": str, "classroom": str, "proctors": [str]} objects.
+"""
+
+import json
+import logging
+from copy import deepcopy
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any
+
+from scheduler.assignment import Assignment, get_assignment
+from scheduler.metrics import FairnessMetric
+from scheduler.planner import Planner
+from scheduler.repair import Repairer
+from scheduler.simulator import Simulator
+
+Schedule = list[dict[str, Any]]
+
+
+def to_schedule(assignment: Assignment) -> Schedule:
+    """Convert an assignment to its JSON form.
+
+    Args:
+        assignment (Assignment): The assignment.
+
+    Returns:
+        Schedule: The schedule, a list of exams with their proctors.
+    """
+    return [
+        {"title": title, "classroom": classroom, "proctors": names}
+        for (title, classroom), names in assignment.items()
+    ]
+
+
+def from_schedule(schedule: Schedule) -> Assignment:
+    """Convert a schedule in JSON form to an assignment.
+
+    Args:
+        schedule (Schedule): The schedule, a list of exams with their proctors.
+
+    Raises:
+        ValueError: If an exam misses its title, classroom or proctors.
+
+    Returns:
+        Assignment: The assignment.
+    """
+    try:
+        return {
+            (exam["title"], exam["classroom"]): list(exam["proctors"])
+            for exam in schedule
+        }
+    except (KeyError, TypeError) as e:
+        raise ValueError(
+            "A schedule should be a list of objects with title, classroom and proctors."
+        ) from e
+
+
+def request_field(request: dict[str, Any], name: str, kind: type, default: Any) -> Any:
+    """Get a field of a request, checking its JSON type.
+
+    Args:
+        request (dict[str, Any]): The request.
+        name (str): The name of the field.
+        kind (type): The type of the field, int, str or list.
+        default (Any): The value of a missing field.
+
+    Raises:
+        ValueError: If the field is set to a value of another type.
+
+    Returns:
+        Any: The value of the field, the default if it is missing.
+    """
+    if name not in request:
+        return default
+    value = request[name]
+    if value is None and default is None:
+        return value
+    # JSON booleans are ints in Python
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise ValueError(f"{name} should be of type {kind.__name__}.")
+    return value
+
+
+class SchedulerService:
+    def __init__(self, planner: Planner, metrics: list[FairnessMetric]) -> None:
+        """
+        Initialize the SchedulerService class with a prepared problem.
+
+        Args:
+            planner (Planner): The Planner holding the prepared problem, kept unscheduled.
+            metrics (list[FairnessMetric]): The fairness metrics in ranking order.
+        """
+        self.planner = planner
+        self.metrics = metrics
+        self.assignment: Assignment | None = None
+
+    def fairness(self, planner: Planner, exit_code: int) -> list[int | float]:
+        """
+        Measure the fairness of the current schedule of a planner.
+
+        Args:
+            planner (Planner): A planner of the problem, with a schedule.
+            exit_code (int): The exit code of the schedule.
+
+        Returns:
+            list[int | float]: The failure and the value of each metric.
+        """
+        simulator = Simulator(planner, 0, metrics=self.metrics)
+        return list(
+            simulator.measure_fairness_of([0], [exit_code], [planner.proctors])[0][:-1]
+        )
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run the simulations and keep the best schedule as the current schedule.
+
+        Args:
+            request (dict[str, Any]): The number_of_simulations, 100 by default, and the seed, none by default.
+
+        Raises:
+            ValueError: If the number of simulations is not a positive integer or the seed not an integer.
+
+        Returns:
+            dict[str, Any]: The best schedule and its fairness.
+        """
+        number_of_simulations = request_field(
+            request, "number_of_simulations", int, 100
+        )
+        seed = request_field(request, "seed", int, None)
+        if number_of_simulations < 1:
+            raise ValueError("number_of_simulations should be at least 1.")
+        planner = deepcopy(self.planner)
+        simulator = Simulator(
+            planner,
+            number_of_simulations,
+            metrics=self.metrics,
+            seed=seed,
+        )
+        simulator.simulate()
+        best = simulator.order_by_fairness()[0]
+        self.assignment = get_assignment(simulator.results[best][1])
+        return {
+            "schedule": to_schedule(self.assignment),
+            "fairness": list(simulator.fairness_results[best][:-1]),
+        }
+
+    def resolve(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Apply deltas to a schedule, repairing it with as few changes as possible.
+
+        Args:
+            request (dict[str, Any]): The deltas and the schedule, the current schedule by default.
+
+        Raises:
+            ValueError: If the deltas are not a list of strings, there is no schedule to repair or a delta is invalid.
+
+        Returns:
+            dict[str, Any]: The repaired schedule, its fairness, the changes and whether every exam has enough proctors.
+        """
+        deltas = request_field(request, "deltas", list, [])
+        if not all(isinstance(delta, str) for delta in deltas):
+            raise ValueError("deltas should be a list of strings.")
+        if request.get("schedule") is not None:
+            assignment = from_schedule(request["schedule"])
+        elif self.assignment is not None:
+            assignment = self.assignment
+        else:
+            raise ValueError("No schedule to repair, solve first or send a schedule.")
+        repairer = Repairer(deepcopy(self.planner), assignment)
+        for delta in deltas:
+            repairer.apply_delta(delta)
+        exit_code = repairer.repair()
+        return {
+            "schedule": to_schedule(repairer.get_assignment()),
+            "fairness": self.fairness(repairer.planner, exit_code),
+            "changes": repairer.changes,
+            "succeeded": exit_code == 0,
+        }
+
+    def score(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Score a schedule as it is, without repairing it.
+
+        Args:
+            request (dict[str, Any]): The schedule.
+
+        Raises:
+            ValueError: If there is no schedule.
+
+        Returns:
+            dict[str, Any]: The fairness of the schedule without the assignments that break the hard constraints, and these assignments.
+        """
+        if request.get("schedule") is None:
+            raise ValueError("No schedule to score.")
+        repairer = Repairer(deepcopy(self.planner), from_schedule(request["schedule"]))
+        planner = repairer.planner
+        planner.set_min_max_duties()
+        planner.set_blocks()
+        planner.reset_all()
+        for exam in planner.exams:
+            repairer.keep_valid_proctors(exam)
+        complete = all(
+            len(exam.proctors) == exam.number_of_proctors_needed
+            for exam in planner.exams
+        )
+        return {
+            "fairness": self.fairness(planner, 0 if complete else 1),
+            "violations": repairer.changes,
+            "complete": complete,
+        }
+
+    def health(self) -> dict[str, Any]:
+        """
+        Describe the problem of the service.
+
+        Returns:
+            dict[str, Any]: The number of exams and proctors and the names of the metrics.
+        """
+        return {
+            "exams": len(self.planner.exams),
+            "proctors": len(self.planner.proctors),
+            "metrics": [metric.name for metric in self.metrics],
+        }
+
+
+class SchedulerRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of the scheduler service, see the module docstring for the endpoints."""
+
+    server: "SchedulerServer"
+
+    def send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        """
+        Send a JSON response.
+
+        Args:
+            status (HTTPStatus): The status of the response.
+            body (dict[str, Any]): The body of the response.
+        """
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:
+        """Handle GET requests."""
+        if self.path == "/health":
+            self.send_json(HTTPStatus.OK, self.server.service.health())
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"No endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        """Handle POST requests."""
+        endpoints = {
+            "/solve": self.server.service.solve,
+            "/resolve": self.server.service.resolve,
+            "/score": self.server.service.score,
+        }
+        if self.path not in endpoints:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"No endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("The request should be a JSON object.")
+            response = endpoints[self.path](request)
+        except ValueError as e:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        except (KeyError, TypeError) as e:
+            # A malformed request the endpoint does not check, never a closed connection
+            logging.exception(f"Malformed request to {self.path}")
+            self.send_json(
+                HTTPStatus.BAD_REQUEST, {"error": f"Malformed request: {e!r}"}
+            )
+            return
+        self.send_json(HTTPStatus.OK, response)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests with the logging module instead of stderr."""
+        logging.info(f"{self.address_string()} {format % args}")
+
+
+class SchedulerServer(HTTPServer):
+    def __init__(self, service: SchedulerService, host: str, port: int) -> None:
+        """
+        Initialize the SchedulerServer class, handling one request at a time.
+
+        Args:
+            service (SchedulerService): The service answering the requests.
+            host (str): The host to listen on.
+            port (int): The port to listen on, 0 for any free port.
+        """
+        super().__init__((host, port), SchedulerRequestHandler)
+        self.service = service
@@ -1,108 +1,734 @@
+import hashlib
+import json
 import logging
+import pickle
+import random
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor
 from copy import deepcopy
+from itertools import chain
+from pathlib import Path
+from typing import Any
 
+import numpy as np
+
+from scheduler.assignment import Assignment
+from scheduler.compiled import CompiledProblem, run_compiled
+from scheduler.ensemble import Ensemble
 from scheduler.exam_proctor import Exam, Proctor
-from scheduler.planner import Planner
-from scheduler.utils import standard_deviation, timer_decorator
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.metrics import (
+    Fairness,
+    FairnessBatch,
+    FairnessMetric,
+    block_order,
+    make_metrics,
+)
+from scheduler.pareto import ParetoFront
+from scheduler.path import PICKLES_DIR
+from scheduler.planner import (
+    FAILED,
+    PRUNED,
+    Planner,
+    simulation_generator,
+    simulation_rng,
+)
+from scheduler.repair import Repairer
+from scheduler.utils import timer_decorator
+
+CHECKPOINT_FILE: Path = PICKLES_DIR / "checkpoint.pickle"
+
+# Number of stored simulations whose fairness is measured at once
+FAIRNESS_BATCH_SIZE = 256
+
+# Exit code, exams, proctors and blocks of a schedule
+Result = tuple[int, list[Exam], list[Proctor], dict[str, list[Exam]]]
+
+
+class SimulationResults(Mapping[int, Result]):
+    def __init__(self, materialize: Callable[[int, int], Result] | None = None) -> None:
+        """
+        Initialize the SimulationResults class, the results of the stored simulations.
+
+        Only the exit code of a simulation is stored. Its schedule is materialized, scheduled
+        again from the random number generator of the simulation, when it is first looked
+        up, and kept from then on.
+
+        Args:
+            materialize (Callable[[int, int], Result] | None, optional): Schedules a simulation again from its number and exit code. Defaults to None, only storing schedules given to add.
+        """
+        self.exit_codes: dict[int, int] = {}
+        self.materialized: dict[int, Result] = {}
+        self.materialize = materialize
+
+    def add(
+        self, sim_number: int, exit_code: int, result: Result | None = None
+    ) -> None:
+        """
+        Store a simulation.
+
+        Args:
+            sim_number (int): The simulation number.
+            exit_code (int): The exit code of the simulation.
+            result (Result | None, optional): The schedule of the simulation, None to materialize it when looked up. Defaults to None.
+        """
+        self.exit_codes[sim_number] = exit_code
+        if result is None:
+            self.materialized.pop(sim_number, None)
+        else:
+            self.materialized[sim_number] = result
+
+    def keep(self, sim_numbers: Iterable[int]) -> None:
+        """
+        Drop all simulations but the given ones.
+
+        Args:
+            sim_numbers (Iterable[int]): The numbers of the simulations to keep.
+        """
+        self.exit_codes = {
+            sim_number: self.exit_codes[sim_number] for sim_number in sim_numbers
+        }
+        self.materialized = {
+            sim_number: result
+            for sim_number, result in self.materialized.items()
+            if sim_number in self.exit_codes
+        }
+
+    def materialize_all(self) -> None:
+        """
+        Materialize the schedules of all stored simulations, so they no longer need the planner.
+        """
+        for sim_number in self.exit_codes:
+            self[sim_number]
+
+    def __getitem__(self, sim_number: int) -> Result:
+        """
+        Get the schedule of a simulation, materializing it if needed.
+
+        Args:
+            sim_number (int): The simulation number.
+
+        Raises:
+            KeyError: If the simulation is not stored, or can not be materialized.
+
+        Returns:
+            Result: The exit code, exams, proctors and blocks of the simulation.
+        """
+        if sim_number not in self.materialized:
+            exit_code = self.exit_codes[sim_number]
+            if self.materialize is None:
+                raise KeyError(
+                    f"Simulation {sim_number} can not be materialized without its planner."
+                )
+            self.materialized[sim_number] = self.materialize(sim_number, exit_code)
+        return self.materialized[sim_number]
+
+    def __contains__(self, sim_number: object) -> bool:
+        return sim_number in self.exit_codes
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.exit_codes)
+
+    def __len__(self) -> int:
+        return len(self.exit_codes)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The materialize callback is bound to a simulator, it is rebound after loading
+        return {**self.__dict__, "materialize": None}
 
 
 class Simulator:
-    def __init__(self, planner: Planner, number_of_simulations: int) -> None:
+    def __init__(
+        self,
+        planner: Planner,
+        number_of_simulations: int,
+        checkpoint_interval: int = 0,
+        keep_best: int = 10,
+        checkpoint_file: Path = CHECKPOINT_FILE,
+        workers: int = 1,
+        seed_assignment: Assignment | None = None,
+        seed_preference: float = 0.5,
+        patience: int = 0,
+        prune: bool = True,
+        metrics: list[FairnessMetric] | None = None,
+        compiled_workers: int = 0,
+        ensemble: Ensemble | None = None,
+        seed: int | None = None,
+    ) -> None:
         """
         Initialize the Simulator class.
 
         Args:
             planner (Planner): An instance of the Planner class.
             number_of_simulations (int): The number of simulations to run.
+            checkpoint_interval (int, optional): Save a checkpoint every this many simulations, 0 disables checkpointing. Defaults to 0.
+            keep_best (int, optional): The number of best simulations kept at each checkpoint. Defaults to 10.
+            checkpoint_file (Path, optional): The path of the checkpoint file. Defaults to CHECKPOINT_FILE.
+            workers (int, optional): The number of processes scheduling independent components in parallel. Defaults to 1.
+            seed_assignment (Assignment | None, optional): A previous assignment to warm-start from, evaluated as simulation 0. Defaults to None.
+            seed_preference (float, optional): The probability of keeping each proctor of the seed assignment when they are available. Defaults to 0.5.
+            patience (int, optional): Stop after this many simulations without improving the best schedule, 0 disables early stopping. Defaults to 0.
+            prune (bool, optional): Whether to abort simulations that can not beat the best schedule, which may drop members of the Pareto front. Only applies when spread is the first metric. Defaults to True.
+            metrics (list[FairnessMetric] | None, optional): The fairness metrics in ranking order. Defaults to the metrics of DEFAULT_METRICS.
+            compiled_workers (int, optional): Run the simulations on the compiled problem in this many processes sharing its memory, 0 schedules with the planner. Compiled runs neither checkpoint, stop early, prune nor prefer the seed schedule. Defaults to 0.
+            ensemble (Ensemble | None, optional): Record every stored simulation in this on-disk ensemble and keep only the best ones in memory. Defaults to None.
+            seed (int | None, optional): The base seed of the run, simulation i draws from simulation_rng(seed, i). Defaults to a seed drawn from the random module when simulating.
         """
         self.planner = planner
         self.number_of_simulations = number_of_simulations
-        self.results: dict[
-            int, tuple[int, list[Exam], list[Proctor], dict[str, list[Exam]]]
-        ] = {}
-        self.fairness_results: dict[int, tuple[int, int, float, float, int, int]] = {}
+        self.checkpoint_interval = checkpoint_interval
+        self.keep_best = keep_best
+        self.checkpoint_file = checkpoint_file
+        self.workers = workers
+        self.seed_assignment = seed_assignment
+        self.seed_preference = seed_preference
+        self.patience = patience
+        self.prune = prune and (metrics is None or metrics[0].name == "spread")
+        self.pareto_front = ParetoFront()
+        self.incumbent: Fairness | None = None
+        self.pruned: int = 0
+        self.failed: int = 0
+        self.completed: int = 0
+        self.resumed: int = 0
+        self.last_improvement: int = 0
+        # Simulation number, exit code and proctor and block index of each duty of the
+        # stored simulations whose fairness is not measured yet
+        self.pending: list[tuple[int, int, list[int], list[int]]] = []
+        self.compiled_workers = compiled_workers
+        self.ensemble = ensemble
+        self.seed = seed
+        self.compiled: CompiledProblem | None = None
+        self.compiled_exams: list[Exam] = []
+        self.metrics = make_metrics(DEFAULT_METRICS) if metrics is None else metrics
+        self.prepare_metrics()
+        self.results = SimulationResults(self.materialize)
+        self.fairness_results: dict[int, Fairness] = {}
+
+    def prepare_metrics(self) -> None:
+        """
+        Prepare the fairness metrics for the problem of the planner.
+        """
+        for metric in self.metrics:
+            metric.prepare(self.planner.exams, self.planner.proctors)
+        self.block_index = {
+            block: index for index, block in enumerate(block_order(self.planner.exams))
+        }
+
+    @property
+    def problem_signature(self) -> str:
+        """
+        Get a signature of the problem, used to check that a checkpoint belongs to it.
+
+        Any change to the exams, proctors, constraints or time rules changes the signature.
+
+        Returns:
+            str: The fingerprint of the problem of the planner.
+        """
+        return self.planner.fingerprint()
+
+    @property
+    def seed_signature(self) -> str | None:
+        """
+        Get a signature of the seed assignment and preference, which bias every simulation.
+
+        Returns:
+            str | None: The SHA-256 hex digest of the seed assignment and preference, None without a seed assignment.
+        """
+        if self.seed_assignment is None:
+            return None
+        seed = {
+            "assignment": sorted(
+                [*exam_key, sorted(names)]
+                for exam_key, names in self.seed_assignment.items()
+            ),
+            "preference": self.seed_preference,
+        }
+        return hashlib.sha256(json.dumps(seed).encode()).hexdigest()
+
+    def keep_best_results(self) -> None:
+        """
+        Drop all simulations but the best `keep_best` ones and the members of the Pareto front.
+        """
+        self.measure_fairness_all()
+        best = self.order_by_fairness()[: self.keep_best]
+        best += [
+            sim_number
+            for sim_number in self.pareto_front.members
+            if sim_number not in best
+        ]
+        self.results.keep(best)
+        self.fairness_results = {
+            sim_number: self.fairness_results[sim_number] for sim_number in best
+        }
+
+    def save_checkpoint(self, last_simulation: int) -> None:
+        """
+        Save the seed, simulation counters and best simulations to the checkpoint file.
+
+        Only the best `keep_best` simulations are kept, both in the checkpoint and in memory.
+        Each simulation draws from its own generator, so the seed is all the random state
+        needed to continue the run.
+
+        Args:
+            last_simulation (int): The number of the last completed simulation.
+        """
+        self.keep_best_results()
+        checkpoint = {
+            "problem_signature": self.problem_signature,
+            "seed_signature": self.seed_signature,
+            "last_simulation": last_simulation,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pruned": self.pruned,
+            "seed": self.seed,
+            "results": self.results,
+            "fairness_results": self.fairness_results,
+            "pareto_front": self.pareto_front,
+        }
+
+        # Write to a temporary file first so an interruption never corrupts the checkpoint
+        temporary_file = self.checkpoint_file.with_suffix(".tmp")
+        with open(temporary_file, "wb") as file:
+            pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+        temporary_file.replace(self.checkpoint_file)
+        logging.info(
+            f"Checkpoint saved after simulation {last_simulation} to {self.checkpoint_file}"
+        )
+
+    def load_checkpoint(self) -> int:
+        """
+        Load the seed, simulation counters and best simulations from the checkpoint file.
+
+        Raises:
+            FileNotFoundError: If the checkpoint file does not exist.
+            ValueError: If the checkpoint belongs to a different problem or seed schedule, or was saved by a version without seeds.
+
+        Returns:
+            int: The number of the last completed simulation.
+        """
+        if not self.checkpoint_file.exists():
+            raise FileNotFoundError(
+                f"No checkpoint to resume from, {self.checkpoint_file} does not exist."
+            )
+        with open(self.checkpoint_file, "rb") as file:
+            checkpoint = pickle.load(file)
+        if checkpoint["problem_signature"] != self.problem_signature:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_file} belongs to a different problem, check the input files."
+            )
+        if checkpoint.get("seed_signature") != self.seed_signature:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_file} was saved with a different seed schedule or preference, resume with the same ones."
+            )
+        if "seed" not in checkpoint:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_file} was saved without a seed and can not be resumed, start a new run."
+            )
+        self.seed = checkpoint["seed"]
+        # Checkpoints of older versions only know how many simulations ran
+        self.completed = checkpoint.get("completed", checkpoint["last_simulation"])
+        self.failed = checkpoint.get("failed", 0)
+        self.pruned = checkpoint.get("pruned", 0)
+        self.results = checkpoint["results"]
+        self.results.materialize = self.materialize
+        self.fairness_results = checkpoint["fairness_results"]
+        self.pareto_front = checkpoint["pareto_front"]
+        self.incumbent = min(self.fairness_results.values(), default=None)
+        logging.info(
+            f"Resuming from checkpoint {self.checkpoint_file} after simulation {checkpoint['last_simulation']}"
+        )
+        return checkpoint["last_simulation"]
 
     @timer_decorator
-    def simulate(self) -> None:
+    def simulate(self, resume: bool = False) -> None:
         """
         Simulate the scheduling process for multiple iterations.
+
+        Args:
+            resume (bool, optional): Whether to continue from the last checkpoint. Defaults to False.
+
+        Raises:
+            ValueError: If resuming a run on the compiled problem, which has no checkpoints.
         """
+        if resume and self.compiled_workers:
+            raise ValueError("Runs on the compiled problem can not be resumed.")
         self.planner.set_min_max_duties()
         self.planner.set_blocks()
+        if self.seed_assignment is not None:
+            self.planner.set_preferred(self.seed_assignment, self.seed_preference)
+        self.planner.set_components()
+        self.prepare_metrics()
+        if self.seed is None:
+            self.seed = random.getrandbits(64)
+        last_simulation = self.load_checkpoint() if resume else self.evaluate_seed()
+        self.resumed = last_simulation
+        if self.compiled_workers:
+            logging.info("Starting Simulations on the compiled problem...")
+            self.run_compiled_simulations()
+            self.measure_pending()
+            if self.ensemble is not None:
+                self.ensemble.flush()
+            logging.info("Simulations Completed.")
+            return
+        executor = (
+            self.planner.component_executor(self.workers)
+            if self.workers > 1 and len(self.planner.components) > 1
+            else None
+        )
         logging.info("Starting Simulations...")
-        for i in range(1, self.number_of_simulations + 1):
+        try:
+            self.run_simulations(last_simulation + 1, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.measure_pending()
+            if self.ensemble is not None:
+                self.ensemble.flush()
+        logging.info(
+            f"Simulations Completed. {self.failed} simulations failed and {self.pruned} were pruned by the best schedule."
+        )
+
+    def evaluate_seed(self) -> int:
+        """
+        Evaluate the seed assignment as simulation 0, repairing it where it no longer fits the problem.
+
+        Returns:
+            int: The number of the last completed simulation, 0.
+        """
+        if self.seed_assignment is None:
+            return 0
+        repairer = Repairer(self.planner, self.seed_assignment)
+        # Not a simulation, so not counted in completed or failed
+        self.store_result(0, repairer.repair(), keep=True)
+        self.measure_pending()
+        logging.info(
+            f"Seed schedule needed {len(repairer.changes)} changes, fairness: {self.incumbent}"
+        )
+        return 0
+
+    def store_result(self, sim_number: int, exit_code: int, keep: bool = False) -> None:
+        """
+        Store the current schedule of the planner.
+
+        Only the duties of the schedule are recorded, its fairness is measured with the
+        next batch of FAIRNESS_BATCH_SIZE simulations, see measure_pending.
+
+        Args:
+            sim_number (int): The simulation number.
+            exit_code (int): The exit code of the simulation.
+            keep (bool, optional): Whether to keep a copy of the schedule, for schedules that can not be materialized again. Defaults to False.
+        """
+        self.results.add(
+            sim_number, exit_code, self.copy_schedule(exit_code) if keep else None
+        )
+        self.pending.append(
+            (sim_number, exit_code, *self.duty_indices(self.planner.proctors))
+        )
+        if self.ensemble is not None:
+            self.ensemble.record(sim_number, self.planner.exams)
+        if len(self.pending) >= FAIRNESS_BATCH_SIZE:
+            self.measure_pending()
+
+    def measure_pending(self) -> None:
+        """
+        Measure the fairness of the pending simulations at once, and update the incumbent.
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        fairness_measures = self.measure_duties(
+            [sim_number for sim_number, _, _, _ in pending],
+            [exit_code for _, exit_code, _, _ in pending],
+            [(proctors, blocks) for _, _, proctors, blocks in pending],
+        )
+        for (sim_number, exit_code, _, _), fairness in zip(pending, fairness_measures):
+            self.fairness_results[sim_number] = fairness
+            if self.incumbent is None or fairness < self.incumbent:
+                self.incumbent = fairness
+                self.last_improvement = sim_number
+            if exit_code == 0:
+                # Failed schedules offer no trade-off, so only successful ones join the front
+                self.pareto_front.insert(sim_number, fairness[1:-1])
+            if self.ensemble is not None:
+                self.ensemble.record_fairness(sim_number, fairness)
+        # The ensemble holds every simulation, so memory only needs the best ones
+        if self.ensemble is not None and len(self.results) > 2 * self.keep_best + len(
+            self.pareto_front.members
+        ):
+            self.keep_best_results()
+
+    def run_simulations(self, first_simulation: int, executor: Executor | None) -> None:
+        """
+        Run the simulations from first_simulation up to number_of_simulations.
+
+        Args:
+            first_simulation (int): The number of the first simulation to run.
+            executor (Executor | None): A process pool scheduling independent components, if any.
+        """
+        self.last_improvement = first_simulation - 1
+        for i in range(first_simulation, self.number_of_simulations + 1):
             # logging.info(f"Starting Simulation {i}...")
-            exit_code: int = self.planner.schedule(i)
-            self.results[i] = (
-                exit_code,
-                deepcopy(self.planner.exams),
-                deepcopy(self.planner.proctors),
-                deepcopy(self.planner.blocks),
+            exit_code: int = self.planner.schedule(
+                i,
+                executor=executor,
+                incumbent=self.incumbent if self.prune else None,
+                rng=simulation_rng(self.seed, i),
             )
+            self.completed += 1
+            if exit_code == PRUNED:
+                self.pruned += 1
+            else:
+                if exit_code == FAILED:
+                    self.failed += 1
+                self.store_result(i, exit_code)
             # logging.info(
             #     f"Simulation {i} is completed with {'success' if exit_code == 0 else 'failure'}."
             # )
-        logging.info("Simulations Completed.")
+            if self.checkpoint_interval and i % self.checkpoint_interval == 0:
+                self.save_checkpoint(i)
+            if self.patience and i - self.last_improvement >= self.patience:
+                # Improvements among the pending simulations are only known once measured
+                self.measure_pending()
+                if i - self.last_improvement >= self.patience:
+                    logging.info(
+                        f"Stopping early, no improvement in the last {self.patience} simulations."
+                    )
+                    break
 
-    def measure_fairness(
-        self, sim_number: int
-    ) -> tuple[int, int, float, float, int, int]:
+    def run_compiled_simulations(self) -> None:
         """
-        Measure the fairness of a simulation.
+        Run the simulations on the compiled problem and store their schedules in the planner's objects.
+        """
+        self.compiled = CompiledProblem.compile(self.planner)
+        self.compiled_exams = CompiledProblem.exam_order(self.planner)
+        exit_codes, assignments = run_compiled(
+            self.compiled,
+            self.number_of_simulations,
+            self.seed,
+            self.compiled_workers,
+            on_task=self.count_compiled_task,
+        )
+        for sim_number, (exit_code, assignment) in enumerate(
+            zip(exit_codes, assignments), start=1
+        ):
+            self.store_compiled_result(
+                sim_number, int(exit_code), self.compiled_exams, assignment
+            )
+
+    def count_compiled_task(self, exit_codes: np.ndarray) -> None:
+        """
+        Count the simulations of a finished range of the compiled problem, as they finish.
+
+        Args:
+            exit_codes (np.ndarray): The exit codes of the simulations of the range.
+        """
+        self.completed += len(exit_codes)
+        self.failed += int(np.count_nonzero(exit_codes == FAILED))
+
+    def store_compiled_result(
+        self,
+        sim_number: int,
+        exit_code: int,
+        exams: list[Exam],
+        assignment: np.ndarray,
+    ) -> None:
+        """
+        Replay a schedule of the compiled problem in the planner and store it.
+
+        Schedules of a run of this simulator are materialized again from the compiled
+        problem when looked up, others, such as the reports of distributed workers, are kept.
 
         Args:
             sim_number (int): The simulation number.
+            exit_code (int): The exit code of the simulation.
+            exams (list[Exam]): The exams of the planner in the order of the compiled problem.
+            assignment (np.ndarray): The (exams, max_needed) proctor indices of each exam, -1 where unassigned.
+        """
+        CompiledProblem.replay(self.planner, exams, assignment)
+        self.store_result(sim_number, exit_code, keep=self.compiled is None)
 
-        Returns:
-            tuple[int, int, float, float, int, int]: Fairness measures, using simulation number as tie breaker.
+    def copy_schedule(self, exit_code: int) -> Result:
         """
-        failure: int = 0
-        if self.results[sim_number][0] != 0:
-            failure = 1
+        Copy the current schedule of the planner.
 
-        proctors: list[Proctor] = self.results[sim_number][2]
-        total_duties = [
-            proctor.total_proctored_before + len(proctor.duties) for proctor in proctors
-        ]
-        standard_deviation_of_total_duties = standard_deviation(total_duties)
+        Args:
+            exit_code (int): The exit code of the schedule.
 
-        first_year_total_duties = [
-            proctor.total_proctored_before + len(proctor.duties)
-            for proctor in filter(lambda x: x.proctor_class == 1, proctors)
-        ]
-        standard_deviation_of_first_year_total_duties = standard_deviation(
-            first_year_total_duties
+        Returns:
+            Result: The exit code and copies of the exams, proctors and blocks of the planner.
+        """
+        return (
+            exit_code,
+            deepcopy(self.planner.exams),
+            deepcopy(self.planner.proctors),
+            deepcopy(self.planner.blocks),
         )
 
-        weak_constraints_not_satisfied = sum(
-            not proctor.not_preferred_satisfied() for proctor in proctors
+    def materialize(self, sim_number: int, exit_code: int) -> Result:
+        """
+        Schedule a simulation of the run again from its random number generator.
+
+        The generator of a simulation only depends on the seed of the run and the simulation
+        number, and pruning does not draw from it, so the schedule is the one of the run.
+
+        Args:
+            sim_number (int): The simulation number.
+            exit_code (int): The exit code of the simulation.
+
+        Returns:
+            Result: The exit code and copies of the exams, proctors and blocks of the schedule.
+        """
+        assert self.seed is not None
+        if self.compiled is not None:
+            assignment = np.empty(
+                (len(self.compiled_exams), self.compiled.max_needed), dtype=np.int32
+            )
+            self.compiled.schedule(
+                simulation_generator(self.seed, sim_number), assignment
+            )
+            CompiledProblem.replay(self.planner, self.compiled_exams, assignment)
+        else:
+            self.planner.schedule(sim_number, rng=simulation_rng(self.seed, sim_number))
+        return self.copy_schedule(exit_code)
+
+    def measure_fairness_of(
+        self,
+        sim_numbers: list[int],
+        exit_codes: list[int],
+        proctors: list[list[Proctor]],
+    ) -> list[Fairness]:
+        """
+        Measure the fairness of the given schedules at once.
+
+        The duties of each proctor in each block of all schedules are counted into one
+        array, then every metric is evaluated over the whole batch.
+
+        Args:
+            sim_numbers (list[int]): The simulation numbers.
+            exit_codes (list[int]): The exit codes of the simulations.
+            proctors (list[list[Proctor]]): The proctors of each schedule, in the order of the planner.
+
+        Returns:
+            list[Fairness]: Fairness measures of each simulation.
+        """
+        return self.measure_duties(
+            sim_numbers,
+            exit_codes,
+            [self.duty_indices(schedule_proctors) for schedule_proctors in proctors],
         )
 
-        return (
-            failure,
-            max(total_duties) - min(total_duties),
-            standard_deviation_of_first_year_total_duties,
-            standard_deviation_of_total_duties,
-            weak_constraints_not_satisfied,
-            sim_number,
+    def duty_indices(self, proctors: list[Proctor]) -> tuple[list[int], list[int]]:
+        """
+        Get the proctor and block index of each duty of a schedule.
+
+        Args:
+            proctors (list[Proctor]): The proctors of the schedule, in the order of the planner.
+
+        Returns:
+            tuple[list[int], list[int]]: The index of the proctor and the index of the block of each duty.
+        """
+        proctor_indices: list[int] = []
+        block_indices: list[int] = []
+        for proctor_index, proctor in enumerate(proctors):
+            for duty in proctor.duties:
+                proctor_indices.append(proctor_index)
+                block_indices.append(self.block_index[duty.block])
+        return proctor_indices, block_indices
+
+    def measure_duties(
+        self,
+        sim_numbers: list[int],
+        exit_codes: list[int],
+        duties: list[tuple[list[int], list[int]]],
+    ) -> list[Fairness]:
+        """
+        Measure the fairness of schedules given by the proctor and block index of their duties.
+
+        Args:
+            sim_numbers (list[int]): The simulation numbers.
+            exit_codes (list[int]): The exit codes of the simulations.
+            duties (list[tuple[list[int], list[int]]]): The proctor and block indices of the duties of each schedule, see duty_indices.
+
+        Returns:
+            list[Fairness]: Fairness measures of each simulation.
+        """
+        duty_counts = np.zeros(
+            (len(sim_numbers), len(self.planner.proctors), len(self.block_index)),
+            dtype=np.int32,
+        )
+        rows = np.repeat(
+            np.arange(len(duties)), [len(proctors) for proctors, _ in duties]
         )
+        np.add.at(
+            duty_counts,
+            (
+                rows,
+                np.fromiter(
+                    chain.from_iterable(proctors for proctors, _ in duties),
+                    dtype=np.intp,
+                ),
+                np.fromiter(
+                    chain.from_iterable(blocks for _, blocks in duties), dtype=np.intp
+                ),
+            ),
+            1,
+        )
+        batch = FairnessBatch(
+            duty_counts,
+            np.array(
+                [proctor.total_proctored_before for proctor in self.planner.proctors]
+            ),
+            np.array([proctor.proctor_class for proctor in self.planner.proctors]),
+        )
+        columns = [(np.array(exit_codes) != 0).astype(int).tolist()]
+        columns += [metric.evaluate(batch).tolist() for metric in self.metrics]
+        return list(zip(*columns, sim_numbers))
+
+    def measure_fairness(self, sim_number: int) -> Fairness:
+        """
+        Measure the fairness of a simulation.
+
+        Args:
+            sim_number (int): The simulation number.
+
+        Returns:
+            Fairness: Fairness measures, using simulation number as tie breaker.
+        """
+        exit_code, _, proctors, _ = self.results[sim_number]
+        return self.measure_fairness_of([sim_number], [exit_code], [proctors])[0]
 
     def measure_fairness_all(self) -> None:
         """
-        Measure the fairness of all simulations.
+        Measure the fairness of all simulations not measured yet, at once.
         """
-        for sim_number in self.results:
-            fairness_measure = self.measure_fairness(sim_number)
-            self.fairness_results[sim_number] = fairness_measure
+        self.measure_pending()
+        sim_numbers = [
+            sim_number
+            for sim_number in self.results
+            if sim_number not in self.fairness_results
+        ]
+        if not sim_numbers:
+            return
+        fairness_measures = self.measure_fairness_of(
+            sim_numbers,
+            [self.results[sim_number][0] for sim_number in sim_numbers],
+            [self.results[sim_number][2] for sim_number in sim_numbers],
+        )
+        self.fairness_results.update(zip(sim_numbers, fairness_measures))
 
     def order_by_fairness(self) -> list[int]:
         """
-        Order the simulations by fairness.
+        Order the simulations by fairness, with a lexicographic sort of the fairness measures.
+
+        Pending simulations are measured first.
 
         Returns:
             list[int]: The ordered list of simulation numbers.
         """
-        return sorted(
-            self.fairness_results.keys(),
-            key=lambda sim_number: self.fairness_results[sim_number],
-        )
+        self.measure_pending()
+        if not self.fairness_results:
+            return []
+        fairness = np.array(list(self.fairness_results.values()), dtype=float)
+        # np.lexsort sorts by the last key first
+        order = np.lexsort(fairness.T[::-1])
+        return fairness[order, -1].astype(int).tolist()
@@ -0,0 +1,126 @@
+"""Module for the live progress of simulations.
+
+The simulator only increments its counters in the hot loop. The display is refreshed
+by the background thread of a rich Live display, which reads these counters, so the
+simulations are not slowed down by rendering.
+"""
+
+import time
+from datetime import timedelta
+from types import TracebackType
+
+from rich.console import Console
+from rich.live import Live
+from rich.text import Text
+
+from scheduler.simulator import Simulator
+
+# Number of refreshes of the display per second
+REFRESH_PER_SECOND = 2
+
+
+class ProgressMonitor:
+    def __init__(
+        self,
+        simulator: Simulator,
+        refresh_per_second: float = REFRESH_PER_SECOND,
+        console: Console | None = None,
+    ) -> None:
+        """
+        Initialize the ProgressMonitor class, a live display of the progress of a Simulator.
+
+        Args:
+            simulator (Simulator): The Simulator to monitor.
+            refresh_per_second (float, optional): The number of refreshes per second. Defaults to REFRESH_PER_SECOND.
+            console (Console | None, optional): The console to display on. Defaults to the console of rich.
+        """
+        self.simulator = simulator
+        self.start = time.perf_counter()
+        self.live = Live(
+            get_renderable=self.render,
+            refresh_per_second=refresh_per_second,
+            console=console,
+            transient=False,
+        )
+
+    def snapshot(self) -> dict[str, float | None]:
+        """
+        Read the counters of the simulator, which include the simulations before a resume.
+
+        Returns:
+            dict[str, float | None]: The completed and total simulations, simulations per second, success rate and estimated seconds left.
+        """
+        simulator = self.simulator
+        completed = simulator.completed
+        total = simulator.number_of_simulations
+        seconds = time.perf_counter() - self.start
+        # Only the simulations since the start of the display count for the throughput
+        rate = max(completed - simulator.resumed, 0) / seconds if seconds > 0 else 0.0
+        return {
+            "completed": completed,
+            "total": total,
+            "rate": rate,
+            "success_rate": (completed - simulator.failed - simulator.pruned)
+            / completed
+            if completed
+            else None,
+            "seconds_left": (total - completed) / rate if rate > 0 else None,
+        }
+
+    def render(self) -> Text:
+        """
+        Render the progress, called by the refresh thread of the display.
+
+        Returns:
+            Text: A line with the progress, throughput, success rate, best fairness and ETA.
+        """
+        snapshot = self.snapshot()
+        incumbent = self.simulator.incumbent
+        best = (
+            "-"
+            if incumbent is None
+            else ", ".join(
+                f"{name}={value:.4g}"
+                for name, value in zip(
+                    ["failed"] + [metric.name for metric in self.simulator.metrics],
+                    incumbent[:-1],
+                )
+            )
+        )
+        success_rate = snapshot["success_rate"]
+        seconds_left = snapshot["seconds_left"]
+        return Text.assemble(
+            (f"Simulations {snapshot['completed']}/{snapshot['total']}", "bold"),
+            f" | {snapshot['rate']:.1f}/s",
+            f" | success {'-' if success_rate is None else f'{success_rate:.1%}'}",
+            f" | pruned {self.simulator.pruned}",
+            f" | best {best}",
+            " | ETA "
+            + (
+                "-"
+                if seconds_left is None
+                else str(timedelta(seconds=int(seconds_left)))
+            ),
+        )
+
+    def __enter__(self) -> "ProgressMonitor":
+        """
+        Start the display.
+
+        Returns:
+            ProgressMonitor: The monitor.
+        """
+        self.start = time.perf_counter()
+        self.live.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Stop the display, rendering the final progress once more.
+        """
+        self.live.stop()
@@ -0,0 +1,89 @@
+"""Module for the integer time model of blocks.
+
+A block is a string of an ISO date followed by a time slot, e.g. "2023-06-01 09:00-11:00".
+Blocks are parsed once into integer day indices, slot indices and start and end minutes,
+so time rules between duties become integer comparisons.
+"""
+
+import re
+from datetime import date
+
+TIME_PATTERN = re.compile(r"(\d{1,2})[:.](\d{2})")
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_block(block: str) -> tuple[int, int, int]:
+    """Parse a block into its day and its start and end minutes.
+
+    Args:
+        block (str): The block, an ISO date followed by a time slot.
+
+    Raises:
+        ValueError: If the block does not start with an ISO date or has no time.
+
+    Returns:
+        tuple[int, int, int]: The day as a proleptic Gregorian ordinal and the start and end minutes of the day.
+    """
+    day = date.fromisoformat(block[:10]).toordinal()
+    times = [
+        int(hours) * 60 + int(minutes)
+        for hours, minutes in TIME_PATTERN.findall(block[10:])
+    ]
+    if not times:
+        raise ValueError(f"Block {block!r} has no time, e.g. 09:00-11:00.")
+    return day, times[0], times[1] if len(times) > 1 else times[0]
+
+
+class Timetable:
+    def __init__(self, blocks: list[str]) -> None:
+        """
+        Initialize the Timetable class, parsing every block once.
+
+        Args:
+            blocks (list[str]): The blocks of the problem.
+        """
+        self.blocks = blocks
+        self.index = {block: i for i, block in enumerate(blocks)}
+        parsed = [parse_block(block) for block in blocks]
+        first_day = min((day for day, _, _ in parsed), default=0)
+        self.days = [day - first_day for day, _, _ in parsed]
+        self.starts = [
+            (day - first_day) * MINUTES_PER_DAY + start for day, start, _ in parsed
+        ]
+        self.ends = [
+            (day - first_day) * MINUTES_PER_DAY + end for day, _, end in parsed
+        ]
+        day_starts: dict[int, list[int]] = {}
+        for day, start in zip(self.days, self.starts):
+            day_starts.setdefault(day, []).append(start)
+        self.slots = [
+            sorted(set(day_starts[day])).index(start)
+            for day, start in zip(self.days, self.starts)
+        ]
+
+    def conflicts(self, same_day: bool, min_gap_minutes: int) -> list[list[int]]:
+        """
+        Get, for each block, the blocks a proctor can no longer take after a duty in it.
+
+        A block always conflicts with itself and with blocks closer than the minimum gap.
+
+        Args:
+            same_day (bool): Whether blocks on the same day conflict.
+            min_gap_minutes (int): The minimum number of minutes between two duties.
+
+        Returns:
+            list[list[int]]: The indices of the conflicting blocks of each block.
+        """
+        return [
+            [
+                j
+                for j in range(len(self.blocks))
+                if i == j
+                or (same_day and self.days[i] == self.days[j])
+                or (
+                    self.starts[j] < self.ends[i] + min_gap_minutes
+                    and self.starts[i] < self.ends[j] + min_gap_minutes
+                )
+            ]
+            for i in range(len(self.blocks))
+        ]
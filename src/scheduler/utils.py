@@ -1,9 +1,13 @@
 """Module for utility functions."""
 
+import atexit
 import logging
+import os
 import sys
 from collections.abc import Callable
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import Full, Queue
 from time import time
 from typing import ParamSpec, TypeVar
 
@@ -14,10 +18,206 @@ R = TypeVar("R")
 P = ParamSpec("P")
 
 
+# Records written to the log file before it is flushed, warnings and worse flush it at once
+LOG_BATCH_SIZE = 100
+# Maximum number of records waiting for the writer thread
+LOG_QUEUE_SIZE = 10_000
+# Only one in this many debug records is logged
+DEBUG_SAMPLE_RATE = 100
+
+
+class BatchFileHandler(logging.FileHandler):
+    """File handler that flushes the log file once every batch of records instead of after each record."""
+
+    def __init__(self, filename: str, batch_size: int) -> None:
+        """
+        Initialize the BatchFileHandler class.
+
+        Args:
+            filename (str): The path of the log file.
+            batch_size (int): The number of records written before the log file is flushed.
+        """
+        super().__init__(filename)
+        self.batch_size = batch_size
+        self.unflushed = 0
+        self.urgent = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a record to the log file, flushing it if the batch is full or the record is a warning or worse.
+
+        Args:
+            record (logging.LogRecord): The record.
+        """
+        self.unflushed += 1
+        self.urgent = record.levelno >= logging.WARNING
+        super().emit(record)
+
+    def flush(self) -> None:
+        """
+        Flush the log file if the batch is full or the last record is urgent.
+        """
+        if self.unflushed >= self.batch_size or self.urgent:
+            self.force_flush()
+
+    def force_flush(self) -> None:
+        """
+        Flush the log file.
+        """
+        super().flush()
+        self.unflushed = 0
+
+    def close(self) -> None:
+        """
+        Flush and close the log file.
+        """
+        self.force_flush()
+        super().close()
+
+
+class SamplingQueueHandler(QueueHandler):
+    """Queue handler whose records are handled by a writer thread.
+
+    Debug records are sampled, and records below warning are dropped while the queue is
+    full, so that logging never blocks the caller. Once closed, records are handled
+    synchronously. Forked worker processes handle their records synchronously too, with
+    handlers of their own.
+    """
+
+    def __init__(
+        self,
+        handlers: list[logging.Handler],
+        queue_size: int = LOG_QUEUE_SIZE,
+        debug_sample_rate: int = DEBUG_SAMPLE_RATE,
+    ) -> None:
+        """
+        Initialize the SamplingQueueHandler class and start its writer thread.
+
+        Args:
+            handlers (list[logging.Handler]): The handlers of the records, called by the writer thread.
+            queue_size (int, optional): The maximum number of records waiting for the writer thread. Defaults to LOG_QUEUE_SIZE.
+            debug_sample_rate (int, optional): Only one in this many debug records is handled. Defaults to DEBUG_SAMPLE_RATE.
+        """
+        super().__init__(Queue(queue_size))
+        self.pid = os.getpid()
+        self.worker_pid = self.pid
+        self.worker_handlers: list[logging.Handler] = []
+        self.debug_sample_rate = debug_sample_rate
+        self.debug_records = 0
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self.running = True
+
+    def filter(self, record: logging.LogRecord) -> bool | logging.LogRecord:
+        """
+        Sample debug records, keeping the first of every debug_sample_rate.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            bool | logging.LogRecord: Whether to handle the record.
+        """
+        if record.levelno <= logging.DEBUG:
+            self.debug_records += 1
+            if (self.debug_records - 1) % self.debug_sample_rate:
+                return False
+        return super().filter(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Enqueue a record for the writer thread, or handle it synchronously once closed.
+
+        Args:
+            record (logging.LogRecord): The record.
+        """
+        if os.getpid() != self.pid:
+            self.handle_in_worker(record)
+        elif self.running:
+            super().emit(record)
+        else:
+            self.listener.handle(record)
+
+    def handle_in_worker(self, record: logging.LogRecord) -> None:
+        """
+        Handle a record of a forked worker process, which has no writer thread.
+
+        The batch file handlers hold the file buffer of the parent as it was at fork, so
+        writing through them could repeat its unflushed lines, and the worker exits without
+        flushing them. Workers append to the same files with handlers flushing every record.
+
+        Args:
+            record (logging.LogRecord): The record.
+        """
+        if self.worker_pid != os.getpid():
+            self.worker_pid = os.getpid()
+            self.worker_handlers = [
+                worker_handler(handler) for handler in self.listener.handlers
+            ]
+        record = self.prepare(record)
+        for handler in self.worker_handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Enqueue a record without blocking, unless it is a warning or worse.
+
+        Args:
+            record (logging.LogRecord): The prepared record.
+        """
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """
+        Stop the writer thread after it handled the queued records, and close the handlers.
+        """
+        if self.running and os.getpid() == self.pid:
+            self.running = False
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        super().close()
+
+
+def worker_handler(handler: logging.Handler) -> logging.Handler:
+    """Get the handler of a forked worker process for a handler of the writer thread.
+
+    Args:
+        handler (logging.Handler): A handler of the writer thread.
+
+    Returns:
+        logging.Handler: A file handler appending to the same file for batch file handlers, the handler itself otherwise.
+    """
+    if not isinstance(handler, BatchFileHandler):
+        return handler
+    file_handler = logging.FileHandler(handler.baseFilename, delay=True)
+    file_handler.setFormatter(handler.formatter)
+    file_handler.setLevel(handler.level)
+    return file_handler
+
+
+def stop_logger() -> None:
+    """Stop the writer threads of the logger, handling the queued records."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, SamplingQueueHandler):
+            handler.close()
+
+
 # Define function to initialize the logger
 def init_logger(file_name: str) -> None:
     """Initialize the logger.
 
+    Log calls only put records on a queue. A writer thread formats them and writes them to
+    stdout and, in batches, to the log file. The writer thread is stopped at exit.
+
     Args:
         file_name (str): The name of the log file.
     """
@@ -30,7 +230,7 @@ def init_logger(file_name: str) -> None:
     log_formatter = logging.Formatter("%(asctime)s:%(levelname)s: %(message)s")
     log_formatter.datefmt = "%Y-%m-%d %H:%M:%S"
 
-    log_handler = logging.FileHandler(str(log_file))
+    log_handler = BatchFileHandler(str(log_file), LOG_BATCH_SIZE)
     log_handler.setFormatter(log_formatter)
     log_handler.setLevel(logging.INFO)
 
@@ -38,10 +238,13 @@ def init_logger(file_name: str) -> None:
     std_log_handler.setFormatter(log_formatter)
     std_log_handler.setLevel(logging.DEBUG)
 
-    # Add handlers to the logger and set logging level
+    # Replace the queue handler of a previous logger and set logging level
     logger = logging.getLogger()
-    logger.addHandler(std_log_handler)
-    logger.addHandler(log_handler)
+    for handler in logger.handlers[:]:
+        if isinstance(handler, SamplingQueueHandler):
+            handler.close()
+            logger.removeHandler(handler)
+    logger.addHandler(SamplingQueueHandler([std_log_handler, log_handler]))
     logger.setLevel(logging.DEBUG)
 
     # Set library logging level to error
@@ -52,6 +255,9 @@ def init_logger(file_name: str) -> None:
     logging.info(f"Path to log file: {log_file.resolve()}")
 
 
+atexit.register(stop_logger)
+
+
 # Define function to check if a log file already exists and ask user whether to overwrite it
 def check_log_file_name(log_file_name: str) -> None:
     """Check if the given log_file_name exists and ask the user whether to overwrite it.
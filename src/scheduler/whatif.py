@@ -0,0 +1,135 @@
+"""Module for what-if evaluation of variants of the problem.
+
+A variant is a list of deltas, in the format of the repair module, applied to the base
+problem. Unlike a repair, each variant is scheduled from scratch, so its best fairness
+can be compared with the base problem and the other variants. Every variant is run with
+the same seed, so differences come from the deltas rather than from the random draws.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import deepcopy
+
+from scheduler.metrics import Fairness, make_metrics
+from scheduler.planner import Planner
+from scheduler.repair import Repairer
+from scheduler.simulator import Simulator
+
+# Name of the variant without deltas
+BASE_VARIANT = "base"
+
+# Base problem held by each worker process, see evaluate_variants
+_worker_planner: Planner | None = None
+
+
+def _init_variant_worker(planner: Planner) -> None:
+    """
+    Store the base problem in a worker process.
+
+    Args:
+        planner (Planner): The Planner holding the prepared base problem.
+    """
+    global _worker_planner
+    _worker_planner = planner
+
+
+def evaluate_variant(
+    planner: Planner,
+    deltas: list[str],
+    number_of_simulations: int,
+    metric_names: list[str],
+    seed: int,
+) -> Fairness:
+    """
+    Apply deltas to a copy of the base problem and find its best schedule.
+
+    Args:
+        planner (Planner): The Planner holding the prepared base problem, left unchanged.
+        deltas (list[str]): The deltas of the variant.
+        number_of_simulations (int): The number of simulations.
+        metric_names (list[str]): The names of the fairness metrics, in ranking order.
+        seed (int): The seed of the random number generator.
+
+    Raises:
+        ValueError: If a delta is not valid.
+
+    Returns:
+        Fairness: The fairness of the best schedule of the variant.
+    """
+    repairer = Repairer(deepcopy(planner), {})
+    for delta in deltas:
+        repairer.apply_delta(delta)
+    simulator = Simulator(
+        repairer.planner,
+        number_of_simulations,
+        metrics=make_metrics(metric_names),
+        seed=seed,
+    )
+    simulator.simulate()
+    return simulator.fairness_results[simulator.order_by_fairness()[0]]
+
+
+def _evaluate_variant_in_worker(
+    deltas: list[str], number_of_simulations: int, metric_names: list[str], seed: int
+) -> Fairness:
+    """
+    Evaluate a variant of the base problem held by a worker process, see evaluate_variant.
+    """
+    assert _worker_planner is not None
+    return evaluate_variant(
+        _worker_planner, deltas, number_of_simulations, metric_names, seed
+    )
+
+
+def evaluate_variants(
+    planner: Planner,
+    variants: dict[str, list[str]],
+    number_of_simulations: int,
+    metric_names: list[str],
+    seed: int = 0,
+    workers: int = 1,
+) -> dict[str, Fairness]:
+    """
+    Evaluate the base problem and each variant, in parallel with more than one worker.
+
+    The base problem is sent once to each worker process, not once per variant.
+
+    Args:
+        planner (Planner): The Planner holding the prepared base problem, left unchanged.
+        variants (dict[str, list[str]]): The deltas of each variant, keyed by variant name.
+        number_of_simulations (int): The number of simulations of each variant.
+        metric_names (list[str]): The names of the fairness metrics, in ranking order.
+        seed (int, optional): The seed of the random number generator of every variant. Defaults to 0.
+        workers (int, optional): The number of worker processes. Defaults to 1.
+
+    Raises:
+        ValueError: If a variant is named BASE_VARIANT or a delta is not valid.
+
+    Returns:
+        dict[str, Fairness]: The fairness of the best schedule of each variant, the base problem first.
+    """
+    if BASE_VARIANT in variants:
+        raise ValueError(f"{BASE_VARIANT!r} is reserved for the base problem.")
+    all_variants = {BASE_VARIANT: [], **variants}
+    if workers <= 1:
+        return {
+            name: evaluate_variant(
+                planner, deltas, number_of_simulations, metric_names, seed
+            )
+            for name, deltas in all_variants.items()
+        }
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_variant_worker,
+        initargs=(planner,),
+    ) as executor:
+        futures: dict[str, Future[Fairness]] = {
+            name: executor.submit(
+                _evaluate_variant_in_worker,
+                deltas,
+                number_of_simulations,
+                metric_names,
+                seed,
+            )
+            for name, deltas in all_variants.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from scheduler import batch, prep_data, utils
+from scheduler.assignment import load_assignment
+from scheduler.batch import read_scenarios, run_batch
+
+BLOCKS = ["2023-06-01 09:00-11:00", "2023-06-01 13:00-15:00"]
+
+
+@pytest.fixture
+def scenarios(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """A fixture that writes the config and input files of two small scenarios.
+
+    The inputs, pickles and logs directories are redirected to the temporary directory.
+
+    Returns:
+        list[Path]: The config files of the scenarios.
+    """
+    monkeypatch.setattr(prep_data, "INPUTS_DIR", tmp_path)
+    monkeypatch.setattr(batch, "PICKLES_DIR", tmp_path)
+    monkeypatch.setattr(utils, "LOGS_DIR", tmp_path)
+    config_files = []
+    for department in ("econ", "math"):
+        title = department.upper()
+        pd.DataFrame(
+            {
+                "No": [1, 2, 3],
+                "Course Code": [title] * 3,
+                "Exam Title": [f"{title} 101", f"{title} 102", f"{title} 201"],
+                "Exam Date": ["2023-06-01"] * 3,
+                "Reserved Slots": ["09:00-11:00", "09:00-11:00", "13:00-15:00"],
+                "Classrooms": ["A-101", "A-102", "A-101"],
+                "Instructors": ["A", "B", "C"],
+            }
+        ).to_csv(tmp_path / f"{department}_exams.csv", index=False)
+        pd.DataFrame(
+            {
+                "Name": [f"{title} Proctor {i}" for i in range(4)],
+                "Email": [f"{i}@example.com" for i in range(4)],
+                "Total Proctored Before": [0, 1, 0, 1],
+                "Proctor Class": [1, 2, 2, 3],
+                BLOCKS[0]: [None, None, None, None],
+                BLOCKS[1]: [1, None, None, None],
+            }
+        ).to_csv(tmp_path / f"{department}_proctors.csv", index=False)
+        pd.DataFrame(
+            {
+                "Exam_Title": [f"{title} 101", f"{title} 102", f"{title} 201"],
+                "Classroom": ["A-101", "A-102", "A-101"],
+                "Number_of_Proctors_Needed": [1, 1, 2],
+                "Requires_Specific_Proctor": [None, None, None],
+            }
+        ).to_csv(tmp_path / f"{department}_numbers.csv", index=False)
+        config_file = tmp_path / f"{department}.yaml"
+        config_file.write_text(
+            yaml.safe_dump(
+                {
+                    "log_file_name": "batch.log",
+                    "exams_file": f"{department}_exams.csv",
+                    "proctors_file": f"{department}_proctors.csv",
+                    "exams_file_for_proctor_numbers": f"{department}_numbers.csv",
+                }
+            )
+        )
+        config_files.append(config_file)
+    return config_files
+
+
+def test_read_scenarios(scenarios: list[Path], tmp_path: Path) -> None:
+    """Test if manifests are expanded and repeated scenarios are rejected.
+
+    Args:
+        scenarios (list[Path]): The config files of the scenarios.
+        tmp_path (Path): A temporary directory for the manifest.
+
+    Returns:
+        None
+    """
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(yaml.safe_dump({"scenarios": [str(scenarios[1])]}))
+    assert read_scenarios([scenarios[0], manifest]) == scenarios
+    with pytest.raises(ValueError):
+        read_scenarios([scenarios[0], scenarios[0]])
+    with pytest.raises(FileNotFoundError):
+        read_scenarios([tmp_path / "missing.yaml"])
+
+
+def test_run_batch(scenarios: list[Path], tmp_path: Path) -> None:
+    """Test if every scenario is scheduled and summarized.
+
+    Args:
+        scenarios (list[Path]): The config files of the scenarios.
+        tmp_path (Path): A temporary directory for the outputs.
+
+    Returns:
+        None
+    """
+    summary_file = tmp_path / "summary.csv"
+    summary = run_batch(scenarios, 5, 2, seed=0, summary_file=summary_file)
+
+    assert summary["Scenario"].tolist() == ["econ", "math", "batch"]
+    assert summary["Feasible"].iloc[:2].tolist() == [True, True]
+    assert summary["Total_Seconds"].notna().all()
+    assert pd.read_csv(summary_file)["Scenario"].tolist() == ["econ", "math", "batch"]
+    assignment = load_assignment(tmp_path / "econ_schedule.pickle")
+    assert len(assignment[("ECON 201", "A-101")]) == 2
+    assert "ECON Proctor 0" not in assignment[("ECON 201", "A-101")]
@@ -0,0 +1,58 @@
+import random
+from pathlib import Path
+
+from scheduler.cache import load_result, result_key, save_result
+from scheduler.planner import Planner
+from scheduler.simulator import Simulator
+
+
+def test_cache_hit_and_miss(planner: Planner, tmp_path: Path) -> None:
+    """Test if a seeded run is loaded from the cache only for the same key.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the cache.
+
+    Returns:
+        None
+    """
+    parameters = {"number_of_simulations": 10}
+    simulator = Simulator(planner, 10)
+    key = result_key(simulator, parameters, 0)
+    assert not load_result(key, simulator, tmp_path)
+
+    random.seed(0)
+    simulator.simulate()
+    best = simulator.order_by_fairness()[0]
+    fairness = simulator.fairness_results[best]
+    save_result(key, simulator, tmp_path)
+
+    cached = Simulator(planner, 10)
+    assert result_key(cached, parameters, 0) == key
+    assert load_result(key, cached, tmp_path)
+    assert cached.order_by_fairness()[0] == best
+    assert cached.fairness_results[best] == fairness
+    assert cached.incumbent == fairness
+
+    assert result_key(cached, parameters, 1) != key
+    assert result_key(cached, {"number_of_simulations": 20}, 0) != key
+    planner.proctors[0].not_preferred.append("2023-06-02 09:00-11:00")
+    assert result_key(cached, parameters, 0) != key
+
+
+def test_seeded_runs_are_reproducible(planner: Planner) -> None:
+    """Test if two runs with the same seed find the same schedules, so caching them is sound.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    fairness_results = []
+    for _ in range(2):
+        random.seed(42)
+        simulator = Simulator(planner, 10)
+        simulator.simulate()
+        fairness_results.append(simulator.fairness_results)
+    assert fairness_results[0] == fairness_results[1]
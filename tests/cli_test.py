@@ -1,4 +1,9 @@
-from typer.testing import Result
+import inspect
+
+import pytest
+from typer.testing import CliRunner, Result
+
+from scheduler import cli, export
 
 # def test_main_with_default_values(main_with_default_values: Result) -> None:
 #     """Test the main function with default values.
@@ -45,3 +50,54 @@ def test_main_with_help_option(main_with_help_option: Result) -> None:
     """
     result = main_with_help_option
     assert "Usage: " in result.stdout
+
+
+def test_main_with_invalid_export_format(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if an invalid export format is rejected before the input files are loaded.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The fixture to replace load_planner.
+
+    Returns:
+        None
+    """
+
+    def load_planner(*args: object, **kwargs: object) -> None:
+        raise AssertionError("The input files should not be loaded.")
+
+    monkeypatch.setattr(cli, "load_planner", load_planner)
+    result = CliRunner().invoke(cli.app, ["main", "--export-format", "docx"])
+    assert result.exit_code == 2
+    assert "not an export format" in result.output
+
+
+def test_main_parquet_without_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if parquet is rejected before the input files are loaded when no engine is installed.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The fixture to replace load_planner and the engine check.
+
+    Returns:
+        None
+    """
+
+    def load_planner(*args: object, **kwargs: object) -> None:
+        raise AssertionError("The input files should not be loaded.")
+
+    monkeypatch.setattr(cli, "load_planner", load_planner)
+    monkeypatch.setattr(export, "parquet_engine_available", lambda: False)
+    result = CliRunner().invoke(cli.app, ["main", "--export-format", "parquet"])
+    assert result.exit_code == 2
+    assert "parquet extra" in result.output
+
+
+def test_main_history_flag() -> None:
+    """Test if main still takes the history flags without shadowing the history command.
+
+    Returns:
+        None
+    """
+    result = CliRunner().invoke(cli.app, ["main", "--help"])
+    assert "--no-history" in result.output
+    parameters = inspect.signature(cli.main).parameters
+    assert "record_history" in parameters and "history" not in parameters
@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+import pytest
+
+from scheduler.compiled import CompiledProblem, SharedArrays, run_compiled
+from scheduler.planner import SUCCEEDED, Planner
+from scheduler.simulator import Simulator
+
+
+def compile_planner(planner: Planner) -> CompiledProblem:
+    """Set the duty limits and blocks of a planner and compile its problem.
+
+    Args:
+        planner (Planner): The Planner instance to compile.
+
+    Returns:
+        CompiledProblem: The compiled problem.
+    """
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    return CompiledProblem.compile(planner)
+
+
+@pytest.mark.parametrize("time_rules", [False, True], ids=["blocks", "one_per_day"])
+def test_compiled_schedules_are_valid(planner: Planner, time_rules: bool) -> None:
+    """Test if the schedules of the kernel satisfy the hard constraints.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        time_rules (bool): Whether every proctor has at most one duty per day.
+
+    Returns:
+        None
+    """
+    if time_rules:
+        planner.set_time_rules([1, 2, 3], 0)
+    problem = compile_planner(planner)
+    exams = CompiledProblem.exam_order(planner)
+    exit_codes, assignments = run_compiled(problem, 20, seed=0)
+    assert (exit_codes == SUCCEEDED).any()
+    for assignment in assignments[exit_codes == SUCCEEDED]:
+        days: dict[int, list[str]] = {}
+        for exam, proctor_indices in zip(exams, assignment):
+            proctor_indices = proctor_indices[proctor_indices >= 0]
+            assert len(proctor_indices) == exam.number_of_proctors_needed
+            for index in proctor_indices:
+                assert planner.is_eligible(exam, planner.proctors[index])
+                days.setdefault(index, []).append(
+                    exam.date if time_rules else exam.block
+                )
+        assert all(len(set(dates)) == len(dates) for dates in days.values())
+
+
+def test_run_compiled_in_shared_memory(planner: Planner) -> None:
+    """Test if the workers sharing the problem find the same schedules as one process.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    problem = compile_planner(planner)
+    exit_codes, assignments = run_compiled(problem, 100, seed=1)
+    shared_exit_codes, shared_assignments = run_compiled(problem, 100, 1, workers=2)
+    np.testing.assert_array_equal(exit_codes, shared_exit_codes)
+    np.testing.assert_array_equal(assignments, shared_assignments)
+
+
+def test_shared_arrays_attach_without_copy() -> None:
+    """Test if attached shared arrays see the writes of each other.
+
+    Returns:
+        None
+    """
+    shared = SharedArrays.create({"results": np.zeros(3, dtype=np.int64)})
+    attached = SharedArrays.attach(shared.handle)
+    attached.arrays["results"][1] = 7
+    assert shared.arrays["results"].tolist() == [0, 7, 0]
+    attached.close()
+    shared.unlink()
+
+
+def test_simulate_compiled(planner: Planner) -> None:
+    """Test if the simulator finds a feasible schedule on the compiled problem.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    random.seed(0)
+    simulator = Simulator(planner, 20, compiled_workers=2)
+    simulator.simulate()
+    assert simulator.completed == 20
+    best = simulator.order_by_fairness()[0]
+    assert simulator.fairness_results[best][0] == 0
+    _, exams, _, _ = simulator.results[best]
+    assert all(len(exam.proctors) == exam.number_of_proctors_needed for exam in exams)
+    # The schedule is materialized again from the compiled problem
+    assert simulator.measure_fairness(best) == simulator.fairness_results[best]
+    with pytest.raises(ValueError):
+        simulator.simulate(resume=True)
@@ -48,3 +48,73 @@ def test_log_file_name_validation(
     else:
         config = YAMLConfig(**yaml_config_instance.dict())
         assert config.log_file_name == expected
+
+
+@pytest.mark.parametrize(
+    "fairness_metrics, expected",
+    [
+        (["spread", "not_preferred"], ["spread", "not_preferred"]),
+        ([], ValueError),
+        (["spread", "unknown_metric"], ValueError),
+        (["spread", "spread"], ValueError),
+    ],
+)
+def test_fairness_metrics_validation(
+    yaml_config_instance: YAMLConfig,
+    fairness_metrics: list[str],
+    expected: list[str] | type[Exception],
+) -> None:
+    """Test if fairness_metrics is validated correctly.
+
+    Args:
+        yaml_config_instance (YAMLConfig): A YAMLConfig instance to test.
+        fairness_metrics (list[str]): The fairness metrics to validate.
+        expected (list[str] | Type[Exception]): The expected result of the validation.
+
+    Returns:
+        None
+    """
+    yaml_config_instance.fairness_metrics = fairness_metrics
+
+    if not isinstance(expected, list):
+        with pytest.raises(expected):
+            YAMLConfig(**yaml_config_instance.dict())
+    else:
+        config = YAMLConfig(**yaml_config_instance.dict())
+        assert config.fairness_metrics == expected
+
+
+@pytest.mark.parametrize(
+    "exams_file, expected",
+    [
+        ("exams.xlsx", "exams.xlsx"),
+        ("exams.csv", "exams.csv"),
+        ("exams.parquet", "exams.parquet"),
+        ("exams.json", "exams.json"),
+        ("exams.txt", ValueError),
+        ("/exams.csv", ValueError),
+    ],
+)
+def test_file_validation(
+    yaml_config_instance: YAMLConfig,
+    exams_file: str,
+    expected: str | type[Exception],
+) -> None:
+    """Test if input files are validated correctly.
+
+    Args:
+        yaml_config_instance (YAMLConfig): A YAMLConfig instance to test.
+        exams_file (str): The exams file to validate.
+        expected (str | Type[Exception]): The expected result of the validation.
+
+    Returns:
+        None
+    """
+    yaml_config_instance.exams_file = exams_file
+
+    if not isinstance(expected, str):
+        with pytest.raises(expected):
+            YAMLConfig(**yaml_config_instance.dict())
+    else:
+        config = YAMLConfig(**yaml_config_instance.dict())
+        assert config.exams_file == expected
@@ -6,7 +6,9 @@ import pytest
 from typer.testing import CliRunner, Result
 
 from scheduler.config import YAMLConfig, YAMLConfigDict
+from scheduler.exam_proctor import Exam, Proctor
 from scheduler.path import CONFIG_DIR, LOGS_DIR, OUTPUTS_DIR, ROOT_DIR
+from scheduler.planner import Planner
 from scheduler.utils import init_logger
 
 # Path to the log file to be used for testing
@@ -57,6 +59,9 @@ def yaml_config_instance() -> YAMLConfig:
         "exams_file": "valid_exams.xlsx",
         "proctors_file": "valid_proctors.xlsx",
         "exams_file_for_proctor_numbers": "valid_exams_for_proctor_numbers.xlsx",
+        "fairness_metrics": ["spread", "first_year_std", "std", "not_preferred"],
+        "one_duty_per_day_classes": [],
+        "min_gap_minutes": 0,
     }
     return YAMLConfig(**config)
 
@@ -89,7 +94,7 @@ def main_with_default_values(
     """
     from scheduler.cli import app
 
-    result = CliRunner().invoke(app, [pytest_log_file.name])
+    result = CliRunner().invoke(app, ["main", pytest_log_file.name])
     yield result
 
 
@@ -115,7 +120,7 @@ def main_with_existing_log_file(
     option = request.param
 
     # Invoke the main function with the log file to be used for testing and the option
-    result = CliRunner().invoke(app, [pytest_log_file.name, option])
+    result = CliRunner().invoke(app, ["main", pytest_log_file.name, option])
 
     yield result, option
 
@@ -135,3 +140,39 @@ def main_with_help_option(
     result = CliRunner().invoke(app, ["--help"])
 
     yield result
+
+
+# Fixture for a small planner
+@pytest.fixture
+def planner() -> Planner:
+    """A fixture that provides a small Planner instance for testing.
+
+    This fixture creates six exams over three blocks and six proctors of all classes,
+    with a few unavailable and not preferred blocks. The fixture is used to provide a
+    Planner instance to the test functions.
+
+    Returns:
+        Planner: The Planner instance to use for testing.
+    """
+    exams = [
+        Exam("ECON 101", "2023-06-01", "09:00-11:00", "V-101", "Instructor A"),
+        Exam("ECON 102", "2023-06-01", "09:00-11:00", "A-201", "Instructor B"),
+        Exam("ECON 201", "2023-06-01", "13:00-15:00", "A-202", "Instructor C"),
+        Exam("ECON 503", "2023-06-02", "09:00-11:00", "A-203", "Instructor D"),
+        Exam("ECON 301", "2023-06-02", "09:00-11:00", "V-102", "Instructor E"),
+        Exam("ECON 302", "2023-06-02", "13:00-15:00", "A-204", "Instructor F"),
+    ]
+    for exam in exams:
+        exam.number_of_proctors_needed = 2 if "V-" in exam.classroom else 1
+    proctors = [
+        Proctor("Proctor A", "a@example.com", 0, 1),
+        Proctor("Proctor B", "b@example.com", 1, 1),
+        Proctor("Proctor C", "c@example.com", 0, 2),
+        Proctor("Proctor D", "d@example.com", 2, 2),
+        Proctor("Proctor E", "e@example.com", 0, 3),
+        Proctor("Proctor F", "f@example.com", 1, 3),
+    ]
+    proctors[0].unavailable.append("2023-06-01 09:00-11:00")
+    proctors[2].not_preferred.append("2023-06-02 13:00-15:00")
+    proctors[4].not_preferred.append("2023-06-01 13:00-15:00")
+    return Planner(exams, proctors)
@@ -0,0 +1,146 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from scheduler import distributed
+from scheduler.compiled import CompiledProblem
+from scheduler.distributed import (
+    claim_task,
+    heartbeat,
+    load_problem,
+    merge,
+    progress,
+    publish,
+    range_name,
+    requeue_stale,
+    work,
+)
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.planner import Planner
+
+
+def test_distributed_run_is_deterministic(planner: Planner, tmp_path: Path) -> None:
+    """Test if the merged results do not depend on how workers split the ranges.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary shared directory.
+
+    Returns:
+        None
+    """
+    one_worker, two_workers = tmp_path / "one", tmp_path / "two"
+    assert publish(planner, 20, DEFAULT_METRICS, 0, one_worker, task_size=5) == 4
+    assert work(one_worker) == 4
+
+    publish(planner, 20, DEFAULT_METRICS, 0, two_workers, task_size=5)
+    assert work(two_workers, "first", max_tasks=1) == 1
+    assert progress(two_workers) == (1, 4)
+    with pytest.raises(ValueError):
+        merge(two_workers)
+    assert work(two_workers, "second") == 3
+
+    expected, merged = merge(one_worker), merge(two_workers)
+    assert merged.completed == expected.completed == 20
+    assert merged.order_by_fairness() == expected.order_by_fairness()
+    assert merged.fairness_results == expected.fairness_results
+    best = merged.order_by_fairness()[0]
+    assert merged.fairness_results[best][0] == 0
+
+
+def test_requeue_stale(planner: Planner, tmp_path: Path) -> None:
+    """Test if a range claimed by a lost worker is requeued and claimed again.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary shared directory.
+
+    Returns:
+        None
+    """
+    publish(planner, 10, DEFAULT_METRICS, 0, tmp_path, task_size=10)
+    assert claim_task(tmp_path, "lost") == (1, 10)
+    assert claim_task(tmp_path, "other") is None
+    assert requeue_stale(tmp_path, 3600) == 0
+    assert requeue_stale(tmp_path, -1) == 1
+    assert work(tmp_path, "other") == 1
+    assert merge(tmp_path).completed == 10
+
+
+def test_problem_is_published_without_pickles(planner: Planner, tmp_path: Path) -> None:
+    """Test if the published problem is JSON and arrays and loads back the same problem.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary shared directory.
+
+    Returns:
+        None
+    """
+    publish(planner, 10, DEFAULT_METRICS, 0, tmp_path, task_size=10)
+    assert sorted(path.name for path in tmp_path.glob("problem.*")) == [
+        "problem.json",
+        "problem.npz",
+    ]
+    problem = load_problem(tmp_path)
+    loaded: Planner = problem["planner"]
+    assert loaded.fingerprint() == planner.fingerprint()
+    expected = CompiledProblem.compile(planner).arrays
+    assert problem["compiled"].arrays.keys() == expected.keys()
+    for name, array in expected.items():
+        np.testing.assert_array_equal(problem["compiled"].arrays[name], array)
+
+
+def test_claim_is_fresh_and_kept_alive(planner: Planner, tmp_path: Path) -> None:
+    """Test if a claim of a long published range is not stale and its heartbeat keeps it fresh.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary shared directory.
+
+    Returns:
+        None
+    """
+    publish(planner, 10, DEFAULT_METRICS, 0, tmp_path, task_size=10)
+    task = tmp_path / "tasks" / f"{range_name(1, 10)}.task"
+    os.utime(task, (0, 0))
+    assert claim_task(tmp_path, "slow") == (1, 10)
+    assert requeue_stale(tmp_path, 3600) == 0
+
+    claimed = tmp_path / "claimed" / f"{range_name(1, 10)}.task"
+    os.utime(claimed, (0, 0))
+    with heartbeat(claimed, interval=0.01):
+        time.sleep(0.1)
+    assert requeue_stale(tmp_path, 3600) == 0
+
+
+def test_claim_requeued_meanwhile(
+    planner: Planner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test if a claim requeued by another node right after the rename moves on to the next range.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary shared directory.
+        monkeypatch (pytest.MonkeyPatch): The fixture to requeue the claim during the claim.
+
+    Returns:
+        None
+    """
+    publish(planner, 10, DEFAULT_METRICS, 0, tmp_path, task_size=5)
+    utime = os.utime
+    requeued = []
+
+    def requeue_then_utime(path: Path) -> None:
+        if path.parent.name == "claimed" and not requeued:
+            requeued.append(path.name)
+            path.rename(tmp_path / "tasks" / path.name)
+        utime(path)
+
+    monkeypatch.setattr(distributed.os, "utime", requeue_then_utime)
+    assert claim_task(tmp_path, "worker") == (6, 10)
+    assert requeued == [f"{range_name(1, 5)}.task"]
+    assert (tmp_path / "tasks" / requeued[0]).exists()
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from scheduler.ensemble import Ensemble
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.metrics import make_metrics
+from scheduler.planner import Planner
+from scheduler.simulator import Simulator
+
+
+def test_ensemble(planner: Planner, tmp_path: Path) -> None:
+    """Test if the ensemble records every stored simulation and re-ranks them from disk.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the ensemble.
+
+    Returns:
+        None
+    """
+    ensemble = Ensemble.create(
+        planner.exams, planner.proctors, DEFAULT_METRICS, 30, tmp_path
+    )
+    simulator = Simulator(
+        planner,
+        30,
+        keep_best=2,
+        prune=False,
+        metrics=make_metrics(DEFAULT_METRICS),
+        ensemble=ensemble,
+    )
+    simulator.simulate()
+    # Only the best simulations are kept in memory
+    assert len(simulator.results) < 30
+
+    stored = Ensemble(tmp_path)
+    assert stored.recorded().tolist() == list(range(1, 31))
+    best = simulator.order_by_fairness()[0]
+    assert stored.order()[0] == best
+    assert stored.assignment(best) == {
+        exam.key: [proctor.name for proctor in exam.proctors]
+        for exam in simulator.results[best][1]
+    }
+    assert stored.order(["std"]).tolist() != []
+    with pytest.raises(ValueError):
+        stored.order(["unknown"])
+
+    frequency = stored.block_frequency()
+    assert frequency.shape == (len(planner.proctors), len(planner.blocks))
+    # Every exam gets its proctors in each successful simulation
+    successful = stored.fairness[stored.recorded(), 0] == 0
+    assert round(frequency.to_numpy().sum() * 30) >= successful.sum() * sum(
+        exam.number_of_proctors_needed for exam in planner.exams
+    )
+    assert np.all(frequency.to_numpy() <= 1)
+
+
+def test_ensemble_of_another_size(planner: Planner, tmp_path: Path) -> None:
+    """Test if reopening an ensemble for another number of simulations raises ValueError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the ensemble.
+
+    Returns:
+        None
+    """
+    Ensemble.create(planner.exams, planner.proctors, DEFAULT_METRICS, 30, tmp_path)
+    assert (
+        Ensemble(tmp_path, "r+", number_of_simulations=30).number_of_simulations == 30
+    )
+    with pytest.raises(ValueError):
+        Ensemble(tmp_path, "r+", number_of_simulations=50)
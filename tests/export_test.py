@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scheduler.assignment import get_assignment, read_assignment
+from scheduler.export import export_schedules
+from scheduler.planner import Planner
+from scheduler.simulator import Simulator
+
+
+@pytest.fixture
+def simulator(planner: Planner) -> Simulator:
+    """A fixture that provides a Simulator after a few simulations of the small planner.
+
+    Returns:
+        Simulator: The Simulator instance to use for testing.
+    """
+    simulator = Simulator(planner, 10)
+    simulator.simulate()
+    return simulator
+
+
+def test_export_schedules(simulator: Simulator, tmp_path: Path) -> None:
+    """Test if the fairest schedules are exported and the best can be read back.
+
+    Args:
+        simulator (Simulator): The Simulator instance to test.
+        tmp_path (Path): A temporary directory for the exported files.
+
+    Returns:
+        None
+    """
+    files = export_schedules(simulator, 3, ["xlsx", "csv"], tmp_path)
+    assert {file.name for file in files} == {
+        *[f"schedule_{rank}.xlsx" for rank in (1, 2, 3)],
+        *[f"schedule_{rank}_exams.csv" for rank in (1, 2, 3)],
+        *[f"schedule_{rank}_rosters.csv" for rank in (1, 2, 3)],
+        "summary.xlsx",
+        "summary_fairness.csv",
+    }
+
+    ranking = simulator.order_by_fairness()
+    _, exams, proctors, _ = simulator.results[ranking[0]]
+    assert read_assignment(tmp_path / "schedule_1.xlsx") == get_assignment(exams)
+
+    rosters = pd.read_excel(tmp_path / "schedule_1.xlsx", sheet_name="Rosters")
+    assert rosters["Exam_Title"].notna().sum() == sum(
+        len(proctor.duties) for proctor in proctors
+    )
+    assert set(rosters["Name"]) == {proctor.name for proctor in proctors}
+
+    summary = pd.read_csv(tmp_path / "summary_fairness.csv")
+    assert summary["Rank"].tolist() == [1, 2, 3]
+    assert summary["Simulation"].tolist() == ranking[:3]
+    assert list(summary.columns[3:]) == [metric.name for metric in simulator.metrics]
+
+
+def test_export_schedules_invalid_format(simulator: Simulator, tmp_path: Path) -> None:
+    """Test if exporting to an unknown format raises a ValueError.
+
+    Args:
+        simulator (Simulator): The Simulator instance to test.
+        tmp_path (Path): A temporary directory for the exported files.
+
+    Returns:
+        None
+    """
+    with pytest.raises(ValueError):
+        export_schedules(simulator, 1, ["docx"], tmp_path)
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from scheduler.assignment import get_assignment
+from scheduler.history import RunHistory
+from scheduler.planner import Planner
+from scheduler.simulator import Simulator
+
+
+def test_record_run_and_best_schedule(planner: Planner, tmp_path: Path) -> None:
+    """Test if recorded runs give back the best schedule ever found and the throughput.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the database.
+
+    Returns:
+        None
+    """
+    run_history = RunHistory(tmp_path / "history.sqlite3")
+    inputs_hash = planner.fingerprint()
+    names = [metric.name for metric in Simulator(planner, 0).metrics]
+    assert run_history.best_schedule(inputs_hash, names) is None
+
+    simulators = []
+    for number_of_simulations in (5, 10):
+        simulator = Simulator(planner, number_of_simulations)
+        simulator.simulate()
+        run_history.record_run(
+            simulator, inputs_hash, {"number_of_simulations": number_of_simulations}, 1
+        )
+        simulators.append(simulator)
+
+    best_fairness = min(
+        simulator.fairness_results[simulator.order_by_fairness()[0]]
+        for simulator in simulators
+    )
+    best = run_history.best_schedule(inputs_hash, names)
+    assert best is not None
+    run_id, fairness, assignment = best
+    simulator = simulators[run_id - 1]
+    assert fairness == tuple(float(value) for value in best_fairness[:-1])
+    assert assignment == get_assignment(simulator.results[best_fairness[-1]][1])
+
+    assert run_history.best_schedule("another problem", names) is None
+    throughput = run_history.throughput(inputs_hash)
+    assert [simulations for _, simulations, _ in throughput] == [5, 10]
+    run_history.close()
+
+
+def test_fingerprint(planner: Planner) -> None:
+    """Test if the fingerprint changes with the constraints but not with the order of proctors.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    fingerprint = planner.fingerprint()
+    planner.proctors.reverse()
+    assert planner.fingerprint() == fingerprint
+    planner.proctors[0].unavailable.append("2023-06-02 09:00-11:00")
+    assert planner.fingerprint() != fingerprint
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.metric_names import DEFAULT_METRICS, METRIC_NAMES
+from scheduler.metrics import (
+    METRICS,
+    FairnessBatch,
+    FairnessMetric,
+    make_metrics,
+)
+
+
+def test_metrics_evaluate() -> None:
+    """Test if metrics evaluate a batch of schedules from the duty counts of each block.
+
+    Returns:
+        None
+    """
+    spread, class_one_std, not_preferred, consecutive_days = make_metrics(
+        ["spread", "first_year_std", "not_preferred", "consecutive_days"]
+    )
+    exams = [
+        Exam("ECON 101", f"2023-06-0{day}", "09:00-11:00", "A-101", "Instructor")
+        for day in (1, 2, 4)
+    ]
+    proctors = [
+        Proctor(f"Proctor {name}", f"{name}@example.com", 0, proctor_class)
+        for name, proctor_class in (("A", 1), ("B", 2))
+    ]
+    proctors[0].not_preferred.append(exams[2].block)
+    for metric in (not_preferred, consecutive_days):
+        metric.prepare(exams, proctors)
+
+    # Proctor A has duties on days 1 and 2 in the first schedule, 1 and 4 in the second
+    duty_counts = np.zeros((2, 2, 3), dtype=int)
+    duty_counts[0, 0, [0, 1]] = 1
+    duty_counts[1, 0, [0, 2]] = 1
+    duty_counts[:, 1, 1] = 1
+    batch = FairnessBatch(duty_counts, np.array([0, 0]), np.array([1, 2]))
+    assert batch.total_duties.tolist() == [[2, 1], [2, 1]]
+    assert spread.evaluate(batch).tolist() == [1, 1]
+    assert class_one_std.evaluate(batch).tolist() == [0.0, 0.0]
+    assert not_preferred.evaluate(batch).tolist() == [0, 1]
+    assert consecutive_days.evaluate(batch).tolist() == [1, 0]
+
+
+def test_fairness_metric_is_abstract() -> None:
+    """Test if a metric without evaluate can not be made.
+
+    Returns:
+        None
+    """
+    with pytest.raises(TypeError):
+        FairnessMetric()  # type: ignore[abstract]
+
+
+def test_make_metrics_with_unknown_name() -> None:
+    """Test if making an unknown metric raises ValueError.
+
+    Returns:
+        None
+    """
+    with pytest.raises(ValueError):
+        make_metrics(["spread", "unknown_metric"])
+
+
+def test_metric_names_match_metrics() -> None:
+    """Test if every name the config accepts makes a metric, and the CLI loads without NumPy.
+
+    Returns:
+        None
+    """
+    assert tuple(METRICS) == METRIC_NAMES
+    assert set(DEFAULT_METRICS) <= set(METRIC_NAMES)
+    code = "import sys, scheduler.cli; assert 'numpy' not in sys.modules"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
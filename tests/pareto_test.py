@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from scheduler.pareto import ParetoFront, dominates
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        ((1, 0.5, 2), (1, 0.5, 3), True),
+        ((1, 0.5, 2), (1, 0.5, 2), False),
+        ((1, 0.4, 3), (1, 0.5, 2), False),
+        ((2, 0.5, 2), (1, 0.5, 2), False),
+    ],
+)
+def test_dominates(
+    first: tuple[float, ...], second: tuple[float, ...], expected: bool
+) -> None:
+    """Test if dominance between objectives is detected correctly.
+
+    Args:
+        first (tuple[float, ...]): The first objectives.
+        second (tuple[float, ...]): The second objectives.
+        expected (bool): Whether first dominates second.
+
+    Returns:
+        None
+    """
+    assert dominates(first, second) == expected
+
+
+def test_pareto_front_insert() -> None:
+    """Test if the front keeps exactly the non-dominated schedules, sorted by objectives.
+
+    Returns:
+        None
+    """
+    front = ParetoFront()
+    assert front.insert(1, (2, 0.5, 1))
+    assert front.insert(2, (1, 0.6, 3))
+    assert not front.insert(3, (2, 0.5, 1))  # equal to a member
+    assert not front.insert(4, (2, 0.7, 1))  # dominated by 1
+    assert front.insert(5, (1, 0.4, 3))  # dominates 2
+    assert front.insert(6, (3, 0.1, 0))
+    assert list(front.members) == [5, 1, 6]
+    assert 2 not in front
+    assert len(front) == 3
+
+
+def test_pareto_front_matches_brute_force() -> None:
+    """Test if inserting schedules one by one keeps the non-dominated ones of all of them.
+
+    Returns:
+        None
+    """
+    rng = random.Random(0)
+    schedules = {
+        sim_number: tuple(rng.randint(0, 5) for _ in range(3))
+        for sim_number in range(300)
+    }
+    front = ParetoFront()
+    for sim_number, objectives in schedules.items():
+        front.insert(sim_number, objectives)
+    expected = {}
+    for sim_number, objectives in schedules.items():
+        if objectives not in expected.values() and not any(
+            dominates(other, objectives) for other in schedules.values()
+        ):
+            expected[sim_number] = objectives
+    assert front.members == dict(sorted(expected.items(), key=lambda item: item[1]))
+    assert all(sim_number in front for sim_number in expected)
@@ -0,0 +1,117 @@
+from scheduler.assignment import get_assignment
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.planner import PRUNED, SUCCEEDED, Planner, simulation_rng
+
+
+def make_disjoint_planner() -> Planner:
+    """Make a planner whose two blocks share no eligible proctors.
+
+    Returns:
+        Planner: A Planner with two independent components.
+    """
+    exams = [
+        Exam("ECON 101", "2023-06-01", "09:00-11:00", "A-101", "Instructor A"),
+        Exam("ECON 102", "2023-06-02", "09:00-11:00", "A-102", "Instructor B"),
+    ]
+    for exam in exams:
+        exam.number_of_proctors_needed = 1
+    proctors = [
+        Proctor(f"Proctor {name}", f"{name}@example.com", 0, 1) for name in "ABCD"
+    ]
+    for proctor in proctors[:2]:
+        proctor.unavailable.append(exams[1].block)
+    for proctor in proctors[2:]:
+        proctor.unavailable.append(exams[0].block)
+    planner = Planner(exams, proctors)
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    return planner
+
+
+def test_set_components(planner: Planner) -> None:
+    """Test if connected components of the eligibility graph are detected.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    planner.set_components()
+    assert len(planner.components) == 1
+
+    disjoint_planner = make_disjoint_planner()
+    disjoint_planner.set_components()
+    assert len(disjoint_planner.components) == 2
+    for component in disjoint_planner.components:
+        assert len(component.exams) == 1
+        assert len(component.proctors) == 2
+        assert (
+            component.max_total_proctored_before
+            == disjoint_planner.max_total_proctored_before
+        )
+
+
+def test_schedule_components_in_parallel() -> None:
+    """Test if scheduling components in worker processes assigns every exam.
+
+    The components draw from generators seeded by the generator of the attempt, so
+    scheduling them in parallel or one after the other gives the same schedule.
+
+    Returns:
+        None
+    """
+    planner = make_disjoint_planner()
+    planner.set_components()
+    with planner.component_executor(2) as executor:
+        assert planner.schedule(executor=executor, rng=simulation_rng(0, 1)) == 0
+    for exam in planner.exams:
+        assert len(exam.proctors) == 1
+        assert exam.proctors[0] in planner.proctors
+        assert exam in exam.proctors[0].duties
+    in_parallel = get_assignment(planner.exams)
+    assert planner.schedule(rng=simulation_rng(0, 1)) == 0
+    assert get_assignment(planner.exams) == in_parallel
+
+
+def test_schedule_pruned_by_incumbent(planner: Planner) -> None:
+    """Test if a schedule is pruned by an incumbent that can not be beaten.
+
+    A spread of -1 can never be reached, so the schedule is aborted after the first block.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    assert planner.schedule(incumbent=(0, -1, 0.0, 0.0, 0, 1)) == PRUNED
+    assigned_exams = [exam for exam in planner.exams if exam.proctors]
+    assert 0 < len(assigned_exams) < len(planner.exams)
+
+    # A failed incumbent never prunes
+    assert planner.schedule(incumbent=(1, -1, 0.0, 0.0, 0, 1)) == SUCCEEDED
+
+
+def test_one_duty_per_day(planner: Planner) -> None:
+    """Test if proctors of the restricted classes never get two duties on the same day.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    planner.set_time_rules([1, 2, 3], 0)
+    planner.set_min_max_duties()
+    planner.set_blocks()
+    for try_number in range(1, 21):
+        if planner.schedule(try_number) != SUCCEEDED:
+            continue
+        for proctor in planner.proctors:
+            days = [duty.date for duty in proctor.duties]
+            assert len(days) == len(set(days))
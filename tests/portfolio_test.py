@@ -0,0 +1,72 @@
+import pytest
+
+from scheduler.exam_proctor import Exam, Proctor
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.planner import Planner
+from scheduler.portfolio import STRATEGIES, run_portfolio, run_strategy
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_run_strategy(planner: Planner, strategy: str) -> None:
+    """Test if each strategy finds a feasible schedule within its time budget.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        strategy (str): The name of the strategy.
+
+    Returns:
+        None
+    """
+    result = run_strategy(planner, strategy, DEFAULT_METRICS, 0.2, seed=0)
+    assert result.strategy == strategy
+    assert result.attempts > 0
+    assert result.fairness is not None and result.fairness[0] == 0
+    assert result.assignment is not None
+    assert all(
+        len(result.assignment[exam.key]) == exam.number_of_proctors_needed
+        for exam in planner.exams
+    )
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_run_strategy_on_infeasible_problem(strategy: str) -> None:
+    """Test if a strategy keeps no failed attempt as its best schedule.
+
+    Args:
+        strategy (str): The name of the strategy.
+
+    Returns:
+        None
+    """
+    exam = Exam("ECON 101", "2023-06-01", "09:00-11:00", "A-101", "Instructor A")
+    exam.number_of_proctors_needed = 3
+    proctors = [
+        Proctor(f"Proctor {name}", f"{name}@example.com", 0, 1) for name in "AB"
+    ]
+    result = run_strategy(
+        Planner([exam], proctors), strategy, DEFAULT_METRICS, 0.1, seed=0
+    )
+    assert result.attempts > 0
+    assert result.failed == result.attempts
+    assert result.fairness is None and result.assignment is None
+
+
+def test_run_portfolio(planner: Planner) -> None:
+    """Test if the portfolio ranks the strategies by their best schedule.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    results = run_portfolio(planner, DEFAULT_METRICS, 0.5, ["uniform", "compiled"])
+    assert sorted(result.strategy for result in results) == ["compiled", "uniform"]
+    assert results[0].fairness is not None
+    assert results[0].fairness[:-1] <= results[1].fairness[:-1]
+    # The planner of the caller is left unscheduled
+    assert all(not exam.proctors for exam in planner.exams)
+    with pytest.raises(ValueError):
+        run_portfolio(planner, DEFAULT_METRICS, 0.1, ["exact"])
+    with pytest.raises(ValueError, match="at least one strategy"):
+        run_portfolio(planner, DEFAULT_METRICS, 0.1, [])
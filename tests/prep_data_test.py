@@ -0,0 +1,213 @@
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from scheduler import prep_data
+from scheduler.config import YAMLConfig
+from scheduler.prep_data import (
+    Parser,
+    Prepper,
+    build_planner,
+    read_excel_chunks,
+    read_table,
+)
+
+
+@pytest.fixture
+def input_excels(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, yaml_config_instance: YAMLConfig
+) -> YAMLConfig:
+    """A fixture that writes small exams and proctors Excel files into a temporary inputs directory.
+
+    The exams file has an exam with multiple instructors, whose extra rows only have the
+    instructor filled in.
+
+    Returns:
+        YAMLConfig: The YAMLConfig instance pointing to the Excel files.
+    """
+    monkeypatch.setattr(prep_data, "INPUTS_DIR", tmp_path)
+    exams = openpyxl.Workbook()
+    sheet = exams.active
+    sheet.append(
+        [
+            "No",
+            "Course Code",
+            "Exam Title",
+            "Exam Date",
+            "Reserved Slots",
+            "Classrooms",
+            "Instructors",
+        ]
+    )
+    sheet.append(
+        [1, "ECON", "ECON 101", datetime(2023, 6, 1), "09:00-11:00", "V-101|A-201", "A"]
+    )
+    sheet.append([None, None, None, None, None, None, "B"])
+    sheet.append([None, None, None, None, None, None, "C"])
+    sheet.append(
+        [2, "ECON", "ECON 201", datetime(2023, 6, 2), "13:00-15:00", "A-202", "D"]
+    )
+    sheet.append([3, "ECON", "ECON 301", None, "09:00-11:00", "A-203", "E"])
+    exams.save(tmp_path / yaml_config_instance.exams_file)
+
+    proctors = openpyxl.Workbook()
+    sheet = proctors.active
+    sheet.append(["Name", "Email", "Total Proctored Before", "Proctor Class"])
+    for i in range(5):
+        sheet.append([f"Proctor {i}", f"{i}@example.com", i, i % 3 + 1])
+    proctors.save(tmp_path / yaml_config_instance.proctors_file)
+    return yaml_config_instance
+
+
+def test_read_excel_chunks(input_excels: YAMLConfig) -> None:
+    """Test that Excel files are read in chunks of at most the chunk size."""
+    chunks = list(
+        read_excel_chunks(prep_data.INPUTS_DIR / input_excels.proctors_file, 2)
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert list(chunks[0].columns)[0] == "Name"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4])
+def test_parse_chunks(input_excels: YAMLConfig, chunk_size: int) -> None:
+    """Test that streaming the Excel files in chunks parses the same exams and proctors."""
+    exams, proctors = Parser(input_excels).parse()
+    streamed_exams, streamed_proctors = Parser(input_excels, chunk_size).parse()
+
+    assert [vars(exam) for exam in streamed_exams] == [vars(exam) for exam in exams]
+    assert [vars(proctor) for proctor in streamed_proctors] == [
+        vars(proctor) for proctor in proctors
+    ]
+    assert exams[0].instructor == "A, B, C"
+    assert exams[-1].date == exams[-2].date == "2023-06-02"
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".json", ".parquet"])
+@pytest.mark.parametrize("chunk_size", [0, 2])
+def test_parse_other_formats(
+    input_excels: YAMLConfig, suffix: str, chunk_size: int
+) -> None:
+    """Test that CSV, JSON and Parquet input files parse the same as Excel files."""
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    exams, proctors = Parser(input_excels).parse()
+
+    config = input_excels.copy()
+    for field in ("exams_file", "proctors_file"):
+        table = read_table(prep_data.INPUTS_DIR / getattr(input_excels, field))
+        file = Path(getattr(input_excels, field)).with_suffix(suffix).name
+        if suffix == ".csv":
+            table.to_csv(prep_data.INPUTS_DIR / file, index=False)
+        elif suffix == ".json":
+            # JSON has no date type, dates are written as ISO strings
+            if "Exam Date" in table:
+                table["Exam Date"] = table["Exam Date"].dt.strftime("%Y-%m-%d")
+            table.to_json(prep_data.INPUTS_DIR / file, orient="records")
+        else:
+            table.to_parquet(prep_data.INPUTS_DIR / file)
+        setattr(config, field, file)
+    other_exams, other_proctors = Parser(config, chunk_size).parse()
+
+    assert [vars(exam) for exam in other_exams] == [vars(exam) for exam in exams]
+    assert [vars(proctor) for proctor in other_proctors] == [
+        vars(proctor) for proctor in proctors
+    ]
+
+
+def test_read_table_invalid_format(tmp_path: Path) -> None:
+    """Test that reading an unsupported input file format raises a ValueError."""
+    with pytest.raises(ValueError):
+        read_table(tmp_path / "exams.txt")
+
+
+def write_constraints(config: YAMLConfig) -> None:
+    """Add unavailability, preferences and proctor numbers to the input files of a config."""
+    exams, _ = Parser(config).parse()
+    blocks = sorted({exam.block for exam in exams})
+    proctors_file = prep_data.INPUTS_DIR / config.proctors_file
+    constraints = read_table(proctors_file)
+    for j, block in enumerate(blocks):
+        constraints[block] = [(i + j) % 3 for i in range(len(constraints))]
+    constraints.to_excel(proctors_file, index=False)
+    pd.DataFrame(
+        {
+            "Exam_Title": [exam.title for exam in exams],
+            "Classroom": [exam.classroom for exam in exams],
+            "Number_of_Proctors_Needed": [2, 1, 1, 1],
+            "Requires_Specific_Proctor": [None, "Proctor 1", None, None],
+        }
+    ).to_excel(
+        prep_data.INPUTS_DIR / config.exams_file_for_proctor_numbers,
+        index=False,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_prepare_chunks(
+    input_excels: YAMLConfig, monkeypatch: pytest.MonkeyPatch, chunk_size: int
+) -> None:
+    """Test that streaming the constraint files in chunks prepares the same problem."""
+    write_constraints(input_excels)
+    prepared = []
+    for size in (0, chunk_size):
+        exams, proctors = Parser(input_excels).parse()
+        prepper = Prepper(exams, proctors, input_excels, size)
+        if size:
+            # Streaming never reads a whole file
+            monkeypatch.setattr(prep_data, "read_table", None)
+        prepper.prepare(auto_add=False)
+        prepared.append(
+            (
+                [
+                    (
+                        exam.number_of_proctors_needed,
+                        [proctor.name for proctor in exam.requires_specific_proctor],
+                    )
+                    for exam in exams
+                ],
+                [(proctor.unavailable, proctor.not_preferred) for proctor in proctors],
+            )
+        )
+    assert prepared[0] == prepared[1]
+    assert prepared[0][0][1] == (1, ["Proctor 1"])
+
+
+def test_specific_proctors_with_missing_values(input_excels: YAMLConfig) -> None:
+    """Test that exams without a specific proctor are skipped, whatever pandas reads for them."""
+    exams, proctors = Parser(input_excels).parse()
+    df = pd.DataFrame(
+        {
+            "Exam_Title": [exam.title for exam in exams],
+            "Classroom": [exam.classroom for exam in exams],
+            "Requires_Specific_Proctor": [
+                None,
+                "Proctor 1, Proctor 2",
+                float("nan"),
+                pd.NA,
+            ],
+        }
+    )
+    exams[1].number_of_proctors_needed = 2
+    Prepper(exams, proctors, input_excels).manually_add_specific_proctors(df)
+    assert [
+        [proctor.name for proctor in exam.requires_specific_proctor] for exam in exams
+    ] == [[], ["Proctor 1", "Proctor 2"], [], []]
+
+
+def test_build_planner(input_excels: YAMLConfig) -> None:
+    """Test that the pipeline builds the planner of the parsed problem and times its phases."""
+    write_constraints(input_excels)
+    timings: dict[str, float] = {}
+    planner = build_planner(input_excels, timings=timings)
+    exams, proctors = Parser(input_excels).parse()
+    assert [exam.title for exam in planner.exams] == [exam.title for exam in exams]
+    assert [proctor.name for proctor in planner.proctors] == [
+        proctor.name for proctor in proctors
+    ]
+    assert planner.one_duty_per_day_classes == set(
+        input_excels.one_duty_per_day_classes
+    )
+    assert sorted(timings) == ["parse", "prepare"]
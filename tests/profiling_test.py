@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from scheduler.planner import Planner
+from scheduler.profiling import RunProfiler
+from scheduler.simulator import Simulator
+
+
+def test_run_profiler(planner: Planner, tmp_path: Path) -> None:
+    """Test if each phase writes its CPU profile and memory report.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the profile files.
+
+    Returns:
+        None
+    """
+    profiler = RunProfiler("run", tmp_path)
+    with profiler.phase("simulate"):
+        Simulator(planner, 5).simulate()
+    with profiler.phase("fairness"):
+        sum(range(1000))
+
+    assert list(profiler.phases) == ["simulate", "fairness"]
+    for phase in profiler.phases:
+        assert (tmp_path / f"run_{phase}.prof").exists()
+        memory = (tmp_path / f"run_{phase}_memory.txt").read_text()
+        assert memory.startswith(f"Peak traced memory of {phase}")
+    hot_spots = profiler.hot_spots(5)
+    assert len(hot_spots) == 5
+    assert (tmp_path / "run.prof").exists()
+
+
+def test_disabled_run_profiler(tmp_path: Path) -> None:
+    """Test if a disabled profiler writes nothing.
+
+    Args:
+        tmp_path (Path): A temporary directory for the profile files.
+
+    Returns:
+        None
+    """
+    profiler = RunProfiler("run", tmp_path, enabled=False)
+    with profiler.phase("parse"):
+        pass
+    assert profiler.phases == {}
+    assert profiler.hot_spots() == []
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from scheduler.assignment import get_assignment
+from scheduler.planner import Planner
+from scheduler.repair import Repairer
+from scheduler.simulator import Simulator
+
+
+@pytest.fixture
+def scheduled_planner(planner: Planner) -> Planner:
+    """A fixture that provides the small planner with a feasible schedule applied.
+
+    Args:
+        planner (Planner): The Planner instance to schedule.
+
+    Returns:
+        Planner: The scheduled Planner instance.
+    """
+    random.seed(0)
+    simulator = Simulator(planner, 20)
+    simulator.simulate()
+    simulator.measure_fairness_all()
+    _, exams, _, _ = simulator.results[simulator.order_by_fairness()[0]]
+    Repairer(planner, get_assignment(exams)).repair()
+    return planner
+
+
+def test_repair_unavailable_proctor(scheduled_planner: Planner) -> None:
+    """Test if a proctor made unavailable is replaced and other assignments are kept.
+
+    Args:
+        scheduled_planner (Planner): The scheduled Planner instance to test.
+
+    Returns:
+        None
+    """
+    before = get_assignment(scheduled_planner.exams)
+    exam = next(exam for exam in scheduled_planner.exams if exam.title == "ECON 302")
+    dropped = exam.proctors[0]
+
+    repairer = Repairer(scheduled_planner, before)
+    repairer.apply_delta(f"unavailable:{dropped.name}|{exam.block}")
+    assert repairer.repair() == 0
+
+    after = repairer.get_assignment()
+    assert dropped.name not in after[exam.key]
+    assert len(after[exam.key]) == exam.number_of_proctors_needed
+    changed = [key for key in before if before[key] != after[key]]
+    assert changed == [exam.key]
+
+
+@pytest.mark.parametrize(
+    "delta",
+    ["unknown:ECON 101|V-101", "remove:ECON 101", "proctors:ECON 999|A-101|1"],
+)
+def test_invalid_delta(planner: Planner, delta: str) -> None:
+    """Test if invalid deltas raise ValueError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        delta (str): The invalid delta.
+
+    Returns:
+        None
+    """
+    with pytest.raises(ValueError):
+        Repairer(planner, {}).apply_delta(delta)
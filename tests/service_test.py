@@ -0,0 +1,130 @@
+import json
+import random
+import threading
+from collections.abc import Generator
+from http.client import HTTPConnection
+from typing import Any
+
+import pytest
+
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.metrics import make_metrics
+from scheduler.planner import Planner
+from scheduler.service import SchedulerServer, SchedulerService
+
+
+@pytest.fixture
+def server(planner: Planner) -> Generator[SchedulerServer, None, None]:
+    """A fixture that serves the small planner on a free local port in a thread.
+
+    The fixture is used as a yield fixture that shuts the server down after the test.
+    """
+    server = SchedulerServer(
+        SchedulerService(planner, make_metrics(DEFAULT_METRICS)), "127.0.0.1", 0
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def request(
+    server: SchedulerServer, method: str, path: str, body: Any = None
+) -> tuple[int, dict[str, Any]]:
+    """Send a request to the server and decode its JSON response.
+
+    Returns:
+        tuple[int, dict[str, Any]]: The status and the body of the response.
+    """
+    connection = HTTPConnection("127.0.0.1", server.server_port)
+    connection.request(method, path, None if body is None else json.dumps(body))
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def test_solve_resolve_and_score(server: SchedulerServer) -> None:
+    """Test if the service solves, repairs and scores schedules of the warm problem.
+
+    Args:
+        server (SchedulerServer): The server to test.
+
+    Returns:
+        None
+    """
+    status, health = request(server, "GET", "/health")
+    assert status == 200 and health["exams"] == 6
+
+    status, solved = request(
+        server, "POST", "/solve", {"number_of_simulations": 10, "seed": 0}
+    )
+    assert status == 200
+    assert solved["fairness"][0] == 0
+
+    status, scored = request(server, "POST", "/score", {"schedule": solved["schedule"]})
+    assert status == 200
+    assert scored == {
+        "fairness": solved["fairness"],
+        "violations": [],
+        "complete": True,
+    }
+
+    exam = next(exam for exam in solved["schedule"] if exam["title"] == "ECON 302")
+    delta = f"unavailable:{exam['proctors'][0]}|2023-06-02 13:00-15:00"
+    status, resolved = request(server, "POST", "/resolve", {"deltas": [delta]})
+    assert status == 200
+    assert resolved["succeeded"]
+    repaired = next(
+        exam for exam in resolved["schedule"] if exam["title"] == "ECON 302"
+    )
+    assert exam["proctors"][0] not in repaired["proctors"]
+
+
+def test_seeded_solve_keeps_the_global_random_state(server: SchedulerServer) -> None:
+    """Test if a seeded solve is reproducible without seeding the random module of the service.
+
+    Args:
+        server (SchedulerServer): The server to test.
+
+    Returns:
+        None
+    """
+    state = random.getstate()
+    body = {"number_of_simulations": 10, "seed": 3}
+    first, second = request(server, "POST", "/solve", body), request(
+        server, "POST", "/solve", body
+    )
+    assert first == second
+    assert random.getstate() == state
+
+
+def test_invalid_requests(server: SchedulerServer) -> None:
+    """Test if invalid requests get an error response instead of stopping the service.
+
+    Args:
+        server (SchedulerServer): The server to test.
+
+    Returns:
+        None
+    """
+    assert request(server, "POST", "/resolve", {"deltas": []})[0] == 400
+    assert (
+        request(server, "POST", "/resolve", {"deltas": ["bad"], "schedule": []})[0]
+        == 400
+    )
+    assert request(server, "POST", "/score", {"schedule": [{"title": "x"}]})[0] == 400
+    assert request(server, "POST", "/solve", {"number_of_simulations": 0})[0] == 400
+    for body in (
+        {"number_of_simulations": None},
+        {"number_of_simulations": "10"},
+        {"seed": [1]},
+    ):
+        status, error = request(server, "POST", "/solve", body)
+        assert status == 400 and "should be of type int" in error["error"]
+    for deltas in (5, [5]):
+        assert request(server, "POST", "/resolve", {"deltas": deltas})[0] == 400
+    assert request(server, "POST", "/unknown", {})[0] == 404
+    assert request(server, "GET", "/health")[0] == 200
@@ -0,0 +1,318 @@
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from scheduler import simulator as simulator_module
+from scheduler.assignment import get_assignment
+from scheduler.ensemble import Ensemble
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.planner import Planner
+from scheduler.simulator import Simulator
+from scheduler.utils import standard_deviation
+
+
+def test_simulate_finds_feasible_schedule(planner: Planner) -> None:
+    """Test if the simulator finds a feasible schedule for the small planner.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    simulator = Simulator(planner, 20)
+    simulator.simulate()
+    simulator.measure_fairness_all()
+    best = simulator.order_by_fairness()[0]
+    assert simulator.fairness_results[best][0] == 0
+    _, exams, _, _ = simulator.results[best]
+    assert all(len(exam.proctors) == exam.number_of_proctors_needed for exam in exams)
+
+
+def test_checkpoint_and_resume(planner: Planner, tmp_path: Path) -> None:
+    """Test if resuming from a checkpoint continues the simulations where they stopped.
+
+    A run interrupted after a checkpoint and resumed should end up with the same best
+    simulations as an uninterrupted run with the same seed.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    checkpoint_file = tmp_path / "checkpoint.pickle"
+
+    random.seed(0)
+    uninterrupted = Simulator(
+        planner, 20, checkpoint_interval=10, checkpoint_file=checkpoint_file
+    )
+    uninterrupted.simulate()
+    uninterrupted.measure_fairness_all()
+
+    random.seed(0)
+    interrupted = Simulator(
+        planner, 10, checkpoint_interval=10, checkpoint_file=checkpoint_file
+    )
+    interrupted.simulate()
+    random.seed(1)  # the resumed run must restore the seed of the run itself
+    resumed = Simulator(
+        planner, 20, checkpoint_interval=10, checkpoint_file=checkpoint_file
+    )
+    resumed.simulate(resume=True)
+    resumed.measure_fairness_all()
+
+    assert resumed.order_by_fairness() == uninterrupted.order_by_fairness()
+
+
+def test_materialize_schedules_of_the_run(planner: Planner, tmp_path: Path) -> None:
+    """Test if the stored simulations are scheduled again exactly as in the run.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the ensemble.
+
+    Returns:
+        None
+    """
+    ensemble = Ensemble.create(
+        planner.exams, planner.proctors, DEFAULT_METRICS, 20, tmp_path
+    )
+    simulator = Simulator(
+        planner, 20, keep_best=20, prune=False, ensemble=ensemble, seed=7
+    )
+    simulator.simulate()
+    # Only exit codes are stored until a schedule is looked up
+    assert len(simulator.results) == 20
+    assert simulator.results.materialized == {}
+    for sim_number in simulator.results:
+        assert (
+            simulator.measure_fairness(sim_number)
+            == simulator.fairness_results[sim_number]
+        )
+        assert get_assignment(simulator.results[sim_number][1]) == ensemble.assignment(
+            sim_number
+        )
+
+    same_seed = Simulator(planner, 20, seed=7)
+    same_seed.simulate()
+    best = simulator.order_by_fairness()[0]
+    assert same_seed.order_by_fairness()[0] == best
+    assert same_seed.results[best][0] == simulator.results[best][0]
+
+
+def test_checkpoints_keep_the_best_schedules(planner: Planner, tmp_path: Path) -> None:
+    """Test if trimming the results at checkpoints keeps the `keep_best` fairest schedules.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    untrimmed = Simulator(planner, 60, seed=0)
+    untrimmed.simulate()
+    trimmed = Simulator(
+        planner,
+        60,
+        seed=0,
+        keep_best=15,
+        checkpoint_interval=10,
+        checkpoint_file=tmp_path / "checkpoint.pickle",
+    )
+    trimmed.simulate()
+    assert trimmed.order_by_fairness()[:15] == untrimmed.order_by_fairness()[:15]
+
+
+def test_resume_checkpoint_without_seed(planner: Planner, tmp_path: Path) -> None:
+    """Test if resuming from a checkpoint saved without a seed raises ValueError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    checkpoint_file = tmp_path / "checkpoint.pickle"
+    simulator = Simulator(
+        planner, 10, checkpoint_interval=10, checkpoint_file=checkpoint_file
+    )
+    simulator.simulate()
+    with open(checkpoint_file, "rb") as file:
+        checkpoint = pickle.load(file)
+    del checkpoint["seed"]
+    with open(checkpoint_file, "wb") as file:
+        pickle.dump(checkpoint, file)
+    with pytest.raises(ValueError):
+        Simulator(planner, 20, checkpoint_file=checkpoint_file).simulate(resume=True)
+
+
+def test_resume_checkpoint_of_changed_problem(planner: Planner, tmp_path: Path) -> None:
+    """Test if resuming after a change to the constraints of the problem raises ValueError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    checkpoint_file = tmp_path / "checkpoint.pickle"
+    simulator = Simulator(
+        planner, 10, checkpoint_interval=10, checkpoint_file=checkpoint_file
+    )
+    simulator.simulate()
+    planner.proctors[0].unavailable.append(planner.exams[0].block)
+    with pytest.raises(ValueError):
+        Simulator(planner, 20, checkpoint_file=checkpoint_file).simulate(resume=True)
+
+
+def test_resume_restores_counters_and_checks_seed_schedule(
+    planner: Planner, tmp_path: Path
+) -> None:
+    """Test if a resumed run counts the simulations before the checkpoint and keeps its seed schedule.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    checkpoint_file = tmp_path / "checkpoint.pickle"
+    simulator = Simulator(
+        planner, 10, checkpoint_interval=10, checkpoint_file=checkpoint_file, seed=0
+    )
+    simulator.simulate()
+    _, exams, _, _ = simulator.results[simulator.order_by_fairness()[0]]
+
+    resumed = Simulator(planner, 20, checkpoint_file=checkpoint_file)
+    resumed.simulate(resume=True)
+    assert resumed.completed == 20
+    assert resumed.failed >= simulator.failed
+
+    with pytest.raises(ValueError):
+        Simulator(
+            planner,
+            20,
+            checkpoint_file=checkpoint_file,
+            seed_assignment=get_assignment(exams),
+        ).simulate(resume=True)
+
+
+def test_resume_without_checkpoint(planner: Planner, tmp_path: Path) -> None:
+    """Test if resuming without a checkpoint raises FileNotFoundError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        tmp_path (Path): A temporary directory for the checkpoint file.
+
+    Returns:
+        None
+    """
+    simulator = Simulator(planner, 5, checkpoint_file=tmp_path / "missing.pickle")
+    with pytest.raises(FileNotFoundError):
+        simulator.simulate(resume=True)
+
+
+def test_warm_start_from_seed(planner: Planner) -> None:
+    """Test if a seed assignment is evaluated first as simulation 0 and becomes the incumbent.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    simulator = Simulator(planner, 20, seed=0)
+    simulator.simulate()
+    best = simulator.order_by_fairness()[0]
+    _, exams, _, _ = simulator.results[best]
+    seed_assignment = get_assignment(exams)
+
+    warm_simulator = Simulator(planner, 5, seed=0, seed_assignment=seed_assignment)
+    warm_simulator.simulate()
+    exit_code, seed_exams, _, _ = warm_simulator.results[0]
+    # The seed still fits the problem, so simulation 0 is the seed schedule unrepaired
+    assert exit_code == 0
+    assert get_assignment(seed_exams) == seed_assignment
+    assert (
+        warm_simulator.fairness_results[0][:-1] == simulator.fairness_results[best][:-1]
+    )
+    # Simulation 0 ranks after the strictly fairer schedules only, winning all its ties
+    seed_fairness = warm_simulator.fairness_results[0][:-1]
+    fairer = [
+        sim_number
+        for sim_number, fairness in warm_simulator.fairness_results.items()
+        if fairness[:-1] < seed_fairness
+    ]
+    order = warm_simulator.order_by_fairness()
+    assert order.index(0) == len(fairer)
+    assert sorted(order[: len(fairer)]) == sorted(fairer)
+    assert warm_simulator.incumbent == warm_simulator.fairness_results[order[0]]
+
+
+def test_early_stopping(planner: Planner) -> None:
+    """Test if the simulations stop once the best schedule stops improving.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    simulator = Simulator(planner, 1000, patience=5)
+    simulator.simulate()
+    assert len(simulator.results) < 1000
+
+
+def test_batched_fairness_matches_per_schedule_fairness(
+    planner: Planner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test if fairness measured in batches matches a plain Python measure of each schedule.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        monkeypatch (pytest.MonkeyPatch): The fixture to shrink the batches.
+
+    Returns:
+        None
+    """
+    # Batches that do not divide the number of simulations
+    monkeypatch.setattr(simulator_module, "FAIRNESS_BATCH_SIZE", 7)
+    simulator = Simulator(planner, 30, prune=False, seed=3)
+    simulator.simulate()
+    assert not simulator.pending
+    assert len(simulator.fairness_results) == 30
+
+    for sim_number in simulator.results:
+        exit_code, _, proctors, _ = simulator.results[sim_number]
+        total_duties = [
+            proctor.total_proctored_before + len(proctor.duties) for proctor in proctors
+        ]
+        expected = (
+            int(exit_code != 0),
+            max(total_duties) - min(total_duties),
+            standard_deviation(
+                [
+                    total
+                    for total, proctor in zip(total_duties, proctors)
+                    if proctor.proctor_class == 1
+                ]
+            ),
+            standard_deviation(total_duties),
+            sum(
+                any(duty.block in proctor.not_preferred for duty in proctor.duties)
+                for proctor in proctors
+            ),
+            sim_number,
+        )
+        assert simulator.fairness_results[sim_number] == pytest.approx(expected)
+    assert simulator.order_by_fairness() == [
+        fairness[-1] for fairness in sorted(simulator.fairness_results.values())
+    ]
@@ -0,0 +1,66 @@
+import io
+
+import numpy as np
+import pytest
+from rich.console import Console
+
+from scheduler import compiled
+from scheduler.planner import FAILED, Planner
+from scheduler.simulator import Simulator
+from scheduler.telemetry import ProgressMonitor
+
+
+def test_progress_monitor(planner: Planner) -> None:
+    """Test if the monitor reads the counters of the simulator and renders them.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    output = io.StringIO()
+    simulator = Simulator(planner, 20, prune=False)
+    monitor = ProgressMonitor(simulator, console=Console(file=output, width=200))
+    assert monitor.snapshot()["success_rate"] is None
+    assert "best -" in monitor.render().plain
+    with monitor:
+        simulator.simulate()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["completed"] == snapshot["total"] == 20
+    assert snapshot["seconds_left"] == 0
+    assert snapshot["success_rate"] == (20 - simulator.failed) / 20
+    assert "Simulations 20/20" in output.getvalue()
+    assert "spread=" in output.getvalue()
+
+
+def test_progress_of_compiled_runs(
+    planner: Planner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test if the counters of a run on the compiled problem advance as each range finishes.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        monkeypatch (pytest.MonkeyPatch): The fixture to shrink the ranges.
+
+    Returns:
+        None
+    """
+    monkeypatch.setattr(compiled, "TASK_SIZE", 5)
+    simulator = Simulator(planner, 20, compiled_workers=1, seed=0)
+    monitor = ProgressMonitor(simulator)
+    snapshots = []
+    count_compiled_task = simulator.count_compiled_task
+
+    def count_and_snapshot(exit_codes: np.ndarray) -> None:
+        count_compiled_task(exit_codes)
+        snapshots.append(monitor.snapshot())
+
+    monkeypatch.setattr(simulator, "count_compiled_task", count_and_snapshot)
+    simulator.simulate()
+    assert [snapshot["completed"] for snapshot in snapshots] == [5, 10, 15, 20]
+    assert snapshots[0]["seconds_left"] is not None
+    assert simulator.failed == sum(
+        exit_code == FAILED for exit_code, *_ in simulator.results.values()
+    )
@@ -0,0 +1,74 @@
+import pytest
+
+from scheduler.timetable import Timetable, parse_block
+
+BLOCKS = [
+    "2023-06-01 09:00-11:00",
+    "2023-06-01 11:30-13:30",
+    "2023-06-01 15:00-17:00",
+    "2023-06-02 09:00-11:00",
+]
+
+
+@pytest.mark.parametrize(
+    "block, expected",
+    [
+        ("2023-06-01 09:00-11:00", (738672, 540, 660)),
+        ("2023-06-01 9.30 - 11.00", (738672, 570, 660)),
+        ("2023-06-01 13:00", (738672, 780, 780)),
+        ("2023-06-01", ValueError),
+        ("01/06/2023 09:00-11:00", ValueError),
+    ],
+)
+def test_parse_block(
+    block: str, expected: tuple[int, int, int] | type[Exception]
+) -> None:
+    """Test if blocks are parsed into days and start and end minutes.
+
+    Args:
+        block (str): The block to parse.
+        expected (tuple[int, int, int] | type[Exception]): The expected result of the parsing.
+
+    Returns:
+        None
+    """
+    if not isinstance(expected, tuple):
+        with pytest.raises(expected):
+            parse_block(block)
+    else:
+        assert parse_block(block) == expected
+
+
+def test_timetable_indices() -> None:
+    """Test if blocks get integer day and slot indices.
+
+    Returns:
+        None
+    """
+    timetable = Timetable(BLOCKS)
+    assert timetable.days == [0, 0, 0, 1]
+    assert timetable.slots == [0, 1, 2, 0]
+
+
+@pytest.mark.parametrize(
+    "same_day, min_gap_minutes, expected",
+    [
+        (False, 0, [[0], [1], [2], [3]]),
+        (False, 60, [[0, 1], [0, 1], [2], [3]]),
+        (True, 0, [[0, 1, 2], [0, 1, 2], [0, 1, 2], [3]]),
+    ],
+)
+def test_timetable_conflicts(
+    same_day: bool, min_gap_minutes: int, expected: list[list[int]]
+) -> None:
+    """Test if conflicting blocks follow the same day and minimum gap rules.
+
+    Args:
+        same_day (bool): Whether blocks on the same day conflict.
+        min_gap_minutes (int): The minimum number of minutes between two duties.
+        expected (list[list[int]]): The expected conflicting blocks of each block.
+
+    Returns:
+        None
+    """
+    assert Timetable(BLOCKS).conflicts(same_day, min_gap_minutes) == expected
@@ -1,12 +1,19 @@
 import logging
+import multiprocessing
 from collections.abc import Generator
+from pathlib import Path
 
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from pytest import LogCaptureFixture
 
 from scheduler.path import LOGS_DIR
-from scheduler.utils import check_log_file_name, timer_decorator
+from scheduler.utils import (
+    BatchFileHandler,
+    SamplingQueueHandler,
+    check_log_file_name,
+    timer_decorator,
+)
 
 
 @pytest.mark.parametrize(
@@ -122,3 +129,101 @@ def test_timer_decorator(
     assert caplog.record_tuples[0][2].startswith(
         "Method 'test_function' of module 'tests.utils_test' executed in "
     )
+
+
+class ListHandler(logging.Handler):
+    """Handler that keeps the messages of the records it handles."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def test_sampling_queue_handler() -> None:
+    """Test if the queue handler hands all info records and a sample of debug records to its handlers.
+
+    Returns:
+        None
+    """
+    list_handler = ListHandler()
+    queue_handler = SamplingQueueHandler([list_handler], debug_sample_rate=10)
+    logger = logging.getLogger("sampling_test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    for i in range(25):
+        logger.debug(f"debug {i}")
+    logger.info("info")
+    queue_handler.close()
+    assert list_handler.messages == ["debug 0", "debug 10", "debug 20", "info"]
+
+    # Once closed, records are handled synchronously
+    logger.info("after close")
+    assert list_handler.messages[-1] == "after close"
+    logger.removeHandler(queue_handler)
+
+
+def test_batch_file_handler(tmp_path: Path) -> None:
+    """Test if the log file is flushed once per batch and on warnings.
+
+    Args:
+        tmp_path (Path): A temporary directory for the log file.
+
+    Returns:
+        None
+    """
+    log_file = tmp_path / "batch.log"
+    handler = BatchFileHandler(str(log_file), batch_size=3)
+    records = [
+        logging.LogRecord("batch", level, __file__, 0, message, None, None)
+        for level, message in [
+            (logging.INFO, "first"),
+            (logging.INFO, "second"),
+            (logging.INFO, "third"),
+            (logging.INFO, "fourth"),
+            (logging.WARNING, "warning"),
+        ]
+    ]
+    handler.handle(records[0])
+    handler.handle(records[1])
+    assert log_file.read_text() == ""
+    handler.handle(records[2])
+    assert log_file.read_text().split() == ["first", "second", "third"]
+    handler.handle(records[3])
+    assert len(log_file.read_text().split()) == 3
+    handler.handle(records[4])
+    assert len(log_file.read_text().split()) == 5
+    handler.close()
+
+
+def test_sampling_queue_handler_in_forked_worker(tmp_path: Path) -> None:
+    """Test if a forked worker logs to the file without repeating the unflushed lines of the parent.
+
+    Args:
+        tmp_path (Path): A temporary directory for the log file.
+
+    Returns:
+        None
+    """
+    log_file = tmp_path / "worker.log"
+    file_handler = BatchFileHandler(str(log_file), batch_size=100)
+    queue_handler = SamplingQueueHandler([file_handler])
+    logger = logging.getLogger("worker_test")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    logger.info("parent")
+    queue_handler.queue.join()
+    worker = multiprocessing.get_context("fork").Process(
+        target=logger.info, args=("worker",)
+    )
+    worker.start()
+    worker.join()
+    # The record of the worker is written although the batch of the parent is not full
+    assert log_file.read_text().split() == ["worker"]
+    queue_handler.close()
+    logger.removeHandler(queue_handler)
+    assert sorted(log_file.read_text().split()) == ["parent", "worker"]
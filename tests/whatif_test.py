@@ -0,0 +1,71 @@
+import pytest
+
+from scheduler.metric_names import DEFAULT_METRICS
+from scheduler.planner import Planner
+from scheduler.whatif import BASE_VARIANT, evaluate_variants
+
+VARIANTS = {
+    "no phd": [
+        "unavailable:Proctor E|2023-06-02 09:00-11:00",
+        "unavailable:Proctor F|2023-06-02 09:00-11:00",
+    ],
+    "more proctors": ["room:V-101|3"],
+}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_evaluate_variants(planner: Planner, workers: int) -> None:
+    """Test if variants are evaluated against the base problem, sequentially or in parallel.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+        workers (int): The number of worker processes.
+
+    Returns:
+        None
+    """
+    unavailable = [list(proctor.unavailable) for proctor in planner.proctors]
+    proctors_needed = [exam.number_of_proctors_needed for exam in planner.exams]
+    fairness = evaluate_variants(
+        planner, VARIANTS, 10, DEFAULT_METRICS, seed=0, workers=workers
+    )
+    assert list(fairness) == [BASE_VARIANT, *VARIANTS]
+    assert fairness[BASE_VARIANT][0] == 0
+    # ECON 503 needs a PhD proctor, and none is available
+    assert fairness["no phd"][0] == 1
+    assert len(fairness["more proctors"]) == len(DEFAULT_METRICS) + 2
+
+    # The base problem is left unchanged
+    assert [proctor.unavailable for proctor in planner.proctors] == unavailable
+    assert [exam.number_of_proctors_needed for exam in planner.exams] == (
+        proctors_needed
+    )
+
+
+def test_evaluate_variants_is_reproducible(planner: Planner) -> None:
+    """Test if the same variants with the same seed give the same fairness.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    assert evaluate_variants(planner, VARIANTS, 10, DEFAULT_METRICS) == (
+        evaluate_variants(planner, VARIANTS, 10, DEFAULT_METRICS)
+    )
+
+
+def test_evaluate_variants_invalid(planner: Planner) -> None:
+    """Test if invalid variants raise a ValueError.
+
+    Args:
+        planner (Planner): The Planner instance to test.
+
+    Returns:
+        None
+    """
+    with pytest.raises(ValueError):
+        evaluate_variants(planner, {BASE_VARIANT: []}, 1, DEFAULT_METRICS)
+    with pytest.raises(ValueError):
+        evaluate_variants(planner, {"typo": ["room:Z-999|2"]}, 1, DEFAULT_METRICS)